@@ -0,0 +1,92 @@
+"""
+Applying a generated assignment (one AssignSessionCommand per slot) with the session tab listening,
+one command at a time against inside `with service.batch(...)`, on a generated large project.
+Checks first that the batch is one undo step with one notification and undoes/redoes like the single commands.
+
+    python benchmarks/bench_batch.py [members] [songs] [assignments]
+"""
+import copy
+import random
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+from sample_project import build_project
+from data_handler import DataHandler, iter_load_stages
+from undo_history import UndoHistory
+from session_service import SessionService
+from session_ui import SessionWidget
+from session_controller import SessionController
+
+def setup(data):
+    dh = DataHandler(filepath="")
+    for stage, payload in iter_load_stages(copy.deepcopy(data)):
+        dh.apply_load_stage(stage, payload)
+    stack = UndoHistory()
+    service = SessionService(dh, stack)
+    controller = SessionController(SessionWidget(), service)
+    refreshes = []
+    service.data_changed.connect(lambda: refreshes.append(1))
+    return dh, stack, service, controller, refreshes
+
+def plan(dh, count):
+    """(song id, session id, member id) for count slots, members drawn at random."""
+    rng = random.Random(7)
+    slots = [(song.id, session.id) for song in dh.songs for session in song.sessions][:count]
+    return [(song_id, session_id, rng.choice(dh.members).id) for song_id, session_id in slots]
+
+def apply(service, assignments):
+    for song_id, session_id, member_id in assignments:
+        service.assign_member(song_id, session_id, member_id)
+
+def apply_batched(service, assignments):
+    with service.batch("배정 적용"):
+        apply(service, assignments)
+
+def check(data, count):
+    dh, stack, service, _, refreshes = setup(data)
+    assignments = plan(dh, count)
+    before = dh.snapshot()
+    apply(service, assignments)
+    single = dh.snapshot()
+
+    dh, stack, service, _, refreshes = setup(data)
+    apply_batched(service, assignments)
+    assert dh.snapshot() == single and stack.count() == 1 and len(refreshes) == 1
+    stack.undo()
+    assert dh.snapshot() == before and len(refreshes) == 2
+    stack.redo()
+    assert dh.snapshot() == single and len(refreshes) == 3
+
+    # A failing batch is rolled back
+    try:
+        with service.batch("실패"):
+            apply(service, [(song_id, session_id, None) for song_id, session_id, _ in assignments])
+            raise ValueError
+    except ValueError:
+        pass
+    assert dh.snapshot() == single and stack.count() == 1
+
+def main():
+    app = QApplication(sys.argv[:1] + ["-platform", "offscreen"])
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    data = build_project(members, songs).snapshot()
+    print(f"{members} members, {songs} songs, {count} assignments")
+
+    check(data, count)
+    print("check: one undo step and one refresh, same data as the single commands, failures rolled back")
+
+    print(f"{'apply':<10}{'refreshes':>11}{'undo steps':>12}{'time (ms)':>11}")
+    for label, run in (("single", apply), ("batch", apply_batched)):
+        dh, stack, service, _, refreshes = setup(data)
+        assignments = plan(dh, count)
+        start = time.perf_counter()
+        run(service, assignments)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<10}{len(refreshes):>11}{stack.count():>12}{elapsed * 1000:>11.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Skill verdicts for every member on every session of a generated large project: the FeasibilityMatrix
+(full vectorized rebuild, and the one-row patch after a member edit) against asking per cell, through
+SessionService.assignment_warnings (SkillEvaluator) and through the rule code from before it.
+Checks first that the matrix gives the verdicts the warnings describe.
+
+    python benchmarks/bench_feasibility.py [members] [songs] [repeats]
+"""
+import copy
+import sys
+import time
+
+from sample_project import build_project
+from bench_skill_evaluator import reference_warnings
+from undo_history import UndoHistory
+from profile_service import ProfileService
+from session_service import SessionService
+from feasibility import OK, TOO_LOW, TOO_HIGH, CANT_PLAY
+from skill_evaluator import CANNOT_PLAY, RANGE_TOO_LOW, SKILL_TOO_LOW, SKILL_TOO_HIGH
+
+FLAGS = {CANNOT_PLAY: CANT_PLAY, RANGE_TOO_LOW: TOO_LOW, SKILL_TOO_LOW: TOO_LOW, SKILL_TOO_HIGH: TOO_HIGH}
+
+def cells(dh):
+    return [(member, song, session) for member in dh.members for song in dh.songs for session in song.sessions]
+
+def per_cell(service, dh):
+    verdicts = []
+    for member, song, session in cells(dh):
+        verdict = OK
+        for code, _ in service.assignment_warnings(member, song, session):
+            verdict |= FLAGS[code]
+        verdicts.append(verdict)
+    return verdicts
+
+def reference_per_cell(dh):
+    return [reference_warnings(dh, member, song, session) for member, song, session in cells(dh)]
+
+def matrix_rebuild(service, dh):
+    service.feasibility.full_rebuild = True
+    service.feasibility.update()
+
+def check(service, dh):
+    matrix = service.feasibility
+    assert [matrix.verdict(m.id, s.id, x.id) for m, s, x in cells(dh)] == per_cell(service, dh)
+
+def best(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    dh = build_project(members, songs)
+    stack = UndoHistory()
+    service = SessionService(dh, stack)
+    profiles = ProfileService(dh, stack)
+    slots = sum(len(song.sessions) for song in dh.songs)
+    print(f"{members} members x {slots} sessions, best of {repeats}")
+
+    check(service, dh)
+    member = dh.members[members // 2]
+    edited = copy.deepcopy(member)
+    edited.instruments.reverse()
+    profiles.update_member(member, edited)
+    check(service, dh)
+    print("check: the matrix verdicts match assignment_warnings, after a full build and a row patch")
+
+    def patch_row():
+        profiles.update_member(dh.members[members // 2], copy.deepcopy(dh.members[members // 2]))
+        service.feasibility.update()
+
+    print(f"{'verdicts':<32}{'time (ms)':>11}")
+    for label, run in (
+        ("matrix, full rebuild", lambda: matrix_rebuild(service, dh)),
+        ("member edit + matrix row patch", patch_row),
+        ("per cell, assignment_warnings", lambda: per_cell(service, dh)),
+        ("per cell, reference rules", lambda: reference_per_cell(dh)),
+    ):
+        print(f"{label:<32}{best(run, repeats):>11.1f}")
+
+if __name__ == "__main__":
+    main()
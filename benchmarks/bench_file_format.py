@@ -0,0 +1,64 @@
+"""
+File size and encode/decode/load time of the project file formats on a generated large project.
+
+    python benchmarks/bench_file_format.py [members] [songs]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sample_project import build_project
+from data_handler import DataHandler
+from project_format import FORMAT_JSON, FORMAT_ZLIB, FORMAT_LZMA, dump_bytes, load_bytes
+
+# (format, string table)
+VARIANTS = [
+    (FORMAT_JSON, False),
+    (FORMAT_ZLIB, False),
+    (FORMAT_ZLIB, True),
+    (FORMAT_LZMA, False),
+    (FORMAT_LZMA, True),
+]
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    dh = build_project(members, songs)
+    data = dh.snapshot()
+    print(f"{members} members, {songs} songs, {len(dh.assignments)} assignments")
+    print(f"{'format':<12}{'size (KB)':>12}{'ratio':>8}{'encode (ms)':>14}{'decode (ms)':>14}{'load (ms)':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # load_data records recent files in the working directory
+        os.chdir(tmp)
+        base_size = None
+        for file_format, string_table in VARIANTS:
+            label = file_format + ("+table" if string_table else "")
+            raw = dump_bytes(data, file_format, string_table)
+            assert load_bytes(raw) == data, f"{label} round trip changed the data"
+            base_size = base_size or len(raw)
+
+            path = os.path.join(tmp, f"project_{label}.acou")
+            with open(path, 'wb') as f:
+                f.write(raw)
+            encode = best_of(lambda: dump_bytes(data, file_format, string_table))
+            decode = best_of(lambda: load_bytes(raw))
+
+            loader = DataHandler(filepath="")
+            load = best_of(lambda: loader.load_data(path))
+            assert loader.snapshot() == data and loader.file_format == file_format
+
+            print(f"{label:<12}{len(raw) / 1024:>12.1f}{len(raw) / base_size:>8.2f}"
+                  f"{encode * 1000:>14.1f}{decode * 1000:>14.1f}{load * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Journaling one edit for crash recovery against saving the whole project, on generated projects of a few sizes.
+Each edit is an assignment pushed through SessionService; the journal appends and fsyncs one record, the save
+encodes and writes the file (also fsynced) from scratch and, as saves after the first do, from the fragment cache.
+Checks first that replaying the journal over the saved file gives the live project back.
+
+    python benchmarks/bench_journal.py [edits]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sample_project import build_project
+from data_handler import DataHandler
+from journal import ProjectJournal
+from undo_history import UndoHistory
+from session_service import SessionService
+
+SIZES = [(40, 30), (120, 100), (300, 400)]
+
+def open_project(path):
+    dh = DataHandler(filepath="")
+    dh.load_data(path)
+    journal = ProjectJournal(dh)
+    journal.open(path)
+    return dh, journal, SessionService(dh, UndoHistory())
+
+def edits(dh, count):
+    rng = random.Random(5)
+    slots = [(song.id, session.id) for song in dh.songs for session in song.sessions]
+    return [(*rng.choice(slots), rng.choice(dh.members).id) for _ in range(count)]
+
+def check(path, count):
+    dh, journal, service = open_project(path)
+    service.undo_stack.indexChanged.connect(journal.flush)
+    for edit in edits(dh, count):
+        service.assign_member(*edit)
+    for _ in range(count // 2):
+        service.undo_stack.undo()
+    recovered = DataHandler(filepath="")
+    recovered.load_data(path)
+    ProjectJournal(recovered).replay(ProjectJournal.read(path))
+    assert recovered.snapshot() == dh.snapshot()
+    journal.close()
+
+def run(path, count):
+    """(ms per journaled edit, ms per full save, ms per save from the fragment cache)"""
+    dh, journal, service = open_project(path)
+    journaled = 0.0
+    for edit in edits(dh, count):
+        service.assign_member(*edit)
+        start = time.perf_counter()
+        journal.flush()
+        journaled += time.perf_counter() - start
+    journal.close()
+
+    full = cached = 0.0
+    saves = max(3, count // 20)
+    for _ in range(saves):
+        dh.fragments.invalidate()
+        start = time.perf_counter()
+        dh.save_data(path)
+        full += time.perf_counter() - start
+
+        service.assign_member(*edits(dh, 1)[0]) # One edit since the last save
+        start = time.perf_counter()
+        dh.save_data(path)
+        cached += time.perf_counter() - start
+    return journaled / count * 1000, full / saves * 1000, cached / saves * 1000
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    directory = tempfile.mkdtemp()
+    # Saves and loads record recent files in the working directory
+    os.chdir(directory)
+    paths = {}
+    for members, songs in SIZES:
+        paths[members, songs] = os.path.join(directory, f"{members}x{songs}.acou")
+        build_project(members, songs).save_data(paths[members, songs])
+    print(f"{count} edits each")
+
+    for path in paths.values():
+        check(path, 20)
+    print("check: replaying the journal over the file gives the live project")
+
+    print(f"{'project':<22}{'journal (ms/edit)':>19}{'save (ms)':>11}{'cached save (ms)':>18}")
+    for (members, songs), path in paths.items():
+        journaled, full, cached = run(path, count)
+        print(f"{f'{members} members/{songs} songs':<22}{journaled:>19.2f}{full:>11.1f}{cached:>18.1f}")
+
+if __name__ == "__main__":
+    main()
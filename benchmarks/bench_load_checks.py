@@ -0,0 +1,90 @@
+"""
+Work done after the assignments of a project are loaded (integrity check, schema migrations),
+for a file at the current schema version and for one from before versioning, on a generated large project.
+Checks first that damaged references are repaired and reported.
+
+    python benchmarks/bench_load_checks.py [members] [songs]
+"""
+import copy
+import sys
+import time
+
+from sample_project import build_project
+from data_handler import DataHandler, iter_load_stages, STAGE_ASSIGNMENTS
+from models import SessionAssignment, SCHEMA_VERSION
+
+def loaded_until_assignments(data):
+    """DataHandler with every stage but the last attached, and the assignments payload."""
+    dh = DataHandler(filepath="")
+    dh.begin_load("", "json")
+    for stage, payload in iter_load_stages(copy.deepcopy(data)):
+        if stage == STAGE_ASSIGNMENTS:
+            return dh, payload
+        dh.apply_load_stage(stage, payload)
+
+def check(data):
+    # Older files: every migration runs
+    old = copy.deepcopy(data)
+    del old["schema_version"]
+    old["equipments"][0]["name"] = "SM57"
+    dh, payload = loaded_until_assignments(old)
+    dh.apply_load_stage(STAGE_ASSIGNMENTS, payload)
+    assert any("SM57" in c for c in dh.migration_log), dh.migration_log
+    assert dh.snapshot()["schema_version"] == SCHEMA_VERSION
+
+    # Current files: none does, even where one would have changed something
+    current = copy.deepcopy(data)
+    current["equipments"][0]["name"] = "SM57"
+    dh, payload = loaded_until_assignments(current)
+    dh.apply_load_stage(STAGE_ASSIGNMENTS, payload)
+    assert dh.migration_log == [] and dh.equipments[0].name == "SM57"
+
+    # Broken references are repaired and reported
+    dh, payload = loaded_until_assignments(data)
+    song_a, song_b = dh.songs[0], dh.songs[1]
+    payload[0].member_id = "gone"
+    payload += [
+        SessionAssignment(song_id="gone", session_id=song_a.sessions[0].id),
+        SessionAssignment(song_id=song_b.id, session_id=song_a.sessions[0].id),
+        SessionAssignment(song_id=payload[1].song_id, session_id=payload[1].session_id),
+    ]
+    dh.apply_load_stage(STAGE_ASSIGNMENTS, payload)
+    report = dh.integrity_report
+    assert len(report.dropped_assignments) == 2 and len(report.duplicate_assignments) == 1, report
+    assert report.cleared_members == [(payload[0].song_id, payload[0].session_id)], report
+    assert len(dh.migration_log) == len(report.describe()) == 3, dh.migration_log
+    assert all(a.member_id is None or a.member_id in dh.member_by_id for a in dh.assignments)
+    assert not dh.check_integrity()
+
+def best_of(data, repeat=5):
+    """Best (integrity check, migrations) time."""
+    best = [float("inf"), float("inf")]
+    for _ in range(repeat):
+        dh, payload = loaded_until_assignments(data)
+        start = time.perf_counter()
+        dh.check_integrity(payload)
+        middle = time.perf_counter()
+        dh.migrate_data(data.get("schema_version", 0))
+        end = time.perf_counter()
+        best = [min(best[0], middle - start), min(best[1], end - middle)]
+    return best
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    dh = build_project(members, songs)
+    data = dh.snapshot()
+    print(f"{members} members, {songs} songs, {len(dh.assignments)} assignments")
+
+    check(data)
+    print("check: older files migrated, current files untouched, broken references reported")
+
+    old = dict(data)
+    del old["schema_version"]
+    print(f"{'file':<20}{'integrity (ms)':>16}{'migrations (ms)':>17}")
+    for label, file_data in (("schema version 0", old), (f"schema version {SCHEMA_VERSION}", data)):
+        integrity, migrations = best_of(file_data)
+        print(f"{label:<20}{integrity * 1000:>16.2f}{migrations * 1000:>17.2f}")
+
+if __name__ == "__main__":
+    main()
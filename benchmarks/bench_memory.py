@@ -0,0 +1,105 @@
+"""
+Memory held by the model objects of a generated large project, measured with tracemalloc:
+the slotted models against plain (per-instance __dict__) dataclasses with the same fields,
+both built from the same project file text the way a load builds them.
+
+    python benchmarks/bench_memory.py [members] [songs]
+"""
+import copy
+import dataclasses
+import gc
+import json
+import sys
+import tracemalloc
+
+from sample_project import build_project
+from models import Member, Song, SessionAssignment, Instrument, Equipment
+
+SECTIONS = [("members", Member), ("songs", Song), ("assignments", SessionAssignment),
+            ("instruments", Instrument), ("equipments", Equipment)]
+
+def plain_model(cls, plain_classes):
+    """Dataclass with the fields of a model but without __slots__ (the models before they were slotted)."""
+    spec = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default=f.default)))
+        elif f.default_factory is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            spec.append((f.name, f.type))
+        item = (getattr(f.type, "__args__", None) or (None,))[-1]
+        if dataclasses.is_dataclass(item) and item not in plain_classes:
+            plain_classes[item] = plain_model(item, plain_classes)
+    return dataclasses.make_dataclass(cls.__name__, spec)
+
+PLAIN = {}
+for _, model in SECTIONS:
+    PLAIN[model] = plain_model(model, PLAIN)
+
+def plain_from_dict(cls, data):
+    """Builds the plain equivalent of a model like the old from_dict did (no interning)."""
+    data = dict(data)
+    for f in dataclasses.fields(cls):
+        item = (getattr(f.type, "__args__", None) or (None,))[-1]
+        if dataclasses.is_dataclass(item) and f.name in data:
+            data[f.name] = [plain_from_dict(item, x) for x in data[f.name]]
+    return PLAIN[cls](**data)
+
+def count_entities(objs) -> int:
+    count = 0
+    for obj in objs:
+        count += 1
+        count += len(getattr(obj, "instruments", ()))
+        count += len(getattr(obj, "sessions", ()))
+        for section in getattr(obj, "cue_sections", ()):
+            count += 1 + len(section.entries)
+    return count
+
+def retained(build):
+    """Bytes still allocated after build() returns, with everything it dropped collected."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return size, result
+
+def load_section(text, name, make):
+    data = json.loads(text)[name] # Parsed fresh, so ids are separate strings like in a real load
+    return [make(d) for d in data]
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    text = json.dumps(build_project(members, songs).snapshot(), ensure_ascii=False)
+
+    print(f"{'':<14}{'entities':>10}{'plain (B/entity)':>19}{'slotted (B/entity)':>21}{'saved':>8}")
+    totals = [0, 0, 0]
+    loaded = {}
+    for name, model in SECTIONS:
+        plain_size, plain_objs = retained(lambda: load_section(text, name, lambda d: plain_from_dict(model, d)))
+        del plain_objs
+        slotted_size, loaded[name] = retained(lambda: load_section(text, name, model.from_dict))
+        n = count_entities(loaded[name])
+        totals[0] += n
+        totals[1] += plain_size
+        totals[2] += slotted_size
+        print(f"{name:<14}{n:>10}{plain_size / n:>19.0f}{slotted_size / n:>21.0f}{1 - slotted_size / plain_size:>8.0%}")
+    n, plain_size, slotted_size = totals
+    print(f"{'total':<14}{n:>10}{plain_size / n:>19.0f}{slotted_size / n:>21.0f}{1 - slotted_size / plain_size:>8.0%}"
+          f"   ({plain_size / 1e6:.1f} MB -> {slotted_size / 1e6:.1f} MB)")
+
+    # Edit commands keep deep copies of the entities they replace
+    objs = loaded["members"] + loaded["songs"]
+    plain_objs = [plain_from_dict(type(o), o.to_dict()) for o in objs]
+    plain_size, _ = retained(lambda: copy.deepcopy(plain_objs))
+    slotted_size, _ = retained(lambda: copy.deepcopy(objs))
+    n = count_entities(objs)
+    print(f"{'deepcopy':<14}{n:>10}{plain_size / n:>19.0f}{slotted_size / n:>21.0f}{1 - slotted_size / plain_size:>8.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+UI refreshes caused by edits made in one event loop turn (a member edit, a song edit and a few assignments),
+with the four tabs wired as in MainWindow: each data_changed refreshing its listeners directly, against
+going through the RefreshScheduler. Checks first that both leave the tabs showing the same thing.
+
+    python benchmarks/bench_refresh_scheduler.py [members] [songs] [turns]
+"""
+import copy
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt
+
+from sample_project import build_project
+from data_handler import DataHandler, iter_load_stages
+from undo_history import UndoHistory
+from refresh_scheduler import RefreshScheduler
+from profile_service import ProfileService
+from song_service import SongService
+from session_service import SessionService
+from tech_service import TechService
+from profile_ui import ProfileWidget
+from song_ui import SongWidget
+from session_ui import SessionWidget
+from tech_ui import TechWidget
+from profile_controller import ProfileController
+from song_controller import SongController
+from session_controller import SessionController
+from tech_controller import TechController
+
+class Tabs:
+    def __init__(self, data, scheduled: bool):
+        self.dh = DataHandler(filepath="")
+        for stage, payload in iter_load_stages(copy.deepcopy(data)):
+            self.dh.apply_load_stage(stage, payload)
+        stack = UndoHistory()
+        self.profiles = ProfileService(self.dh, stack)
+        self.songs = SongService(self.dh, stack)
+        self.sessions = SessionService(self.dh, stack)
+        self.tech = TechService(self.dh, stack)
+
+        self.scheduler = RefreshScheduler() if scheduled else None
+        self.profile_controller = ProfileController(ProfileWidget(), self.profiles, self.scheduler)
+        self.song_controller = SongController(SongWidget(), self.songs, self.scheduler)
+        self.session_controller = SessionController(SessionWidget(), self.sessions, self.scheduler)
+        self.tech_controller = TechController(TechWidget(), self.tech, self.songs, self.scheduler)
+        for service in (self.profiles, self.songs):
+            if self.scheduler:
+                self.scheduler.connect(service.data_changed, self.session_controller.refresh_data)
+            else:
+                service.data_changed.connect(self.session_controller.refresh_data)
+
+        # Direct refreshes: each emission refreshes every listener (the scheduler counts its own)
+        self.refreshes = 0
+        listeners = {self.profiles: 2, self.songs: 3, self.sessions: 1, self.tech: 1}
+        for service, count in listeners.items():
+            service.data_changed.connect(lambda count=count: self.add_refreshes(count))
+
+    def add_refreshes(self, count):
+        self.refreshes += count
+
+    def turn(self, k):
+        """The edits of one event loop turn."""
+        dh = self.dh
+        member = dh.members[k % len(dh.members)]
+        renamed = copy.deepcopy(member)
+        renamed.name = f"{member.name[:8]}{k}"
+        self.profiles.update_member(member, renamed)
+        song = dh.songs[k % len(dh.songs)]
+        self.songs.set_song_field(song, "bpm", 80 + k % 60)
+        for session in song.sessions[:3]:
+            self.sessions.assign_member(song.id, session.id, dh.members[(k + 7) % len(dh.members)].id)
+
+    def shown(self):
+        model = self.session_controller.model
+        cells = [[model.index(r, c).data(Qt.ItemDataRole.DisplayRole) for c in range(model.columnCount())]
+                 for r in range(model.rowCount())]
+        songs = [self.song_controller.widget_map[s.id].edit_bpm.text() for s in self.dh.songs]
+        return cells, songs, [r.text for r in self.sessions.warning_engine.records]
+
+def run(app, data, scheduled, turns):
+    tabs = Tabs(data, scheduled)
+    start = time.perf_counter()
+    for k in range(turns):
+        tabs.turn(k)
+        app.processEvents() # End of the turn, scheduled refreshes run here
+    elapsed = time.perf_counter() - start
+    refreshes = sum(tabs.scheduler.ran.values()) if scheduled else tabs.refreshes
+    return tabs, refreshes, elapsed
+
+def main():
+    app = QApplication(sys.argv[:1] + ["-platform", "offscreen"])
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    turns = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    data = build_project(members, songs).snapshot()
+    print(f"{members} members, {songs} songs, {turns} turns")
+
+    direct, _, _ = run(app, data, False, 5)
+    scheduled, _, _ = run(app, data, True, 5)
+    assert direct.shown() == scheduled.shown()
+    print("check: the tabs show the same after direct and scheduled refreshes")
+
+    print(f"{'refresh':<11}{'refreshes':>11}{'coalesced':>11}{'ms/turn':>10}")
+    for label, is_scheduled in (("direct", False), ("scheduled", True)):
+        tabs, refreshes, elapsed = run(app, data, is_scheduled, turns)
+        coalesced = tabs.scheduler.coalesced if is_scheduled else 0
+        print(f"{label:<11}{refreshes:>11}{coalesced:>11}{elapsed / turns * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
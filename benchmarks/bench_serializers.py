@@ -0,0 +1,144 @@
+"""
+Speed of the generated model serializers (models.serializable) against the asdict-based ones they
+replaced, on a generated large project. Checks first that both give identical results.
+
+    python benchmarks/bench_serializers.py [members] [songs]
+"""
+import copy
+import dataclasses
+import gc
+import json
+import sys
+import time
+
+from sample_project import build_project
+from data_handler import iter_load_stages, DataHandler
+from models import (Instrument, MemberInstrument, Member, SongSession, CueEntry, CueSection, Song, Equipment,
+                    SessionAssignment)
+
+# The serializers as they were before models.serializable (for the current fields)
+def legacy_to_dict(obj):
+    data = dataclasses.asdict(obj)
+    if isinstance(obj, Member):
+        data['instruments'] = [legacy_to_dict(i) for i in obj.instruments]
+    elif isinstance(obj, Song):
+        data['sessions'] = [legacy_to_dict(s) for s in obj.sessions]
+        data['cue_sections'] = [legacy_to_dict(s) for s in obj.cue_sections]
+    elif isinstance(obj, CueSection):
+        data['entries'] = [legacy_to_dict(e) for e in obj.entries]
+        del data['instrument_notes'] # Only read from older files
+    return data
+
+def legacy_from_dict(cls, data):
+    if cls is Member:
+        if 'instruments' in data:
+            data['instruments'] = [legacy_from_dict(MemberInstrument, i) for i in data['instruments']]
+    elif cls is Song:
+        if 'sessions' in data:
+            data['sessions'] = [legacy_from_dict(SongSession, s) for s in data['sessions']]
+        if 'nickname' not in data:
+            data['nickname'] = ""
+        if 'cue_sections' in data:
+            data['cue_sections'] = [legacy_from_dict(CueSection, s) for s in data['cue_sections']]
+        else:
+            data['cue_sections'] = []
+    elif cls is CueSection:
+        if 'entries' in data:
+            data['entries'] = [legacy_from_dict(CueEntry, e) for e in data['entries']]
+    elif cls is SessionAssignment:
+        if 'ignore_warnings' not in data:
+            data['ignore_warnings'] = False
+    return cls(**data)
+
+def entities(dh):
+    """(class, object) of every top-level entity."""
+    for cls, items in ((Member, dh.members), (Instrument, dh.instruments), (Song, dh.songs),
+                       (Equipment, dh.equipments), (SessionAssignment, dh.assignments)):
+        for obj in items:
+            yield cls, obj
+
+def check_round_trip(dh):
+    for cls, obj in entities(dh):
+        new = obj.to_dict()
+        old = legacy_to_dict(obj)
+        # Same keys in the same order, so files are byte-identical
+        assert json.dumps(new, ensure_ascii=False) == json.dumps(old, ensure_ascii=False), obj
+        assert cls.from_dict(new) == legacy_from_dict(cls, copy.deepcopy(old)) == obj, obj
+
+    # to_dict shares no containers with the model
+    song = next(s for s in dh.songs if any(c.entries for c in s.cue_sections))
+    data = song.to_dict()
+    data["sessions"].clear()
+    for section in data["cue_sections"]:
+        section["entries"].clear()
+    assert song.sessions and any(c.entries for c in song.cue_sections)
+
+    # from_dict leaves its input alone
+    data = song.to_dict()
+    before = copy.deepcopy(data)
+    Song.from_dict(data)
+    assert data == before
+
+    # Fields missing from older files
+    old_song = {k: v for k, v in song.to_dict().items() if k not in ("nickname", "cue_sections")}
+    assert Song.from_dict(old_song) == legacy_from_dict(Song, copy.deepcopy(old_song))
+    old_assignment = {"song_id": "a", "session_id": "b", "member_id": None}
+    assert SessionAssignment.from_dict(old_assignment) == legacy_from_dict(SessionAssignment, dict(old_assignment))
+
+    # Unknown or missing keys are still rejected
+    for cls, bad in ((Song, {"bogus": 1}), (SessionAssignment, {"song_id": "a"})):
+        try:
+            cls.from_dict(bad)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f"{cls.__name__}.from_dict accepted {bad}")
+
+    # Whole project through the loader
+    data = dh.snapshot()
+    loaded = DataHandler(filepath="")
+    for stage, payload in iter_load_stages(copy.deepcopy(data)):
+        loaded.apply_load_stage(stage, payload)
+    assert loaded.snapshot() == data
+
+def timed(fn, *args):
+    # Collector off while timing, like timeit, so both sides aren't charged for each other's garbage
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+def best_of(fn, repeat=5):
+    return min(timed(fn) for _ in range(repeat))
+
+def best_of_fresh(fn, dicts, repeat=5):
+    # The old from_dict consumed its input, so every run gets a fresh copy, made outside the timing
+    return min(timed(fn, [(cls, copy.deepcopy(d)) for cls, d in dicts]) for _ in range(repeat))
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    dh = build_project(members, songs)
+    items = list(entities(dh))
+    nested = sum(len(m.instruments) for m in dh.members) + sum(len(s.sessions) + len(s.cue_sections) for s in dh.songs)
+    print(f"{len(items)} entities ({members} members, {songs} songs, {len(dh.assignments)} assignments), {nested} nested")
+
+    check_round_trip(dh)
+    print("round trip: identical to the asdict serializers")
+
+    dicts = [(cls, obj.to_dict()) for cls, obj in items]
+    old_to = best_of(lambda: [legacy_to_dict(obj) for _, obj in items])
+    new_to = best_of(lambda: [obj.to_dict() for _, obj in items])
+    old_from = best_of_fresh(lambda batch: [legacy_from_dict(cls, d) for cls, d in batch], dicts)
+    new_from = best_of_fresh(lambda batch: [cls.from_dict(d) for cls, d in batch], dicts)
+
+    print(f"{'':<10}{'asdict (ms)':>14}{'generated (ms)':>17}{'speedup':>10}")
+    print(f"{'to_dict':<10}{old_to * 1000:>14.1f}{new_to * 1000:>17.1f}{old_to / new_to:>9.1f}x")
+    print(f"{'from_dict':<10}{old_from * 1000:>14.1f}{new_from * 1000:>17.1f}{old_from / new_from:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Assignment warnings through SkillEvaluator (SessionService.validate_assignment) against the rule code it replaced
+(kept here as reference_warnings), for every member in every session slot of a generated large project, and for
+the pairs where the member plays the slot's instrument, the only ones the skill rules run for. The first pass
+fills the evaluator's memo, later passes hit it, as the session tab does while refreshing.
+Checks first that both give the same messages.
+
+    python benchmarks/bench_skill_evaluator.py [members] [songs] [passes]
+"""
+import re
+import sys
+import time
+
+from sample_project import build_project
+from models import Member, Song, SongSession, SkillLevel
+from undo_history import UndoHistory
+from session_service import SessionService
+
+def note_to_int(note_str):
+    if not note_str: return -1
+    note_map = {'C': 0, 'C#': 1, 'D': 2, 'D#': 3, 'E': 4, 'F': 5, 'F#': 6, 'G': 7, 'G#': 8, 'A': 9, 'A#': 10, 'B': 11}
+
+    try:
+        match = re.match(r"([A-G]#?)([0-9]+)", note_str)
+        if not match: return -1
+
+        note = match.group(1)
+        octave = int(match.group(2))
+
+        val = octave * 12 + note_map.get(note, 0)
+        return val
+    except:
+        return -1
+
+def reference_warnings(data_handler, member: Member, song: Song, session: SongSession) -> list[str]:
+    """SessionService.validate_assignment as it was before SkillEvaluator."""
+    warnings = []
+    if not member or not song or not session:
+        return warnings
+
+    member_inst = next((i for i in member.instruments if i.instrument_id == session.instrument_id), None)
+    inst_def = data_handler.get_instrument(session.instrument_id)
+    inst_name = inst_def.name if inst_def else "Unknown"
+
+    if not member_inst:
+        warnings.append(f"{member.name}은(는) '{inst_name}'을(를) 할 수 없습니다.")
+        return warnings
+
+    if inst_name == "보컬/랩":
+        req_note = note_to_int(session.difficulty_param)
+        mem_note = note_to_int(member_inst.skill)
+
+        if req_note != -1 and mem_note != -1:
+            if mem_note < req_note:
+                warnings.append(f"{member.name}의 {inst_name} 음역({member_inst.skill})이 곡의 최고음({session.difficulty_param})보다 낮습니다.")
+
+    else:
+        skill_levels = {
+            SkillLevel.YOUTUBER.value: 5,
+            SkillLevel.EXPERT.value: 4,
+            SkillLevel.HIGH.value: 3,
+            SkillLevel.MID.value: 2,
+            SkillLevel.LOW.value: 1,
+            SkillLevel.BEGINNER.value: 0
+        }
+
+        skill_base_bpm = {
+            SkillLevel.YOUTUBER.value: 180,
+            SkillLevel.EXPERT.value: 160,
+            SkillLevel.HIGH.value: 140,
+            SkillLevel.MID.value: 120,
+            SkillLevel.LOW.value: 90,
+            SkillLevel.BEGINNER.value: 50
+        }
+
+        member_level_idx = skill_levels.get(member_inst.skill, 0)
+        member_base = skill_base_bpm.get(member_inst.skill, 0)
+        member_cap_val = member_base * 16
+
+        try:
+            max_beat = int(session.difficulty_param)
+        except:
+            max_beat = 16
+
+        song_req_val = song.bpm * max_beat
+
+        req_level_idx = 0
+        if song_req_val > 2880:
+             req_level_idx = 5
+        elif song_req_val > 2560:
+             req_level_idx = 4
+        elif song_req_val > 2240:
+             req_level_idx = 3
+        elif song_req_val > 1920:
+             req_level_idx = 2
+        elif song_req_val > 1440:
+             req_level_idx = 1
+        else:
+             req_level_idx = 0
+
+        if song_req_val > member_cap_val and member_inst.skill != SkillLevel.YOUTUBER.value:
+            warnings.append(f"{member.name}의 {inst_name} 실력({member_inst.skill})이 곡의 난이도(BPM {song.bpm} x {max_beat}비트)에 비해 부족합니다.")
+
+        if song_req_val >= 2880:
+            pass
+        elif member_level_idx >= req_level_idx + 3:
+            warnings.append(f"{member.name}의 {inst_name} 실력({member_inst.skill})이 곡의 난이도에 비해 너무 높습니다.")
+
+    return warnings
+
+def all_pairs(dh):
+    return [(member, song, session) for song in dh.songs for session in song.sessions for member in dh.members]
+
+def playable_pairs(dh):
+    """The pairs the skill rules run for: the member plays the slot's instrument."""
+    return [(member, song, session) for member, song, session in all_pairs(dh)
+            if any(i.instrument_id == session.instrument_id for i in member.instruments)]
+
+def run(validate, pairs, passes):
+    """Seconds for each pass over the (member, song, session) pairs, and the messages of the last one."""
+    times = []
+    for _ in range(passes):
+        start = time.perf_counter()
+        messages = [validate(member, song, session) for member, song, session in pairs]
+        times.append(time.perf_counter() - start)
+    return times, messages
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    passes = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    dh = build_project(members, songs)
+    service = SessionService(dh, UndoHistory())
+    reference = lambda member, song, session: reference_warnings(dh, member, song, session)
+    groups = [("all", all_pairs(dh)), ("playable", playable_pairs(dh))]
+    print(f"{members} members, {songs} songs, {passes} passes over "
+          + ", ".join(f"{len(pairs)} {label}" for label, pairs in groups) + " member/slot pairs")
+
+    for _, pairs in groups:
+        assert run(service.validate_assignment, pairs, 1)[1] == run(reference, pairs, 1)[1]
+    print("check: the same messages for every pair")
+
+    print(f"{'pairs':<10}{'rules':<11}{'first pass (ms)':>17}{'later (ms)':>12}{'us/pair':>9}")
+    for label, pairs in groups:
+        for rules, validate in (("reference", reference), ("evaluator", service.validate_assignment)):
+            service.skill_evaluator.verdicts.clear() # First pass fills the memo again
+            times, _ = run(validate, pairs, passes)
+            later = min(times[1:]) if passes > 1 else times[0]
+            print(f"{label:<10}{rules:<11}{times[0] * 1000:>17.0f}{later * 1000:>12.0f}{later / len(pairs) * 1e6:>9.2f}")
+
+if __name__ == "__main__":
+    main()
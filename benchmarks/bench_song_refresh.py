@@ -0,0 +1,125 @@
+"""
+Song tab refresh after an edit (BPM, session, move, add/delete), diffing the song boxes against the
+song list as SongController.refresh_ui does, against destroying and rebuilding every box as it did before.
+Checks first that the boxes show what a freshly built song tab shows after a series of edits and undos.
+
+    python benchmarks/bench_song_refresh.py [songs] [edits]
+"""
+import copy
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QEvent
+
+from sample_project import build_project
+from data_handler import DataHandler, iter_load_stages
+from undo_history import UndoHistory
+from song_service import SongService
+from song_ui import SongWidget
+from song_controller import SongController
+from models import Song, SongSession
+
+def shown(controller):
+    """What each visible box shows, in layout order."""
+    boxes = []
+    layout = controller.ui.songs_layout
+    for i in range(layout.count()):
+        box = layout.itemAt(i).widget()
+        if box.isHidden():
+            continue
+        sessions = []
+        for j in range(box.sessions_layout.count() - 1): # Last one is the add button
+            w = box.sessions_layout.itemAt(j).widget()
+            combo = w.combo_difficulty
+            sessions.append((w.btn_inst.text(), w.btn_inst.isEnabled(), w.btn_remove.isHidden(),
+                             w.lbl_difficulty.text(), combo.currentText(), [combo.itemText(k) for k in range(combo.count())]))
+        boxes.append((box.lbl_number.text(), box.edit_name.text(), box.edit_nickname.text(), box.edit_bpm.text(),
+                      box.combo_category.currentText(), box.edit_ref.text(), box.btn_delete.isEnabled(), sessions))
+    return boxes
+
+def fresh(service, app):
+    ui = SongWidget()
+    controller = SongController(ui, service)
+    service.data_changed.disconnect(controller.refresh_ui)
+    boxes = shown(controller)
+    ui.deleteLater()
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return boxes
+
+def rebuild(controller):
+    """The refresh before diffing: every box destroyed and created again."""
+    layout = controller.ui.songs_layout
+    while layout.count():
+        layout.takeAt(0).widget().deleteLater()
+    controller.widget_map = {}
+    controller.box_pool.clear()
+    controller.session_pool.clear()
+    controller.refresh_ui()
+
+def edits(dh, service, k):
+    """The k-th edit of the run, cycling through the kinds of song edits."""
+    song = dh.songs[k % len(dh.songs)]
+    kind = k % 5
+    if kind == 0:
+        service.set_song_field(song, "bpm", 60 + k % 100)
+    elif kind == 1 and song.sessions:
+        service.update_session(song, song.sessions[-1], difficulty_param="8" if k % 2 else "16")
+    elif kind == 2:
+        service.move_song(song.id, 1 if k % 2 else -1)
+    elif kind == 3:
+        service.add_song(Song(title=f"곡 {k}", sessions=[SongSession(instrument_id=dh.instruments[0].id)]))
+    else:
+        service.delete_song(dh.songs[-1])
+
+def setup(data):
+    dh = DataHandler(filepath="")
+    for stage, payload in iter_load_stages(copy.deepcopy(data)):
+        dh.apply_load_stage(stage, payload)
+    stack = UndoHistory()
+    service = SongService(dh, stack)
+    ui = SongWidget()
+    ui.show()
+    return dh, stack, service, SongController(ui, service)
+
+def check(data, app):
+    dh, stack, service, controller = setup(data)
+    for k in range(40):
+        edits(dh, service, k)
+        if k % 7 == 6:
+            stack.undo()
+            stack.undo()
+        assert shown(controller) == fresh(service, app), k
+    service.reset_concert()
+    stack.undo()
+    assert shown(controller) == fresh(service, app)
+
+def main():
+    app = QApplication(sys.argv[:1] + ["-platform", "offscreen"])
+    songs = int(sys.argv[1]) if len(sys.argv) > 1 else 45
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    data = build_project(60, songs).snapshot()
+    print(f"{songs} songs, {runs} edits")
+
+    check(data, app)
+    print("check: boxes match a freshly built song tab after edits and undos")
+
+    times = {}
+    for label, diffed in (("rebuild", False), ("diff", True)):
+        dh, stack, service, controller = setup(data)
+        if not diffed:
+            service.data_changed.disconnect(controller.refresh_ui)
+            service.data_changed.connect(lambda: rebuild(controller))
+        start = time.perf_counter()
+        for k in range(runs):
+            edits(dh, service, k)
+            # Layout and painting, then the deleteLater of removed boxes (left alone outside an event loop)
+            app.processEvents()
+            app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        times[label] = (time.perf_counter() - start) / runs
+    print(f"{'refresh':<10}{'ms/edit':>10}")
+    for label, seconds in times.items():
+        print(f"{label:<10}{seconds * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    main()
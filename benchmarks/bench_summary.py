@@ -0,0 +1,61 @@
+"""
+Time to show a preview (song/member counts) of many project files, like the recent files menu does:
+reading only the summary header against loading each file. Checks the header first.
+
+    python benchmarks/bench_summary.py [files] [members] [songs]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sample_project import build_project
+from data_handler import DataHandler, read_project_file, read_project_summary
+from project_format import FORMAT_JSON, FORMAT_ZLIB, FORMAT_LZMA, content_hash
+
+FORMATS = (FORMAT_JSON, FORMAT_ZLIB, FORMAT_LZMA)
+
+def check(dh, path, file_format):
+    dh.write_project_file(dh.encode_project(file_format), path, file_format, dh.project_summary())
+    summary = read_project_summary(path)
+    assert summary["songs"] == len(dh.songs) and summary["members"] == len(dh.members), summary
+    # The hash covers the document without the header, which the loader drops
+    assert summary["hash"] == content_hash(dh.encode_project(file_format))
+    data, loaded_format = read_project_file(path)
+    assert loaded_format == file_format and data == dh.snapshot(), file_format
+
+    # Files saved without a header still load, and have no summary
+    dh.write_project_file(dh.encode_project(file_format), path, file_format)
+    assert read_project_summary(path) is None
+    assert read_project_file(path)[0] == dh.snapshot()
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    songs = int(sys.argv[3]) if len(sys.argv) > 3 else 400
+    dh = build_project(members, songs)
+    print(f"{files} files of {members} members, {songs} songs")
+    print(f"{'format':<8}{'file (KB)':>11}{'summaries (ms)':>17}{'full loads (ms)':>18}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for file_format in FORMATS:
+            check(dh, os.path.join(tmp, "check.acou"), file_format)
+            paths = [os.path.join(tmp, f"{file_format}{n}.acou") for n in range(files)]
+            for path in paths:
+                DataHandler.write_project_file(dh.encode_project(file_format), path, file_format, dh.project_summary())
+
+            headers = best_of(lambda: [read_project_summary(p) for p in paths])
+            loads = best_of(lambda: [read_project_file(p) for p in paths], repeat=1)
+            size = os.path.getsize(paths[0]) / 1024
+            print(f"{file_format:<8}{size:>11.0f}{headers * 1000:>17.1f}{loads * 1000:>18.0f}")
+
+if __name__ == "__main__":
+    main()
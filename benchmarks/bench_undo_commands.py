@@ -0,0 +1,129 @@
+"""
+Undo stack memory and time per edit, for the fine-grained song and cue commands against the
+deep copy + whole song replacement the editors pushed before (kept here as ReplaceSongCommand),
+on a generated large project.
+Checks first that both leave the same data behind and undo back to the start.
+
+    python benchmarks/bench_undo_commands.py [members] [songs] [edits]
+"""
+import copy
+import gc
+import sys
+import time
+import tracemalloc
+
+from PyQt6.QtGui import QUndoCommand, QUndoStack
+
+from sample_project import build_project
+from data_handler import DataHandler, iter_load_stages
+from song_service import SongService
+from tech_service import TechService
+from models import CueEntry
+
+class ReplaceSongCommand(QUndoCommand):
+    """The command the editors used before: swaps the whole song object for an edited copy."""
+    def __init__(self, data_handler: DataHandler, old_song, new_song, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.old_song = old_song
+        self.new_song = new_song
+        self.update_signal = update_signal
+
+    def replace(self, old, new):
+        songs = self.data_handler.songs
+        songs[songs.index(old)] = new
+        self.data_handler.unindex_song(old)
+        self.data_handler.index_song(new)
+        self.data_handler.notify_change("song", new.id)
+        self.update_signal.emit()
+
+    def redo(self):
+        self.replace(self.old_song, self.new_song)
+
+    def undo(self):
+        self.replace(self.new_song, self.old_song)
+
+def replace_song(songs, old_song, new_song):
+    songs.undo_stack.push(ReplaceSongCommand(songs.data_handler, old_song, new_song, songs.data_changed))
+
+def difficulty(k):
+    return "A5" if k % 2 else "B5"
+
+# Each edit as the editors did it before: copy the song, change the copy, replace the song
+def old_session_edit(songs, tech, song, k):
+    new_song = copy.deepcopy(song)
+    new_song.sessions[0].difficulty_param = difficulty(k)
+    replace_song(songs, song, new_song)
+
+def old_title_edit(songs, tech, song, k):
+    new_song = copy.deepcopy(song)
+    new_song.title = f"곡 {k}"
+    replace_song(songs, song, new_song)
+
+def old_cue_edit(songs, tech, song, k):
+    new_song = copy.deepcopy(song)
+    new_song.cue_sections[0].entries.append(CueEntry(id=f"cue{k}", instrument_name="기타"))
+    replace_song(songs, song, new_song)
+
+def new_session_edit(songs, tech, song, k):
+    songs.update_session(song, song.sessions[0], difficulty_param=difficulty(k))
+
+def new_title_edit(songs, tech, song, k):
+    songs.set_song_field(song, "title", f"곡 {k}")
+
+def new_cue_edit(songs, tech, song, k):
+    tech.add_cue_entry(song, song.cue_sections[0].name, CueEntry(id=f"cue{k}", instrument_name="기타"))
+
+EDITS = [
+    ("session", old_session_edit, new_session_edit),
+    ("title", old_title_edit, new_title_edit),
+    ("cue entry", old_cue_edit, new_cue_edit),
+]
+
+def load(data) -> DataHandler:
+    dh = DataHandler(filepath="")
+    for stage, payload in iter_load_stages(copy.deepcopy(data)):
+        dh.apply_load_stage(stage, payload)
+    return dh
+
+def run(data, edits, edit):
+    """(retained bytes, seconds) for the edits, plus the project after them and after undoing them."""
+    dh = load(data)
+    stack = QUndoStack()
+    song_service = SongService(dh, stack)
+    tech_service = TechService(dh, stack)
+    targets = [s for s in dh.songs if s.sessions and s.cue_sections]
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for k in range(edits):
+        # Look the song up again, the old commands replace it
+        edit(song_service, tech_service, dh.get_song(targets[k % len(targets)].id), k)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    after = dh.snapshot()
+    while stack.canUndo():
+        stack.undo()
+    return size, elapsed, after, dh.snapshot()
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    edits = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    data = build_project(members, songs).snapshot()
+    print(f"{members} members, {songs} songs, {edits} edits each")
+    print(f"{'edit':<11}{'copy (B/edit)':>15}{'command (B/edit)':>18}{'copy (us/edit)':>16}{'command (us/edit)':>19}")
+    for label, old_edit, new_edit in EDITS:
+        old_size, old_time, old_after, old_undone = run(data, edits, old_edit)
+        new_size, new_time, new_after, new_undone = run(data, edits, new_edit)
+        assert old_after == new_after, label
+        assert old_undone == new_undone == data, label
+        print(f"{label:<11}{old_size / edits:>15.0f}{new_size / edits:>18.0f}"
+              f"{old_time / edits * 1e6:>16.0f}{new_time / edits * 1e6:>19.0f}")
+
+if __name__ == "__main__":
+    main()
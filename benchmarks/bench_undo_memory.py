@@ -0,0 +1,115 @@
+"""
+Memory held by the undo history over a long editing session (field edits, session edits, cue entries,
+year passes and concert resets) on a generated large project, with no undo budget and with a small one.
+Held = what clearing the stack frees, as traced by tracemalloc, plus the Qt side of each command, which
+tracemalloc doesn't see (QT_COMMAND_SIZE). Checks first that the estimated command costs follow it, and
+that the budgeted stack stays within its budget while undo still restores the data down to its floor.
+
+    python benchmarks/bench_undo_memory.py [members] [songs] [edits] [budget KB]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+from sample_project import build_project
+from data_handler import DataHandler, iter_load_stages
+from undo_history import UndoHistory, QT_COMMAND_SIZE
+from song_service import SongService
+from tech_service import TechService
+from profile_service import ProfileService
+from models import CueEntry
+
+def load(data) -> DataHandler:
+    dh = DataHandler(filepath="")
+    # Through JSON, as from a file: the project owns its strings, none are shared with `data`
+    for stage, payload in iter_load_stages(json.loads(json.dumps(data))):
+        dh.apply_load_stage(stage, payload)
+    return dh
+
+def traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def held(stack) -> int:
+    """Bytes held by the stack's commands, measured by clearing it, which ends the session's tracing."""
+    count = stack.count()
+    before = traced()
+    stack.clear()
+    freed = before - traced()
+    tracemalloc.stop()
+    return freed + count * QT_COMMAND_SIZE
+
+def session(data, edits, budget, snapshots=False):
+    """
+    Runs the edits, tracing memory from the load on (see held);
+    (stack, data handler, snapshot after each command or None, services).
+    The services must outlive the stack, its commands emit their signals.
+    """
+    gc.collect() # Leftovers of an earlier session
+    tracemalloc.start()
+    dh = load(data)
+    stack = UndoHistory(memory_budget=budget)
+    songs = SongService(dh, stack)
+    tech = TechService(dh, stack)
+    profiles = ProfileService(dh, stack)
+    states = [dh.snapshot()] if snapshots else None
+
+    for k in range(edits):
+        song = dh.songs[k % len(dh.songs)]
+        if k % 500 == 499:
+            songs.reset_concert()
+        elif k % 250 == 249:
+            profiles.pass_year()
+        elif k % 3 == 0:
+            songs.set_song_field(song, "title", f"곡 {k}")
+        elif k % 3 == 1 and song.sessions:
+            songs.update_session(song, song.sessions[0], difficulty_param="A5" if k % 2 else "B5")
+        else:
+            tech.add_cue_entry(song, "곡 전반", CueEntry(id=f"cue{k}", instrument_name="기타"))
+        if snapshots and len(states) <= stack.index():
+            states.append(dh.snapshot())
+    return stack, dh, states, (songs, tech, profiles)
+
+def check(data, edits, budget):
+    stack, dh, _, services = session(data, edits, budget=1 << 40)
+    assert stack.floor == 0
+    estimated = stack.memory_used()
+    ratio = estimated / held(stack)
+    assert 0.8 < ratio < 1.25, f"estimated {estimated} B, measured {estimated / ratio:.0f} B"
+
+    # A shorter session under a tighter budget, the newest undo step is kept even when it is over.
+    # It stops before the concert reset, whose redo makes a new default song (new session ids).
+    budget //= 16
+    stack, dh, states, services = session(data, min(edits, 2000) // 4 - 1, budget, snapshots=True)
+    tracemalloc.stop()
+    assert stack.floor > 0, stack.memory_used()
+    assert stack.memory_used() <= budget or stack.index() - stack.floor == 1, stack.memory_used()
+    while stack.canUndo():
+        stack.undo()
+    assert stack.index() == stack.floor and dh.snapshot() == states[stack.floor]
+    while stack.canRedo():
+        stack.redo()
+    assert dh.snapshot() == states[-1]
+    return ratio
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    songs = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    edits = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    budget = (int(sys.argv[4]) if len(sys.argv) > 4 else 1024) * 1024
+    data = build_project(members, songs).snapshot()
+    print(f"{members} members, {songs} songs, {edits} edits, budget {budget // 1024} KB")
+
+    ratio = check(data, edits, budget)
+    print(f"check: estimate / measured = {ratio:.2f}, budget kept, undo restores down to the floor")
+
+    print(f"{'budget':<10}{'measured (KB)':>15}{'estimated (KB)':>16}{'undo steps':>12}{'released':>10}")
+    for label, limit in (("none", 1 << 40), (f"{budget // 1024} KB", budget)):
+        stack, _, _, services = session(data, edits, limit)
+        estimated, steps, released = stack.memory_used(), stack.index() - stack.floor, stack.floor
+        measured = held(stack)
+        print(f"{label:<10}{measured / 1024:>15.0f}{estimated / 1024:>16.0f}{steps:>12}{released:>10}")
+
+if __name__ == "__main__":
+    main()
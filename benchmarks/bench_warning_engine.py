@@ -0,0 +1,89 @@
+"""
+Bringing the session warnings up to date after one edit: WarningEngine's incremental update (dirty slots, members
+and songs) against the full rescan it does after a load, on generated projects of the request's size
+(200 members, 60 songs) and a large one. Edits cycle through an assignment, a member edit and a song edit.
+Checks first that the incremental records equal a full rescan after every edit.
+
+    python benchmarks/bench_warning_engine.py [edits]
+"""
+import copy
+import random
+import sys
+import time
+
+from sample_project import build_project
+from undo_history import UndoHistory
+from profile_service import ProfileService
+from song_service import SongService
+from session_service import SessionService
+from warning_engine import WarningEngine
+
+SIZES = [(200, 60), (300, 400)]
+
+class Project:
+    def __init__(self, members, songs):
+        self.dh = build_project(members, songs)
+        stack = UndoHistory()
+        self.profiles = ProfileService(self.dh, stack)
+        self.songs = SongService(self.dh, stack)
+        self.sessions = SessionService(self.dh, stack)
+        self.engine = self.sessions.warning_engine
+        self.engine.update()
+        self.rng = random.Random(11)
+
+    def edit(self, k):
+        dh, rng = self.dh, self.rng
+        song = rng.choice(dh.songs)
+        if k % 3 == 0:
+            self.sessions.assign_member(song.id, rng.choice(song.sessions).id, rng.choice(dh.members).id)
+        elif k % 3 == 1:
+            member = rng.choice(dh.members)
+            edited = copy.deepcopy(member)
+            edited.instruments[0].skill, edited.instruments[-1].skill = edited.instruments[-1].skill, edited.instruments[0].skill
+            self.profiles.update_member(member, edited)
+        else:
+            self.songs.set_song_field(song, "bpm", rng.randint(60, 200))
+
+def full_scan(project):
+    engine = WarningEngine(project.sessions)
+    engine.update()
+    project.dh.change_listeners.remove(engine.on_change)
+    return engine.records
+
+def check(members, songs, edits):
+    project = Project(members, songs)
+    for k in range(edits):
+        project.edit(k)
+        project.engine.update()
+        assert project.engine.records == full_scan(project)
+
+def run(members, songs, edits):
+    """(ms per incremental update, ms per full rescan, warnings shown)"""
+    project = Project(members, songs)
+    incremental = full = 0.0
+    for k in range(edits):
+        project.edit(k)
+        start = time.perf_counter()
+        project.engine.update()
+        incremental += time.perf_counter() - start
+
+        project.engine.full_rebuild = True
+        start = time.perf_counter()
+        project.engine.update()
+        full += time.perf_counter() - start
+    return incremental / edits * 1000, full / edits * 1000, len(project.engine.records)
+
+def main():
+    edits = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    print(f"{edits} edits each")
+    for members, songs in SIZES:
+        check(members, songs, 30)
+    print("check: the incremental warnings equal a full rescan after every edit")
+
+    print(f"{'project':<22}{'warnings':>10}{'incremental (ms)':>18}{'full rescan (ms)':>18}")
+    for members, songs in SIZES:
+        incremental, full, shown = run(members, songs, edits)
+        print(f"{f'{members} members/{songs} songs':<22}{shown:>10}{incremental:>18.2f}{full:>18.2f}")
+
+if __name__ == "__main__":
+    main()
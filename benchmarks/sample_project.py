@@ -0,0 +1,61 @@
+"""Generates a large, realistic project for the benchmarks in this directory."""
+import os
+import random
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_handler import DataHandler
+from models import (Member, MemberInstrument, Song, SongSession, CueSection, CueEntry, SessionAssignment,
+                    Grade, SkillLevel, SongCategory, ConnectionType, VOCAL_RANGE, DEFAULT_SECTION_NAMES)
+
+BEATS = ["1", "4", "8", "16", "24", "32"]
+
+def build_project(members=300, songs=400, seed=0) -> DataHandler:
+    rng = random.Random(seed)
+    dh = DataHandler(filepath="")
+    dh.create_defaults()
+    for inst in dh.instruments:
+        inst.connection_type = ConnectionType.NONE.value # Current schema, so loading doesn't migrate
+    vocal = next(i for i in dh.instruments if i.name == "보컬/랩")
+    others = [i for i in dh.instruments if i is not vocal]
+
+    grades = [g.value for g in Grade]
+    skills = [s.value for s in SkillLevel]
+    dh.members = []
+    for n in range(members):
+        m = Member(name=f"부원{n:03d}", grade=rng.choice(grades))
+        m.instruments.append(MemberInstrument(instrument_id=vocal.id, skill=rng.choice(VOCAL_RANGE)))
+        for inst in rng.sample(others, rng.randint(1, 3)):
+            m.instruments.append(MemberInstrument(instrument_id=inst.id, skill=rng.choice(skills)))
+        dh.members.append(m)
+
+    dh.songs = []
+    for n in range(songs):
+        song = Song(title=f"곡 {n:03d}", nickname=f"S{n}", bpm=rng.randint(60, 200),
+                    category=rng.choice([c.value for c in SongCategory]))
+        song.sessions.append(SongSession(instrument_id=vocal.id, difficulty_param=rng.choice(VOCAL_RANGE)))
+        for inst in rng.sample(others, rng.randint(2, 5)):
+            song.sessions.append(SongSession(instrument_id=inst.id, difficulty_param=rng.choice(BEATS)))
+        for name in DEFAULT_SECTION_NAMES[:4]:
+            section = CueSection(name=name)
+            for _ in range(rng.randint(0, 3)):
+                section.entries.append(CueEntry(
+                    id=str(uuid.UUID(int=rng.getrandbits(128))),
+                    instrument_name=rng.choice(others).name,
+                    use_effect=rng.random() < 0.5,
+                    effect_name=rng.choice(["", "리버브", "딜레이", "코러스"]),
+                    effect_level=rng.randint(0, 5),
+                    memo="볼륨 살짝 올리기" if rng.random() < 0.3 else ""
+                ))
+            song.cue_sections.append(section)
+        dh.songs.append(song)
+
+    dh.assignments.replace(
+        SessionAssignment(song_id=song.id, session_id=session.id, member_id=rng.choice(dh.members).id)
+        for song in dh.songs for session in song.sessions if rng.random() < 0.8
+    )
+    dh.sound_design_settings = {f"{inst.name}_{k}_conn": rng.randint(0, 2) for inst in others for k in range(2)}
+    dh.rebuild_index()
+    return dh
@@ -1,42 +1,544 @@
+import copy
 import json
 import os
-from typing import List, Set
-from models import Member, Instrument, Song, Equipment, SessionAssignment, InstrumentCategory, ConnectionType, SongCategory, SongSession
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Set, Dict, Optional, Tuple, Iterable, Callable
+from project_format import FORMAT_JSON, load_bytes, pack_payload, read_summary, sniff_format
+from fragment_cache import FragmentCache, ProjectFragments
+from models import Member, Instrument, Song, Equipment, SessionAssignment, InstrumentCategory, ConnectionType, SongCategory, SongSession, CueSection, CueEntry, SCHEMA_VERSION
+
+# Project load stages, in order
+STAGE_CORE = "core"                 # Members, instruments, equipments, settings, song list without sessions/cue sheets
+STAGE_SONGS = "songs"               # Chunks of (song index, sessions, cue sections)
+STAGE_ASSIGNMENTS = "assignments"   # Assignments, then integrity check and migration of older schema versions
+
+# Change kinds published by the tech sheet, which members, songs and assignments don't depend on
+TECH_KINDS = ("equipment", "settings", "memo", "cue")
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    A change published by an undo command (or a project load) to DataHandler listeners.
+
+    kind: "member" | "song" | "assignment" | "instrument" | "equipment" | "settings" | "memo" | "cue" | "project"
+    action: "added" | "removed" | "updated" | "moved" | "reset" | "loaded"
+    key: member id, song id (also for "cue", a song's cue sheet) or (song_id, session_id) slot;
+    None means every entity of that kind.
+    """
+    kind: str
+    key: object = None
+    action: str = "updated"
+
+@dataclass
+class IntegrityReport:
+    """Repairs made by DataHandler.check_integrity, as (song_id, session_id) slots unless noted."""
+    equipment_ids: List[str] = field(default_factory=list)          # Names of equipments given a missing id
+    dropped_assignments: List[Tuple[str, str]] = field(default_factory=list)    # Song or session gone, or not the song's
+    duplicate_assignments: List[Tuple[str, str]] = field(default_factory=list)  # Later records of one slot
+    cleared_members: List[Tuple[str, str]] = field(default_factory=list)        # Member gone, slot now unassigned
+
+    def __bool__(self):
+        return bool(self.equipment_ids or self.dropped_assignments or self.duplicate_assignments or self.cleared_members)
+
+    def describe(self) -> List[str]:
+        lines = []
+        if self.equipment_ids:
+            lines.append(f"ID가 없는 장비 {len(self.equipment_ids)}개에 새 ID를 부여했습니다.")
+        if self.dropped_assignments:
+            lines.append(f"존재하지 않는 곡/세션의 배정 {len(self.dropped_assignments)}건을 삭제했습니다.")
+        if self.duplicate_assignments:
+            lines.append(f"중복된 배정 {len(self.duplicate_assignments)}건을 삭제했습니다.")
+        if self.cleared_members:
+            lines.append(f"존재하지 않는 부원의 배정 {len(self.cleared_members)}건을 배정 해제했습니다.")
+        return lines
+
+def read_project_file(filepath: str) -> Tuple[dict, str]:
+    """Reads and parses a project file of any format. Returns (data, file format)."""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return load_bytes(raw), sniff_format(raw)
+
+def read_project_summary(filepath: str) -> Optional[dict]:
+    """
+    Summary stored at the start of a project file (see DataHandler.project_summary, plus "hash"),
+    read without loading the project. None if the file is missing, unreadable or saved without one.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            return read_summary(f)
+    except OSError:
+        return None
+
+def iter_load_stages(data: dict, chunk_size: int = 50):
+    """
+    Turns parsed project data into model objects, yielding (stage, payload) in load order.
+    Only builds new objects, so it can run on a worker thread; DataHandler.apply_load_stage attaches them.
+    """
+    schema_version = data.get("schema_version", 0) # Files from before versioning get every migration
+    if schema_version > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported project schema version: {schema_version}")
+
+    songs = data.get("songs", [])
+    # Use SerializableMixin logic mostly via from_dict
+    yield STAGE_CORE, {
+        "schema_version": schema_version,
+        "members": [Member.from_dict(m) for m in data.get("members", [])],
+        "instruments": [Instrument.from_dict(i) for i in data.get("instruments", [])],
+        "songs": [Song.from_dict({**s, "sessions": [], "cue_sections": []}) for s in songs],
+        "equipments": [Equipment.from_dict(e) for e in data.get("equipments", [])],
+        "sound_design_settings": data.get("sound_design_settings", {}),
+        "performance_memo": data.get("performance_memo", ""),
+    }
+
+    for start in range(0, len(songs), chunk_size):
+        yield STAGE_SONGS, [
+            (index,
+             [SongSession.from_dict(x) for x in s.get("sessions", [])],
+             [CueSection.from_dict(x) for x in s.get("cue_sections", [])])
+            for index, s in enumerate(songs[start:start + chunk_size], start)
+        ]
+
+    yield STAGE_ASSIGNMENTS, [SessionAssignment.from_dict(a) for a in data.get("assignments", [])]
+
+class AssignmentStore:
+    """Session assignments indexed by (song_id, session_id), by member and by song.
+
+    Iterates in insertion order like the plain list it replaces. Assignment objects
+    must be mutated through set_member() so the member index stays correct.
+    on_change is called with (slot, action), or (None, "reset") after a bulk replace.
+    """
+    def __init__(self, assignments: Iterable[SessionAssignment] = ()):
+        self.by_slot: Dict[Tuple[str, str], SessionAssignment] = {}
+        self.by_member: Dict[str, Dict[Tuple[str, str], SessionAssignment]] = {}
+        self.by_song: Dict[str, Dict[str, SessionAssignment]] = {}
+        self.on_change: Optional[Callable[[Optional[Tuple[str, str]], str], None]] = None
+        self.replace(assignments)
+
+    def __iter__(self):
+        return iter(list(self.by_slot.values()))
+
+    def __len__(self):
+        return len(self.by_slot)
+
+    def __contains__(self, assignment):
+        return self.by_slot.get((assignment.song_id, assignment.session_id)) is assignment
+
+    def get(self, song_id: str, session_id: str) -> Optional[SessionAssignment]:
+        return self.by_slot.get((song_id, session_id))
+
+    def for_song(self, song_id: str) -> List[SessionAssignment]:
+        return list(self.by_song.get(song_id, {}).values())
+
+    def for_member(self, member_id: str) -> List[SessionAssignment]:
+        return list(self.by_member.get(member_id, {}).values())
+
+    def add(self, assignment: SessionAssignment):
+        self._add(assignment)
+        self._changed((assignment.song_id, assignment.session_id), "added")
+
+    def _add(self, assignment: SessionAssignment):
+        slot = (assignment.song_id, assignment.session_id)
+        old = self.by_slot.get(slot)
+        if old is not None:
+            self._remove(old)
+        self.by_slot[slot] = assignment
+        self.by_song.setdefault(assignment.song_id, {})[assignment.session_id] = assignment
+        if assignment.member_id:
+            self.by_member.setdefault(assignment.member_id, {})[slot] = assignment
+
+    def remove(self, assignment: SessionAssignment):
+        if self._remove(assignment):
+            self._changed((assignment.song_id, assignment.session_id), "removed")
+
+    def _remove(self, assignment: SessionAssignment) -> bool:
+        slot = (assignment.song_id, assignment.session_id)
+        if self.by_slot.get(slot) is not assignment:
+            return False
+        del self.by_slot[slot]
+        song_bucket = self.by_song.get(assignment.song_id)
+        if song_bucket is not None:
+            song_bucket.pop(assignment.session_id, None)
+            if not song_bucket:
+                del self.by_song[assignment.song_id]
+        self._unindex_member(assignment, slot)
+        return True
+
+    def set_member(self, assignment: SessionAssignment, member_id: Optional[str], ignore_warnings: bool):
+        slot = (assignment.song_id, assignment.session_id)
+        indexed = self.by_slot.get(slot) is assignment
+        if indexed:
+            self._unindex_member(assignment, slot)
+        assignment.member_id = member_id
+        assignment.ignore_warnings = ignore_warnings
+        if indexed and member_id:
+            self.by_member.setdefault(member_id, {})[slot] = assignment
+        if indexed:
+            self._changed(slot, "updated")
+
+    def replace(self, assignments: Iterable[SessionAssignment]):
+        self.by_slot = {}
+        self.by_member = {}
+        self.by_song = {}
+        for a in assignments:
+            # Keep the first record of a duplicated slot, as lookups always did
+            if (a.song_id, a.session_id) not in self.by_slot:
+                self._add(a)
+        self._changed(None, "reset")
+
+    def clear(self):
+        self.replace(())
+
+    def _changed(self, slot, action):
+        if self.on_change:
+            self.on_change(slot, action)
+
+    def _unindex_member(self, assignment, slot):
+        if not assignment.member_id:
+            return
+        bucket = self.by_member.get(assignment.member_id)
+        if bucket is not None:
+            bucket.pop(slot, None)
+            if not bucket:
+                del self.by_member[assignment.member_id]
+
+class AssignmentCounters:
+    """Per-member assignment counts (with and without vocal) and the running average behind OVER/UNDER.
+
+    Kept up to date from DataHandler change notifications: an assignment edit moves one slot between
+    two members in O(1), a song edit re-checks that song's slots, instrument edits and bulk loads
+    recount lazily on the next read. Only members that are still in the project count toward the average.
+    """
+    def __init__(self, data_handler):
+        self.data_handler = data_handler
+        self.with_vocal: Dict[str, int] = {}
+        self.without_vocal: Dict[str, int] = {}
+        self.slots: Dict[Tuple[str, str], Tuple[str, bool]] = {} # slot -> (member_id, counted without vocal)
+        self.included: Set[str] = set()
+        self.total = 0
+        self.valid_members = 0
+        self.full_recount = True
+
+    def on_change(self, event: ChangeEvent):
+        if self.full_recount or event.kind in TECH_KINDS:
+            return
+        if event.key is None or event.kind in ("instrument", "project"):
+            self.full_recount = True
+        elif event.kind == "assignment":
+            self._update_slot(event.key)
+        elif event.kind == "song":
+            for a in self.data_handler.assignments.for_song(event.key):
+                self._update_slot((a.song_id, a.session_id))
+        elif event.kind == "member":
+            self._update_member(event.key)
+
+    # Queries
+    def count(self, member_id: str, include_vocal: bool = True) -> int:
+        self._ensure()
+        counts = self.with_vocal if include_vocal else self.without_vocal
+        return counts.get(member_id, 0)
+
+    def average(self) -> float:
+        self._ensure()
+        return self.total / self.valid_members if self.valid_members > 0 else 0
+
+    def status(self, member_id: str) -> str:
+        # "OVER" | "UNDER" | "NORMAL" | "NONE", +-1 from the average of members with >= 1 assignment
+        count = self.count(member_id)
+        avg = self.average()
+        if count == 0:
+            return "NONE"
+        elif count >= avg + 1:
+            return "OVER"
+        elif count <= avg - 1:
+            return "UNDER"
+        return "NORMAL"
+
+    def stats(self) -> Dict[str, str]:
+        return {m.id: self.status(m.id) for m in self.data_handler.members}
+
+    # Updates
+    def _ensure(self):
+        if self.full_recount:
+            self._recount()
+
+    def _recount(self):
+        self.full_recount = False
+        self.with_vocal = {}
+        self.without_vocal = {}
+        self.slots = {}
+        self.included = set(self.data_handler.member_by_id)
+        self.total = 0
+        self.valid_members = 0
+        for a in self.data_handler.assignments:
+            self._update_slot((a.song_id, a.session_id))
+
+    def _update_slot(self, slot):
+        old = self.slots.pop(slot, None)
+        if old:
+            self._add(old[0], old[1], -1)
+        a = self.data_handler.assignments.get(*slot)
+        if a and a.member_id:
+            counted = self._counts_without_vocal(a)
+            self.slots[slot] = (a.member_id, counted)
+            self._add(a.member_id, counted, 1)
+
+    def _update_member(self, member_id):
+        present = member_id in self.data_handler.member_by_id
+        if present == (member_id in self.included):
+            return
+        count = self.with_vocal.get(member_id, 0)
+        sign = 1 if present else -1
+        if present:
+            self.included.add(member_id)
+        else:
+            self.included.discard(member_id)
+        self.total += sign * count
+        if count > 0:
+            self.valid_members += sign
+
+    def _add(self, member_id, counted_without_vocal, delta):
+        before = self.with_vocal.get(member_id, 0)
+        after = before + delta
+        if after:
+            self.with_vocal[member_id] = after
+        else:
+            self.with_vocal.pop(member_id, None)
+
+        if counted_without_vocal:
+            without = self.without_vocal.get(member_id, 0) + delta
+            if without:
+                self.without_vocal[member_id] = without
+            else:
+                self.without_vocal.pop(member_id, None)
+
+        if member_id in self.included:
+            self.total += delta
+            if before == 0 and after > 0:
+                self.valid_members += 1
+            elif before > 0 and after == 0:
+                self.valid_members -= 1
+
+    def _counts_without_vocal(self, a) -> bool:
+        song = self.data_handler.get_song(a.song_id)
+        if not song:
+            return False
+        session = self.data_handler.get_session(a.session_id)
+        if not session:
+            return False
+        inst = self.data_handler.get_instrument(session.instrument_id)
+        return inst is not None and inst.name != "보컬/랩"
 
 class DataHandler:
     def __init__(self, filepath: str = "data.acou"):
         self.filepath = filepath
+        self.file_format = FORMAT_JSON # Format of the current file, kept by plain saves
+        self.loading_file: Optional[Tuple[str, str]] = None # (filepath, format) of a load not attached yet
         self.members: List[Member] = []
         self.instruments: List[Instrument] = []
         self.songs: List[Song] = []
         self.equipments: List[Equipment] = []
-        self.assignments: List[SessionAssignment] = []
+        self.assignments: AssignmentStore = AssignmentStore()
+        self.assignments.on_change = self._on_assignment_changed
         self.sound_design_settings: dict = {}
         self.performance_memo: str = ""
+
+        # Id lookups (kept in sync by the undo commands, rebuilt on load)
+        self.member_by_id: Dict[str, Member] = {}
+        self.song_by_id: Dict[str, Song] = {}
+        self.session_by_id: Dict[str, SongSession] = {}
+        self.song_by_session_id: Dict[str, Song] = {}
+        self.instrument_by_id: Dict[str, Instrument] = {}
+        self.instrument_by_name: Dict[str, Instrument] = {}
+
+        # Change listeners, called with a ChangeEvent
+        self.change_listeners: List[Callable[[ChangeEvent], None]] = []
+
+        self.assignment_counters = AssignmentCounters(self)
+        self.add_change_listener(self.assignment_counters.on_change)
+        self.fragments = FragmentCache(self)
         
         self.recent_files: List[str] = []
         self.load_recent_files_list()
 
-    def save_data(self, filepath: str = None):
-        target_path = filepath if filepath else self.filepath
-        if not target_path:
-            return # Should handle error
+    # Entity Lookups
+    def get_member(self, member_id: str) -> Optional[Member]:
+        return self.member_by_id.get(member_id)
+
+    def get_song(self, song_id: str) -> Optional[Song]:
+        return self.song_by_id.get(song_id)
+
+    def get_session(self, session_id: str) -> Optional[SongSession]:
+        return self.session_by_id.get(session_id)
+
+    def get_song_for_session(self, session_id: str) -> Optional[Song]:
+        return self.song_by_session_id.get(session_id)
+
+    def get_instrument(self, instrument_id: str) -> Optional[Instrument]:
+        return self.instrument_by_id.get(instrument_id)
+
+    def get_instrument_by_name(self, name: str) -> Optional[Instrument]:
+        return self.instrument_by_name.get(name)
+
+    # Change Tracking
+    def add_change_listener(self, listener: Callable[[ChangeEvent], None]):
+        self.change_listeners.append(listener)
+
+    def notify_change(self, kind: str, key=None, action: str = "updated"):
+        """Publishes a ChangeEvent. Commands call this after mutating the lists and indexes."""
+        event = ChangeEvent(kind, key, action)
+        for listener in self.change_listeners:
+            listener(event)
 
-        data = {
+    def _on_assignment_changed(self, slot, action):
+        self.notify_change("assignment", slot, action)
+
+    def rebuild_index(self):
+        """Rebuilds every id lookup from the entity lists."""
+        self.member_by_id = {m.id: m for m in self.members}
+
+        self.song_by_id = {}
+        self.session_by_id = {}
+        self.song_by_session_id = {}
+        for s in self.songs:
+            self.index_song(s)
+
+        self._rebuild_instrument_index()
+
+    def index_member(self, member: Member):
+        self.member_by_id[member.id] = member
+
+    def unindex_member(self, member: Member):
+        # Only drop the entry if it still points at this object (replacements share ids)
+        if self.member_by_id.get(member.id) is member:
+            del self.member_by_id[member.id]
+
+    def index_song(self, song: Song):
+        self.song_by_id[song.id] = song
+        for session in song.sessions:
+            self.index_session(song, session)
+
+    def unindex_song(self, song: Song):
+        if self.song_by_id.get(song.id) is song:
+            del self.song_by_id[song.id]
+        for session in song.sessions:
+            self.unindex_session(song, session)
+
+    def index_session(self, song: Song, session: SongSession):
+        self.session_by_id[session.id] = session
+        self.song_by_session_id[session.id] = song
+
+    def unindex_session(self, song: Song, session: SongSession):
+        if self.song_by_session_id.get(session.id) is song:
+            del self.song_by_session_id[session.id]
+            self.session_by_id.pop(session.id, None)
+
+    def rebuild_instrument_index(self):
+        self._rebuild_instrument_index()
+        self.notify_change("instrument")
+
+    def _rebuild_instrument_index(self):
+        # Instruments are few and renamed in place by the edit dialog, so rebuild instead of patching.
+        # Name lookup keeps the first match, like the old linear scans.
+        self.instrument_by_id = {}
+        self.instrument_by_name = {}
+        for inst in self.instruments:
+            self.instrument_by_id[inst.id] = inst
+            self.instrument_by_name.setdefault(inst.name, inst)
+
+    def snapshot(self) -> dict:
+        """Plain-data copy of the project. Shares nothing with the live models, so it can be written from another thread."""
+        return {
+            "schema_version": SCHEMA_VERSION,
             "members": [m.to_dict() for m in self.members],
             "instruments": [i.to_dict() for i in self.instruments],
             "songs": [s.to_dict() for s in self.songs],
             "equipments": [e.to_dict() for e in self.equipments],
             "assignments": [a.to_dict() for a in self.assignments],
-            "sound_design_settings": self.sound_design_settings,
+            "sound_design_settings": copy.deepcopy(self.sound_design_settings),
             "performance_memo": self.performance_memo
         }
+
+    def project_summary(self) -> dict:
+        """Counts written into the file header on save, for previews that don't load the project."""
+        return {
+            "members": len(self.members),
+            "songs": len(self.songs),
+            "sessions": len(self.session_by_id),
+            "assigned": sum(1 for a in self.assignments if a.member_id),
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def encode_project(self, file_format: str = FORMAT_JSON) -> bytes:
+        """
+        The project encoded for write_project_file, built from cached fragments so only what changed
+        since the last save is re-encoded.
+        """
+        return self.fragments.encode(file_format)
+
+    def snapshot_fragments(self, file_format: str = FORMAT_JSON) -> ProjectFragments:
+        """
+        The project as it is now, to be encoded on another thread (encode_project split in two): the changed
+        fragments are taken here as plain data, their encoding and the join happen in encode().
+        """
+        return self.fragments.snapshot(file_format)
+
+    @staticmethod
+    def write_project_file(payload: bytes, target_path: str, file_format: str = FORMAT_JSON, summary: Optional[dict] = None):
+        """
+        Writes an encoded project next to the target, fsyncs it and renames it over the target,
+        so a crash mid-save leaves either the old or the new file, never a truncated one.
+        A summary (project_summary()) goes into the file header.
+        """
+        raw = pack_payload(payload, file_format, summary=summary)
+        directory = os.path.dirname(os.path.abspath(target_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
         try:
-            with open(target_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            
-            self.filepath = target_path
-            self.add_recent_file(target_path)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(target_path):
+                shutil.copymode(target_path, tmp_path)
+            else:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # Persist the rename itself (not supported on Windows)
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def finish_save(self, target_path: str, file_format: str):
+        self.filepath = target_path
+        self.file_format = file_format
+        self.add_recent_file(target_path)
+
+    def save_data(self, filepath: str = None, file_format: str = None):
+        target_path = filepath if filepath else self.filepath
+        if not target_path:
+            return # Should handle error
+        file_format = file_format or self.file_format
+
+        try:
+            self.write_project_file(self.encode_project(file_format), target_path, file_format, self.project_summary())
+            self.finish_save(target_path, file_format)
             
         except Exception as e:
             print(f"Failed to save data: {e}")
@@ -47,142 +549,221 @@ class DataHandler:
             raise FileNotFoundError(f"File not found: {filepath}")
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Use SerializableMixin logic mostly via from_dict
-            self.members = [Member.from_dict(m) for m in data.get("members", [])]
-            self.instruments = [Instrument.from_dict(i) for i in data.get("instruments", [])]
-            self.songs = [Song.from_dict(s) for s in data.get("songs", [])]
-            self.equipments = [Equipment.from_dict(e) for e in data.get("equipments", [])]
-            self.assignments = [SessionAssignment.from_dict(a) for a in data.get("assignments", [])]
-            self.sound_design_settings = data.get("sound_design_settings", {})
-            self.performance_memo = data.get("performance_memo", "")
-            
-            self.filepath = filepath
-            self.check_integrity()
-            self.migration_log = self.migrate_data()
-            self.add_recent_file(filepath)
+            data, file_format = read_project_file(filepath)
+            self.begin_load(filepath, file_format)
+            for stage, payload in iter_load_stages(data):
+                self.apply_load_stage(stage, payload)
+            self.finish_load()
             
         except (json.JSONDecodeError, KeyError, Exception) as e:
             print(f"Error loading data: {e}")
             raise e # Let UI handle error
 
+    # Staged loading (load_data runs all stages at once, ProjectLoader streams them from a worker thread)
+    def begin_load(self, filepath: str, file_format: str):
+        # Taken on with the core stage: until then the current project keeps its own file
+        self.loading_file = (filepath, file_format)
+
+    def apply_load_stage(self, stage: str, payload):
+        if stage == STAGE_CORE:
+            if self.loading_file:
+                self.filepath, self.file_format = self.loading_file
+                self.loading_file = None
+            self.migration_log = []
+            self.integrity_report = IntegrityReport()
+            self.loaded_schema_version = payload["schema_version"]
+            self.members = payload["members"]
+            self.instruments = payload["instruments"]
+            self.songs = payload["songs"]
+            self.equipments = payload["equipments"]
+            self.sound_design_settings = payload["sound_design_settings"]
+            self.performance_memo = payload["performance_memo"]
+            self.assignments.clear()
+            self.rebuild_index()
+            self.notify_change("project", action="loaded")
+
+        elif stage == STAGE_SONGS:
+            for index, sessions, cue_sections in payload:
+                song = self.songs[index]
+                song.sessions = sessions
+                song.cue_sections = cue_sections
+                self.index_song(song)
+            self.notify_change("song")
+
+        elif stage == STAGE_ASSIGNMENTS:
+            self.integrity_report = self.check_integrity(payload)
+            self.migration_log = self.migrate_data(self.loaded_schema_version) + self.integrity_report.describe()
+            self.notify_change("project", action="loaded")
+
+    def finish_load(self):
+        self.add_recent_file(self.filepath)
+
     def create_new_project(self, filepath: str):
         # Clear data
         self.members = []
         self.instruments = []
         self.songs = []
         self.equipments = []
-        self.assignments = []
+        self.assignments.clear()
         self.sound_design_settings = {}
         self.performance_memo = ""
         
         # Load defaults
         self.create_defaults()
+        self.rebuild_index()
+        self.notify_change("project", action="loaded")
         
         # Save immediately
-        self.save_data(filepath)
+        self.save_data(filepath, FORMAT_JSON)
 
-    def check_integrity(self):
-        member_ids = {m.id for m in self.members}
-        song_ids = {s.id for s in self.songs}
-        
-        # Ensure all equipments have IDs
-        import uuid
+    def check_integrity(self, assignments: Optional[Iterable[SessionAssignment]] = None) -> IntegrityReport:
+        """
+        Repairs references the rest of the app relies on, in one pass over the equipments and the
+        assignments (the given ones, or the current ones), and stores the valid assignments.
+        Needs the id lookups to be up to date.
+        """
+        report = IntegrityReport()
         for eq in self.equipments:
             if not eq.id:
                 eq.id = str(uuid.uuid4())
-        
-        valid_session_ids = set()
-        for song in self.songs:
-            for session in song.sessions:
-                valid_session_ids.add(session.id)
+                report.equipment_ids.append(eq.name)
 
-        valid_assignments = []
-        for a in self.assignments:
-            if a.song_id not in song_ids:
+        valid = []
+        seen = set()
+        song_by_session_id = self.song_by_session_id
+        member_by_id = self.member_by_id
+        for a in (self.assignments if assignments is None else assignments):
+            slot = (a.song_id, a.session_id)
+            song = song_by_session_id.get(a.session_id)
+            if song is None or song.id != a.song_id:
+                report.dropped_assignments.append(slot)
                 continue
-            if a.session_id not in valid_session_ids:
+            if slot in seen:
+                report.duplicate_assignments.append(slot)
                 continue
-            if a.member_id and a.member_id not in member_ids:
+            seen.add(slot)
+            if a.member_id and a.member_id not in member_by_id:
                 a.member_id = None
-            valid_assignments.append(a)
-        
-        self.assignments = valid_assignments
+                report.cleared_members.append(slot)
+            valid.append(a)
 
-    def migrate_data(self):
-        """Migrates data from older versions to the current schema.
+        if assignments is not None or report:
+            self.assignments.replace(valid)
+        return report
+
+    def migrate_data(self, from_version: int = 0) -> List[str]:
+        """Brings data saved with an older schema version up to SCHEMA_VERSION, one MIGRATIONS step at a time.
         Returns a list of change descriptions (empty if no changes were made).
         """
         changes = []
+        for version, step in self.MIGRATIONS:
+            if version > from_version:
+                step(self, changes)
+        return changes
 
-        # 1. Instruments: Reset connection_type to default 'X'
+    def _reset_connection_types(self, changes: List[str]):
+        # Connection types moved to the sound design settings
         for inst in self.instruments:
-            if hasattr(inst, 'connection_type') and inst.connection_type != ConnectionType.NONE.value:
+            if inst.connection_type != ConnectionType.NONE.value:
                 inst.connection_type = ConnectionType.NONE.value
-                if not changes or not any("연결 방식" in c for c in changes):
+                if not any("연결 방식" in c for c in changes):
                     changes.append("악기 연결 방식 설정이 초기화되었습니다. (음향 설계에서 관리)")
 
-        # 2. Equipment name changes
+    def _rename_equipments(self, changes: List[str]):
         eq_rename_map = {
             "SM57": "SM57 (악기 마이크)",
             "일렉 앰프1": "일렉 앰프",
             "일렉 앰프2": "일렉 앰프",
         }
-        merged_ids = []  # Track IDs of equipment merged into another
+        by_name = {}
+        for eq in self.equipments:
+            by_name.setdefault(eq.name, []).append(eq)
+        merged_ids = set()  # IDs of equipment merged into another
         for eq in self.equipments:
             if eq.name in eq_rename_map:
                 new_name = eq_rename_map[eq.name]
                 # Check if target name already exists (for merge case like 앰프1+앰프2 → 앰프)
-                existing = next((e for e in self.equipments if e.name == new_name and e.id != eq.id), None)
+                existing = next((e for e in by_name.get(new_name, ()) if e.id != eq.id), None)
                 if existing and eq.name.startswith("일렉 앰프"):
                     # Merge: add owned_count to existing, mark for removal
                     existing.owned_count += eq.owned_count
-                    merged_ids.append(eq.id)
+                    merged_ids.add(eq.id)
                     changes.append(f"장비 '{eq.name}'이(가) '{new_name}'으로 통합되었습니다.")
                 else:
                     old_name = eq.name
                     eq.name = new_name
+                    by_name.setdefault(new_name, []).append(eq)
                     changes.append(f"장비명 변경: '{old_name}' → '{new_name}'")
 
         # Remove merged equipment
         if merged_ids:
             self.equipments = [e for e in self.equipments if e.id not in merged_ids]
 
-        # 3. Sound design settings: convert legacy keys to new format
+    def _convert_sound_design_keys(self, changes: List[str]):
         old_settings = self.sound_design_settings
-        new_settings = {}
-        settings_migrated = False
-
         legacy_key_map = {
             'eg1_cable': ('일렉기타_0_conn', self._convert_eg_cable),
             'eg2_cable': ('일렉기타_1_conn', self._convert_eg_cable),
             'piano1_di': ('디지털 피아노_0_conn', None),  # 0=패시브, 1=액티브 (same)
             'piano2_di': ('신디사이저_0_conn', None),     # 0=패시브, 1=액티브 (same)
         }
+        if not any(k in old_settings for k in legacy_key_map):
+            return
 
-        has_legacy_keys = any(k in old_settings for k in legacy_key_map)
+        # Copy non-legacy keys as-is
+        new_settings = {key: value for key, value in old_settings.items() if key not in legacy_key_map}
 
-        if has_legacy_keys:
-            # Copy non-legacy keys as-is
-            for key, value in old_settings.items():
-                if key not in legacy_key_map:
-                    new_settings[key] = value
+        # Convert legacy keys
+        for old_key, (new_key, converter) in legacy_key_map.items():
+            if old_key in old_settings:
+                old_val = old_settings[old_key]
+                new_settings[new_key] = converter(old_val) if converter else old_val
 
-            # Convert legacy keys
-            for old_key, (new_key, converter) in legacy_key_map.items():
-                if old_key in old_settings:
-                    old_val = old_settings[old_key]
-                    new_val = converter(old_val) if converter else old_val
-                    new_settings[new_key] = new_val
-                    settings_migrated = True
+        self.sound_design_settings = new_settings
+        changes.append("음향 설계 설정이 새 형식으로 변환되었습니다.")
 
-            if settings_migrated:
-                self.sound_design_settings = new_settings
-                changes.append("음향 설계 설정이 새 형식으로 변환되었습니다.")
+    def _convert_cue_notes(self, changes: List[str]):
+        # JSON strings in instrument_notes -> CueEntry list
+        cues_migrated = False
+        for song in self.songs:
+            for section in song.cue_sections:
+                if section.instrument_notes is None:
+                    continue
+                for entry_id, note_json in section.instrument_notes.items():
+                    entry = self._convert_cue_note(entry_id, note_json)
+                    if entry:
+                        section.entries.append(entry)
+                section.instrument_notes = None
+                cues_migrated = True
+        if cues_migrated:
+            changes.append("큐시트 항목이 새 형식으로 변환되었습니다.")
 
-        return changes
+    # Schema migrations, oldest first: (schema version the step brings data to, step).
+    # Add new steps at the end and bump models.SCHEMA_VERSION to match.
+    MIGRATIONS = (
+        (1, _reset_connection_types),
+        (2, _rename_equipments),
+        (3, _convert_sound_design_keys),
+        (4, _convert_cue_notes),
+    )
+
+    @staticmethod
+    def _convert_cue_note(entry_id, note_json) -> Optional[CueEntry]:
+        """Old cue entry (JSON string), None if it can't be read (the cue table skipped those too)."""
+        try:
+            data = json.loads(note_json)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        return CueEntry(
+            id=entry_id,
+            instrument_name=data.get("instrument_name") or "",
+            use_effect=bool(data.get("use_effect")),
+            effect_name=data.get("effect_name") or "",
+            effect_level=data.get("effect_level") or 0,
+            memo=data.get("memo") or "",
+        )
 
     @staticmethod
     def _convert_eg_cable(old_val):
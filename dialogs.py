@@ -1,8 +1,9 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QComboBox, QPushButton, QListWidget, QListWidgetItem,
-                             QMessageBox, QScrollArea, QWidget, QTreeWidget, QTreeWidgetItem, QFrame, QRadioButton, QButtonGroup, QAbstractItemView, QCheckBox, QTextEdit, QGroupBox, QStackedWidget)
+                             QMessageBox, QScrollArea, QWidget, QTreeWidget, QTreeWidgetItem, QFrame, QRadioButton, QButtonGroup, QAbstractItemView, QCheckBox, QTextEdit, QGroupBox, QStackedWidget, QSpinBox)
 from PyQt6.QtCore import Qt, pyqtSignal
-from models import Member, Grade, MemberInstrument, Instrument, SkillLevel, InstrumentCategory, Song, SongSession, CueSection, DEFAULT_SECTION_NAMES
+from models import Member, Grade, MemberInstrument, Instrument, SkillLevel, InstrumentCategory, Song, SongSession, CueSection, CueEntry, DEFAULT_SECTION_NAMES, VOCAL_RANGE
+from skill_evaluator import CANNOT_PLAY, SKILL_TOO_HIGH
 import uuid
 
 
@@ -116,7 +117,7 @@ class InstrumentEditDialog(QDialog):
             return
             
         inst_id = item.data(0, Qt.ItemDataRole.UserRole)
-        inst = next((i for i in self.data_handler.instruments if i.id == inst_id), None)
+        inst = self.data_handler.get_instrument(inst_id)
         if not inst: return
         
         self.current_edit_id = inst.id
@@ -163,7 +164,7 @@ class InstrumentEditDialog(QDialog):
         cat = self.combo_cat.currentText()
         
         if self.current_edit_id:
-            inst = next((i for i in self.data_handler.instruments if i.id == self.current_edit_id), None)
+            inst = self.data_handler.get_instrument(self.current_edit_id)
             if inst:
                 inst.name = name
                 inst.category = cat
@@ -171,6 +172,7 @@ class InstrumentEditDialog(QDialog):
             new_inst = Instrument(name=name, category=cat)
             self.data_handler.instruments.append(new_inst)
             
+        self.data_handler.rebuild_instrument_index()
         self.load_instruments()
         self.instruments_changed.emit()
         self.hide_right_panel()
@@ -178,7 +180,7 @@ class InstrumentEditDialog(QDialog):
     def delete_instrument(self):
         if not self.current_edit_id: return
         
-        inst = next((i for i in self.data_handler.instruments if i.id == self.current_edit_id), None)
+        inst = self.data_handler.get_instrument(self.current_edit_id)
         if not inst: return
 
         if getattr(inst, 'is_default', False):
@@ -189,6 +191,7 @@ class InstrumentEditDialog(QDialog):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             self.data_handler.instruments.remove(inst)
+            self.data_handler.rebuild_instrument_index()
             self.load_instruments()
             self.instruments_changed.emit()
             self.hide_right_panel()
@@ -252,9 +255,7 @@ class InstrumentSelectDialog(QDialog):
 
 # 프로필 편집 - 악기 Row(행) 위젯
 class InstrumentRowWidget(QWidget):
-    VOCAL_RANGE = ["E5", "F5", "F#5", "G5", "G#5", "A5", "A#5", "B5", 
-                   "C6", "C#6", "D6", "D#6", "E6", "F6", "F#6", "G6", "G#6", "A6", "A#6", "B6", 
-                   "C7"]
+    VOCAL_RANGE = VOCAL_RANGE
 
     def __init__(self, pool, data: MemberInstrument = None, parent_dialog=None):
         super().__init__()
@@ -534,17 +535,13 @@ class SessionEditDialog(QDialog):
             row_layout.addLayout(h_layout)
             
             # Check for Warning
-            warnings = self.service.validate_assignment(self.member, self.song, session)
+            warnings = self.service.assignment_warnings(self.member, self.song, session)
             if warnings:
-                for w in warnings:
+                for kind, w in warnings:
                     lbl = QLabel(w)
-                    if "배정되지 않았습니다" in w or "너무 적습니다" in w:
-                        lbl.setStyleSheet("color: #FF8C00; font-size: 11px;")
-                    elif "너무 많습니다" in w:
-                        lbl.setStyleSheet("color: #FF4800; font-size: 11px;")
-                    elif "할 수 없습니다" in w:
+                    if kind == CANNOT_PLAY:
                         lbl.setStyleSheet("color: black; font-size: 11px;")
-                    elif "너무 높습니다" in w:
+                    elif kind == SKILL_TOO_HIGH:
                         lbl.setStyleSheet("color: blue; font-size: 11px;")
                     else:
                         lbl.setStyleSheet("color: red; font-size: 11px;")
@@ -801,17 +798,16 @@ class CueSheetEditDialog(QDialog):
         
         sec_name = self.section_list.currentItem().text()
         
-        import json
-        # Construct data dict
-        entry_data = {
-            "instrument_name": self.input_inst_name.text().strip(),
-            "use_effect": self.cb_effect.isChecked(),
-            "effect_name": self.input_effect_name.text().strip(),
-            "effect_level": self.group_level.checkedId(),
-            "memo": self.edit_memo.toPlainText()
-        }
+        # New entry; edits keep the id of the entry they replace
+        entry = CueEntry(
+            instrument_name=self.input_inst_name.text().strip(),
+            use_effect=self.cb_effect.isChecked(),
+            effect_name=self.input_effect_name.text().strip(),
+            effect_level=max(self.group_level.checkedId(), 0),
+            memo=self.edit_memo.toPlainText()
+        )
         
-        return sec_name, entry_data
+        return sec_name, entry
 
     def keyPressEvent(self, event):
         if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
@@ -1079,4 +1075,80 @@ class SoundDesignDialog(QDialog):
     def save_and_accept(self):
         # Sync back to data_handler
         self.data_handler.sound_design_settings = self.settings
+        self.data_handler.notify_change("settings")
         self.accept()
+
+
+# 작업 기록 메모리 다이얼로그
+class UndoMemoryDialog(QDialog):
+    def __init__(self, undo_stack, parent=None):
+        super().__init__(parent)
+        self.undo_stack = undo_stack
+        self.setWindowTitle("작업 기록 메모리")
+        self.resize(420, 480)
+
+        self.init_ui()
+        self.refresh()
+        self.undo_stack.memory_changed.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.lbl_usage = QLabel()
+        self.lbl_usage.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.lbl_usage)
+        self.lbl_counts = QLabel()
+        layout.addWidget(self.lbl_counts)
+
+        budget_layout = QHBoxLayout()
+        budget_layout.addWidget(QLabel("메모리 한도:"))
+        self.spin_budget = QSpinBox()
+        self.spin_budget.setRange(1, 1024)
+        self.spin_budget.setSuffix(" MB")
+        self.spin_budget.setValue(max(1, self.undo_stack.memory_budget // (1024 * 1024)))
+        self.spin_budget.valueChanged.connect(self.on_budget_changed)
+        budget_layout.addWidget(self.spin_budget)
+        budget_layout.addStretch()
+        layout.addLayout(budget_layout)
+
+        lbl_note = QLabel("크기는 추정치라 실제 메모리는 한도를 조금 넘을 수 있습니다. "
+                          "정리된 작업도 새 프로젝트를 열 때까지 작은 크기를 차지합니다.")
+        lbl_note.setWordWrap(True)
+        lbl_note.setStyleSheet("color: gray;")
+        layout.addWidget(lbl_note)
+
+        layout.addWidget(QLabel("작업별 추정 크기 (최근 작업부터)"))
+        self.command_list = QTreeWidget()
+        self.command_list.setHeaderLabels(["작업", "크기"])
+        self.command_list.setRootIsDecorated(False)
+        self.command_list.setColumnWidth(0, 260)
+        layout.addWidget(self.command_list)
+
+        btn_close = QPushButton("닫기")
+        btn_close.clicked.connect(self.accept)
+        layout.addWidget(btn_close)
+
+    @staticmethod
+    def format_size(size):
+        if size >= 1024 * 1024:
+            return f"{size / (1024 * 1024):.1f} MB"
+        if size >= 1024:
+            return f"{size / 1024:.1f} KB"
+        return f"{size} B"
+
+    def refresh(self):
+        stack = self.undo_stack
+        used = stack.memory_used()
+        self.lbl_usage.setText(f"사용 중 (추정): {self.format_size(used)} / {self.format_size(stack.memory_budget)}")
+        self.lbl_counts.setText(f"작업 {stack.count()}개 (되돌리기 가능 {stack.index() - stack.floor}개, 정리됨 {stack.floor}개)")
+
+        self.command_list.clear()
+        for i in reversed(range(stack.floor, stack.count())):
+            item = QTreeWidgetItem([stack.text(i), self.format_size(stack.costs[i])])
+            item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            if i >= stack.index():
+                item.setForeground(0, Qt.GlobalColor.gray) # Undone, can be redone
+            self.command_list.addTopLevelItem(item)
+
+    def on_budget_changed(self, value):
+        self.undo_stack.set_memory_budget(value * 1024 * 1024)
@@ -0,0 +1,157 @@
+import numpy as np
+from typing import Dict, Tuple, Optional
+from models import SkillLevel
+from skill_evaluator import SKILL_LEVELS, SKILL_CAPS, LEVEL_THRESHOLDS
+from data_handler import TECH_KINDS
+
+# Verdict codes (bit flags, CANT_PLAY is exclusive)
+OK = 0
+TOO_LOW = 1     # Skill below the song requirement / vocal range below the highest note
+TOO_HIGH = 2    # Skill far above the song requirement
+CANT_PLAY = 4   # Member doesn't play the session's instrument
+
+class FeasibilityMatrix:
+    """
+    members x sessions matrix of skill verdicts for the whole concert.
+
+    Rows are keyed by member id, columns by (song_id, session_id). The whole matrix is evaluated in
+    one vectorized pass; member edits only re-evaluate that member's row, song/instrument edits and
+    member add/remove rebuild it. Everything is recomputed lazily on the next read.
+    """
+    def __init__(self, data_handler, evaluator):
+        self.data_handler = data_handler
+        self.evaluator = evaluator
+
+        self.member_rows: Dict[str, int] = {}
+        self.slot_cols: Dict[Tuple[str, str], int] = {}
+        self.verdicts = np.zeros((0, 0), dtype=np.int8)
+
+        # Column features
+        self.inst_ids: Dict[str, int] = {}
+        self.col_inst = np.zeros(0, dtype=np.int64)
+        self.col_vocal = np.zeros(0, dtype=bool)
+        self.col_req_val = np.zeros(0, dtype=np.int64)
+        self.col_req_level = np.zeros(0, dtype=np.int64)
+        self.col_req_pitch = np.zeros(0, dtype=np.int64)
+
+        self.full_rebuild = True
+        self.dirty_members = set()
+
+        self.data_handler.add_change_listener(self.on_change)
+
+    def on_change(self, event):
+        if event.kind == "member" and event.key is not None:
+            self.dirty_members.add(event.key)
+        elif event.kind == "assignment" or event.kind in TECH_KINDS or event.action == "moved":
+            pass # Verdicts don't depend on who is assigned where or on song order
+        else:
+            self.full_rebuild = True
+
+    # Queries
+    def verdict(self, member_id: str, song_id: str, session_id: str) -> Optional[int]:
+        """Verdict code for a member on a session, None if either is not part of the concert."""
+        self.update()
+        row = self.member_rows.get(member_id)
+        col = self.slot_cols.get((song_id, session_id))
+        if row is None or col is None:
+            return None
+        return int(self.verdicts[row, col])
+
+    # Updates
+    def update(self):
+        if self.full_rebuild:
+            self._rebuild()
+        elif self.dirty_members:
+            self._patch_members()
+
+    def _rebuild(self):
+        dh = self.data_handler
+        self.full_rebuild = False
+        self.dirty_members.clear()
+
+        self.member_rows = {}
+        for m in dh.members:
+            self.member_rows.setdefault(m.id, len(self.member_rows))
+
+        self._build_columns()
+        members = [dh.get_member(member_id) for member_id in self.member_rows]
+        self.verdicts = self._evaluate(members)
+
+    def _patch_members(self):
+        dirty, self.dirty_members = self.dirty_members, set()
+        members = []
+        rows = []
+        for member_id in dirty:
+            member = self.data_handler.get_member(member_id)
+            row = self.member_rows.get(member_id)
+            if member is None or row is None:
+                # Added or removed member: row layout changes
+                self._rebuild()
+                return
+            members.append(member)
+            rows.append(row)
+        self.verdicts[rows] = self._evaluate(members)
+
+    def _build_columns(self):
+        dh = self.data_handler
+        self.slot_cols = {}
+        self.inst_ids = {}
+        inst_cols, vocal, bpms, beats, pitches = [], [], [], [], []
+
+        for song in dh.songs:
+            for session in song.sessions:
+                slot = (song.id, session.id)
+                if slot in self.slot_cols:
+                    continue
+                self.slot_cols[slot] = len(self.slot_cols)
+                inst_cols.append(self.inst_ids.setdefault(session.instrument_id, len(self.inst_ids)))
+
+                inst = dh.get_instrument(session.instrument_id)
+                vocal.append(inst is not None and inst.name == "보컬/랩")
+                bpms.append(song.bpm)
+                try:
+                    beats.append(int(session.difficulty_param))
+                except Exception:
+                    beats.append(16) # Default fallback
+                pitches.append(self.evaluator.note_to_int(session.difficulty_param))
+
+        self.col_inst = np.array(inst_cols, dtype=np.int64)
+        self.col_vocal = np.array(vocal, dtype=bool)
+        self.col_req_val = np.array(bpms, dtype=np.int64) * np.array(beats, dtype=np.int64)
+        self.col_req_level = np.searchsorted(LEVEL_THRESHOLDS, self.col_req_val, side='left')
+        self.col_req_pitch = np.array(pitches, dtype=np.int64)
+
+    def _evaluate(self, members) -> np.ndarray:
+        # Per (member, instrument) skill features, first matching instrument wins like validate_assignment
+        shape = (len(members), len(self.inst_ids))
+        has = np.zeros(shape, dtype=bool)
+        level = np.zeros(shape, dtype=np.int64)
+        cap = np.zeros(shape, dtype=np.int64)
+        youtuber = np.zeros(shape, dtype=bool)
+        pitch = np.full(shape, -1, dtype=np.int64)
+
+        for row, member in enumerate(members):
+            for mi in member.instruments:
+                k = self.inst_ids.get(mi.instrument_id)
+                if k is None or has[row, k]:
+                    continue
+                has[row, k] = True
+                level[row, k] = SKILL_LEVELS.get(mi.skill, 0)
+                cap[row, k] = SKILL_CAPS.get(mi.skill, 0)
+                youtuber[row, k] = mi.skill == SkillLevel.YOUTUBER.value
+                pitch[row, k] = self.evaluator.note_to_int(mi.skill)
+
+        cols = self.col_inst
+        req_val = self.col_req_val
+        too_low_inst = (req_val > cap[:, cols]) & ~youtuber[:, cols]
+        too_high_inst = (req_val < 2880) & (level[:, cols] >= self.col_req_level + 3)
+
+        member_pitch = pitch[:, cols]
+        too_low_vocal = (member_pitch != -1) & (self.col_req_pitch != -1) & (member_pitch < self.col_req_pitch)
+
+        verdicts = np.where(
+            self.col_vocal,
+            too_low_vocal * TOO_LOW,
+            too_low_inst * TOO_LOW | too_high_inst * TOO_HIGH
+        )
+        return np.where(has[:, cols], verdicts, CANT_PLAY).astype(np.int8)
@@ -0,0 +1,227 @@
+import copy
+import json
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from project_format import FORMAT_JSON
+from models import SCHEMA_VERSION
+
+# Top-level keys of a project file, in file order
+SECTIONS = ("schema_version", "members", "instruments", "songs", "equipments", "assignments", "sound_design_settings", "performance_memo")
+
+# Sections encoded one entity at a time
+ENTITY_SECTIONS = ("schema_version", "members", "songs", "assignments")
+
+# Change event kind -> small section it invalidates
+KIND_SECTIONS = {
+    "instrument": "instruments",
+    "equipment": "equipments",
+    "settings": "sound_design_settings",
+    "memo": "performance_memo",
+}
+
+INDENT = 4
+
+class _Style:
+    """How fragments are laid out: the pretty JSON of FORMAT_JSON, or minified JSON for the compressed formats."""
+    def __init__(self, pretty: bool):
+        self.pretty = pretty
+        if pretty:
+            self.item_sep = b",\n" + b" " * (INDENT * 2)
+            self.list_open = b"[\n" + b" " * (INDENT * 2)
+            self.list_close = b"\n" + b" " * INDENT + b"]"
+        else:
+            self.item_sep = b","
+            self.list_open = b"["
+            self.list_close = b"]"
+
+    def encode(self, value, depth: int) -> bytes:
+        """Encodes a value as it appears `depth` levels deep in the document."""
+        if not self.pretty:
+            return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        text = json.dumps(value, ensure_ascii=False, indent=INDENT)
+        if depth:
+            # Encoded strings never contain raw newlines, so every newline is indentation
+            text = text.replace("\n", "\n" + " " * (INDENT * depth))
+        return text.encode('utf-8')
+
+    def join_list(self, items: List[bytes]) -> bytes:
+        if not items:
+            return b"[]"
+        return self.list_open + self.item_sep.join(items) + self.list_close
+
+    def join_document(self, sections: List[Tuple[str, bytes]]) -> bytes:
+        if self.pretty:
+            indent = b" " * INDENT
+            return b"{\n" + b",\n".join(indent + json.dumps(k).encode() + b": " + v for k, v in sections) + b"\n}"
+        return b"{" + b",".join(json.dumps(k).encode() + b":" + v for k, v in sections) + b"}"
+
+class _Fragment:
+    """
+    A piece of the file, taken on the UI thread as plain data (to_dict() output) and encoded on first use,
+    which is on the save thread. The data is dropped once encoded.
+    """
+    __slots__ = ("value", "depth", "style", "items", "encoded")
+
+    def __init__(self, value, depth: int, style: _Style, items: bool = False):
+        self.value = value
+        self.depth = depth
+        self.style = style
+        self.items = items # A list encoded one item per fragment, like the entity lists
+        self.encoded: Optional[bytes] = None
+
+    def encode(self) -> bytes:
+        if self.encoded is None:
+            if self.items:
+                self.encoded = self.style.join_list([self.style.encode(v, self.depth + 1) for v in self.value])
+            else:
+                self.encoded = self.style.encode(self.value, self.depth)
+            self.value = None
+        return self.encoded
+
+class _JoinedList:
+    """An entity section: its fragments joined on first use, then kept whole while nothing in it changes."""
+    __slots__ = ("fragments", "style", "encoded")
+
+    def __init__(self, fragments: List[_Fragment], style: _Style):
+        self.fragments = fragments
+        self.style = style
+        self.encoded: Optional[bytes] = None
+
+    def encode(self) -> bytes:
+        if self.encoded is None:
+            self.encoded = self.style.join_list([f.encode() for f in self.fragments])
+            self.fragments = None
+        return self.encoded
+
+class ProjectFragments:
+    """
+    The project file as taken by FragmentCache.snapshot(): fragments only, no model objects, so encode()
+    can run on another thread while the data keeps changing. Fragments are shared with later snapshots,
+    which is safe as the encoding is serialized by the cache's lock.
+    """
+    def __init__(self, sections: List[Tuple[str, object]], style: _Style, lock):
+        self.sections = sections
+        self.style = style
+        self.lock = lock
+
+    def encode(self) -> bytes:
+        with self.lock:
+            return self.style.join_document([(name, part.encode()) for name, part in self.sections])
+
+class FragmentCache:
+    """
+    Pieces of the project file, reused by saves until the data they hold changes.
+
+    Members, songs and assignments are kept per entity, the small sections (schema version, instruments,
+    equipments, settings, memo) whole. DataHandler change events mark them stale. snapshot(), on the UI
+    thread, takes only the stale ones as plain data and reuses the rest; the returned ProjectFragments
+    encodes the new pieces and joins them (on the save thread), giving the same bytes as encoding the
+    snapshot in one go. Entity fragments also remember the object they were taken from, so a replaced
+    object is never served stale.
+    """
+    def __init__(self, data_handler):
+        self.data_handler = data_handler
+        self.style: Optional[_Style] = None
+        self.lock = threading.Lock()
+        self.sections: Dict[str, _Fragment] = {}
+        self.entities: Dict[str, Dict[object, Tuple[object, _Fragment]]] = {name: {} for name in ENTITY_SECTIONS}
+        self.dirty: Dict[str, Set[object]] = {name: set() for name in ENTITY_SECTIONS}
+        self.joined: Dict[str, _JoinedList] = {} # Entity sections untouched since the last snapshot
+
+        # Statistics of the last snapshot
+        self.encoded_count = 0
+        self.reused_count = 0
+
+        self.data_handler.add_change_listener(self.on_change)
+
+    def invalidate(self):
+        self.style = None
+
+    def on_change(self, event):
+        if event.kind == "project":
+            self.invalidate()
+        elif event.kind in KIND_SECTIONS:
+            self.sections.pop(KIND_SECTIONS[event.kind], None)
+        elif event.kind in ("member", "song", "cue", "assignment"):
+            name = {"member": "members", "song": "songs", "cue": "songs", "assignment": "assignments"}[event.kind]
+            self.joined.pop(name, None)
+            if event.key is None:
+                self.entities[name].clear()
+                if event.kind == "song":
+                    self.joined.pop("assignments", None) # Reset concert rewrites assignments too
+                    self.entities["assignments"].clear()
+            else:
+                self.dirty[name].add(event.key)
+
+    def encode(self, file_format: str) -> bytes:
+        """The project as JSON: pretty for FORMAT_JSON, minified (to be compressed) otherwise."""
+        return self.snapshot(file_format).encode()
+
+    def snapshot(self, file_format: str) -> ProjectFragments:
+        """The project as it is now, to be encoded later (see ProjectFragments). Call on the UI thread."""
+        pretty = file_format == FORMAT_JSON
+        if self.style is None or self.style.pretty != pretty:
+            self.style = _Style(pretty)
+            self.sections = {}
+            self.joined = {}
+            for name in ENTITY_SECTIONS:
+                self.entities[name] = {}
+                self.dirty[name] = set()
+        self.encoded_count = 0
+        self.reused_count = 0
+
+        dh = self.data_handler
+        parts = []
+        for name in SECTIONS:
+            if name in self.joined:
+                value = self.joined[name]
+                self.reused_count += len(self.entities[name])
+            elif name == "members":
+                value = self._entity_list(name, ((m.id, m) for m in dh.members))
+            elif name == "songs":
+                value = self._entity_list(name, ((s.id, s) for s in dh.songs))
+            elif name == "assignments":
+                value = self._entity_list(name, (((a.song_id, a.session_id), a) for a in dh.assignments))
+            else:
+                value = self.sections.get(name)
+                if value is None:
+                    value = self._section(name)
+                    self.sections[name] = value
+                    self.encoded_count += 1
+                else:
+                    self.reused_count += 1
+            parts.append((name, value))
+        return ProjectFragments(parts, self.style, self.lock)
+
+    def _entity_list(self, name, items) -> _JoinedList:
+        cached = self.entities[name]
+        dirty = self.dirty[name]
+        fresh = {}
+        fragments = []
+        for key, obj in items:
+            entry = cached.get(key)
+            if entry is None or entry[0] is not obj or key in dirty:
+                entry = (obj, _Fragment(obj.to_dict(), 2, self.style))
+                self.encoded_count += 1
+            else:
+                self.reused_count += 1
+            fresh[key] = entry
+            fragments.append(entry[1])
+        # Rebuilt each time so removed entities don't linger
+        self.entities[name] = fresh
+        dirty.clear()
+        joined = _JoinedList(fragments, self.style)
+        self.joined[name] = joined
+        return joined
+
+    def _section(self, name) -> _Fragment:
+        dh = self.data_handler
+        if name == "instruments":
+            return _Fragment([i.to_dict() for i in dh.instruments], 1, self.style, items=True)
+        if name == "equipments":
+            return _Fragment([e.to_dict() for e in dh.equipments], 1, self.style, items=True)
+        if name == "schema_version":
+            return _Fragment(SCHEMA_VERSION, 1, self.style)
+        if name == "sound_design_settings":
+            return _Fragment(copy.deepcopy(dh.sound_design_settings), 1, self.style)
+        return _Fragment(dh.performance_memo, 1, self.style)
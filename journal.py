@@ -0,0 +1,325 @@
+import json
+import os
+from typing import Dict, List, Optional, Set
+from data_handler import DataHandler, ChangeEvent
+from models import Member, Instrument, Song, Equipment, SessionAssignment
+
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = ".journal"
+
+def journal_path(project_path: str) -> str:
+    return project_path + JOURNAL_SUFFIX
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def _line(value) -> bytes:
+    return (_dumps(value) + "\n").encode('utf-8')
+
+def _to_dict(obj) -> Optional[dict]:
+    return obj.to_dict() if obj else None
+
+class ProjectJournal:
+    """
+    Append-only log of the edits made since the project file was last written, kept next to it as
+    `<project>.acou.journal` (one compact JSON line per record).
+
+    The first line identifies the project file state it applies to (mtime + size). Each undo stack
+    index change (push, undo, redo) appends one record holding the current state of the members, songs
+    and assignment slots changed since the previous record (None = removed), taken from DataHandler
+    change events, plus the small sections (instruments, equipments, settings, memo) when their value changed.
+    Replaying the records in order over the project file restores the unsaved state.
+    """
+    def __init__(self, data_handler: DataHandler):
+        self.data_handler = data_handler
+        self.path: Optional[str] = None
+        self.file = None
+        self.save_points: List[int] = [] # Journal offsets at pending save snapshots, oldest first
+
+        self.dirty_members: Set[str] = set()
+        self.dirty_songs: Set[str] = set()
+        self.dirty_slots: Set[tuple] = set()
+        self.appended_slots: Set[tuple] = set() # Dirty slots added to the end of the store
+        self.member_order_dirty = False
+        self.song_order_dirty = False
+        self.all_members_dirty = False
+        self.all_songs_dirty = False
+        self.all_assignments_dirty = False
+        self.small_sections: Dict[str, str] = {} # Last journaled value of each small section
+
+        self.data_handler.add_change_listener(self.on_change)
+
+    # Recovery
+    @staticmethod
+    def read(project_path: str) -> Optional[List[dict]]:
+        """Records of a journal that applies to the project file as it is on disk, None if there is none."""
+        path = journal_path(project_path)
+        if not os.path.exists(path) or not os.path.exists(project_path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                lines = f.read().decode('utf-8', errors='replace').split("\n")
+            header = json.loads(lines[0])
+            st = os.stat(project_path)
+            if (header.get("journal") != JOURNAL_VERSION
+                    or header.get("base_mtime_ns") != st.st_mtime_ns or header.get("base_size") != st.st_size):
+                return None # Project file was rewritten since
+            records = []
+            for line in lines[1:]:
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break # Torn last write
+            return records or None
+        except (OSError, ValueError, IndexError):
+            return None
+
+    @staticmethod
+    def has_recovery(project_path: str) -> bool:
+        return ProjectJournal.read(project_path) is not None
+
+    def replay(self, records: List[dict]):
+        dh = self.data_handler
+        for rec in records:
+            self._apply(rec)
+        dh.rebuild_index()
+        dh.notify_change("project", action="loaded")
+
+    def _apply(self, rec: dict):
+        dh = self.data_handler
+        if "instruments" in rec:
+            dh.instruments = [Instrument.from_dict(i) for i in rec["instruments"]]
+        if "equipments" in rec:
+            dh.equipments = [Equipment.from_dict(e) for e in rec["equipments"]]
+        if "settings" in rec:
+            dh.sound_design_settings = rec["settings"]
+        if "memo" in rec:
+            dh.performance_memo = rec["memo"]
+
+        if "all_members" in rec:
+            dh.members = [Member.from_dict(m) for m in rec["all_members"]]
+        dh.members = self._merge(dh.members, rec.get("members", {}), rec.get("member_order"), Member)
+
+        if "all_songs" in rec:
+            dh.songs = [Song.from_dict(s) for s in rec["all_songs"]]
+        dh.songs = self._merge(dh.songs, rec.get("songs", {}), rec.get("song_order"), Song)
+
+        if "all_assignments" in rec:
+            dh.assignments.replace(SessionAssignment.from_dict(a) for a in rec["all_assignments"])
+        for song_id, session_id, data in rec.get("assignments", []):
+            existing = dh.assignments.get(song_id, session_id)
+            if existing and data is not None:
+                # In place, as the commands reassign a slot, so the slot keeps its position in the file
+                assignment = SessionAssignment.from_dict(data)
+                dh.assignments.set_member(existing, assignment.member_id, assignment.ignore_warnings)
+            elif existing:
+                dh.assignments.remove(existing)
+            elif data is not None:
+                dh.assignments.add(SessionAssignment.from_dict(data))
+
+    @staticmethod
+    def _merge(items, changes: dict, order: Optional[list], cls):
+        by_id = {item.id: item for item in items}
+        ids = [item.id for item in items]
+        for item_id, data in changes.items():
+            if data is None:
+                by_id.pop(item_id, None)
+            else:
+                if item_id not in by_id:
+                    ids.append(item_id)
+                by_id[item_id] = cls.from_dict(data)
+        if order is not None:
+            ids = order
+        return [by_id[i] for i in ids if i in by_id]
+
+    # Recording
+    def open(self, project_path: str, keep_records: bool = False):
+        """Starts journaling edits to the project, whose state on disk is the journal's base."""
+        self.close(delete=False)
+        self.path = journal_path(project_path)
+        self.save_points = []
+        self._reset_dirty()
+        if keep_records and self.has_recovery(project_path):
+            self.file = open(self.path, 'ab')
+        else:
+            self.file = open(self.path, 'wb')
+            self.file.write(self._header(project_path))
+            self._sync()
+
+    def close(self, delete: bool = True):
+        if self.file:
+            self.file.close()
+            self.file = None
+        if delete and self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        if delete:
+            self.path = None
+
+    def discard(self, project_path: str):
+        """Drops the unsaved edits journaled for a project. If it is the open journal, it starts over empty."""
+        path = journal_path(project_path)
+        if self.file and self.path == path:
+            self.open(project_path)
+        elif os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def on_change(self, event: ChangeEvent):
+        if event.kind == "project":
+            self._reset_dirty() # Loads and replays aren't edits
+        elif event.kind == "member":
+            if event.key is None:
+                self.all_members_dirty = True
+            else:
+                self.dirty_members.add(event.key)
+                if event.action in ("added", "removed", "moved"):
+                    self.member_order_dirty = True
+        elif event.kind == "song":
+            if event.key is None:
+                self.all_songs_dirty = True
+                self.all_assignments_dirty = True # Reset concert also rewrites assignments
+            else:
+                self.dirty_songs.add(event.key)
+                if event.action in ("added", "removed", "moved"):
+                    self.song_order_dirty = True
+        elif event.kind == "cue":
+            if event.key is None:
+                self.all_songs_dirty = True
+            else:
+                self.dirty_songs.add(event.key)
+        elif event.kind == "assignment":
+            if event.key is None:
+                self.all_assignments_dirty = True
+            else:
+                self.dirty_slots.add(event.key)
+                if event.action == "added":
+                    self.appended_slots.add(event.key)
+
+    def flush(self, *_):
+        """Appends the changes since the last record. Connected to QUndoStack.indexChanged."""
+        if not self.file:
+            return
+        rec = self._record()
+        if rec:
+            self.file.write(_line(rec))
+            self._sync()
+        self._clear_dirty()
+
+    def mark_save(self):
+        """Called when a save snapshot is taken; the matching save_completed() drops everything before it."""
+        self.flush()
+        if self.file:
+            self.save_points.append(self.file.tell())
+
+    def save_completed(self, project_path: str):
+        if not self.save_points:
+            return
+        offset = self.save_points.pop(0)
+        if not self.file:
+            return
+        # Keep the records made after the snapshot, rebased onto the file that was just written
+        self.file.flush()
+        tail = b""
+        if os.path.exists(self.path): # Removed underneath the open journal, nothing left to keep
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+        old_path = self.path
+        self.file.close()
+
+        self.path = journal_path(project_path)
+        header = self._header(project_path)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header + tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if old_path != self.path and os.path.exists(old_path):
+            os.remove(old_path)
+
+        self.file = open(self.path, 'ab')
+        self.save_points = [p - offset + len(header) for p in self.save_points]
+
+    def save_failed(self):
+        if self.save_points:
+            self.save_points.pop(0)
+
+    # Internals
+    def _header(self, project_path: str) -> bytes:
+        st = os.stat(project_path)
+        return _line({"journal": JOURNAL_VERSION, "base_mtime_ns": st.st_mtime_ns, "base_size": st.st_size})
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _record(self) -> dict:
+        dh = self.data_handler
+        rec = {}
+
+        if self.all_members_dirty:
+            rec["all_members"] = [m.to_dict() for m in dh.members]
+        elif self.dirty_members:
+            rec["members"] = {mid: _to_dict(dh.get_member(mid)) for mid in self.dirty_members}
+            if self.member_order_dirty:
+                rec["member_order"] = [m.id for m in dh.members]
+
+        if self.all_songs_dirty:
+            rec["all_songs"] = [s.to_dict() for s in dh.songs]
+        elif self.dirty_songs:
+            rec["songs"] = {sid: _to_dict(dh.get_song(sid)) for sid in self.dirty_songs}
+            if self.song_order_dirty:
+                rec["song_order"] = [s.id for s in dh.songs]
+
+        if self.all_assignments_dirty:
+            rec["all_assignments"] = [a.to_dict() for a in dh.assignments]
+        elif self.dirty_slots:
+            # Slots added since the last record are written removed, then added again in store order,
+            # so the replay appends them in the order the commands did
+            appended = [slot for slot in dh.assignments.by_slot if slot in self.appended_slots] if self.appended_slots else []
+            rec["assignments"] = [
+                [song_id, session_id, _to_dict(dh.assignments.get(song_id, session_id))]
+                for song_id, session_id in self.dirty_slots.difference(appended)
+            ]
+            for song_id, session_id in appended:
+                rec["assignments"].append([song_id, session_id, None])
+                rec["assignments"].append([song_id, session_id, dh.assignments.get(song_id, session_id).to_dict()])
+
+        # Small sections are edited without change events, compare their values instead
+        for key, value in self._small_values().items():
+            if self.small_sections.get(key) != value:
+                rec[key] = json.loads(value)
+                self.small_sections[key] = value
+        return rec
+
+    def _small_values(self) -> Dict[str, str]:
+        dh = self.data_handler
+        return {
+            "instruments": _dumps([i.to_dict() for i in dh.instruments]),
+            "equipments": _dumps([e.to_dict() for e in dh.equipments]),
+            "settings": _dumps(dh.sound_design_settings),
+            "memo": _dumps(dh.performance_memo),
+        }
+
+    def _clear_dirty(self):
+        self.dirty_members.clear()
+        self.dirty_songs.clear()
+        self.dirty_slots.clear()
+        self.appended_slots.clear()
+        self.member_order_dirty = False
+        self.song_order_dirty = False
+        self.all_members_dirty = False
+        self.all_songs_dirty = False
+        self.all_assignments_dirty = False
+
+    def _reset_dirty(self):
+        self._clear_dirty()
+        self.small_sections = self._small_values()
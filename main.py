@@ -3,10 +3,17 @@ import os
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QTabWidget, QToolBar, QSizePolicy, QLabel, QMessageBox,
                              QFileDialog, QMenu, QGraphicsOpacityEffect, QStackedWidget)
-from PyQt6.QtGui import QUndoStack, QAction, QPixmap, QIcon
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QAction, QPixmap, QIcon
+from PyQt6.QtCore import Qt, QTimer
 
-from data_handler import DataHandler
+from data_handler import DataHandler, STAGE_CORE, STAGE_ASSIGNMENTS, read_project_summary
+from project_loader import ProjectLoader
+from project_saver import ProjectSaver
+from project_format import FORMAT_JSON, FORMAT_ZLIB
+from journal import ProjectJournal
+from undo_history import UndoHistory
+from refresh_scheduler import RefreshScheduler
+from dialogs import UndoMemoryDialog
 from profile_ui import ProfileWidget
 from profile_service import ProfileService
 from profile_controller import ProfileController
@@ -20,6 +27,12 @@ from tech_ui import TechWidget
 from tech_service import TechService
 from tech_controller import TechController
 
+# Save-as file dialog filters
+SAVE_FILTERS = {
+    "Acoustic Files (*.acou)": FORMAT_JSON,
+    "Acoustic Files - 압축 (*.acou)": FORMAT_ZLIB,
+}
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -33,8 +46,12 @@ class MainWindow(QMainWindow):
         
         # Core Components
         self.data_handler = DataHandler()
-        self.undo_stack = QUndoStack(self)
+        self.undo_stack = UndoHistory(self) # Drops the oldest undo steps past its memory budget
         self.undo_stack.cleanChanged.connect(self.update_window_title)
+        self.project_saver = ProjectSaver(self.data_handler, self)
+        self.project_saver.save_started.connect(self.on_save_started)
+        self.project_saver.save_finished.connect(self.on_save_finished)
+        self.project_saver.save_failed.connect(self.on_save_failed)
         
         # Services
         self.profile_service = ProfileService(self.data_handler, self.undo_stack)
@@ -45,18 +62,32 @@ class MainWindow(QMainWindow):
         # UI Setup
         self.init_ui()
         
-        # Controllers
-        self.profile_controller = ProfileController(self.profile_tab, self.profile_service)
-        self.song_controller = SongController(self.song_tab, self.song_service)
-        self.session_controller = SessionController(self.session_tab, self.session_service)
-        self.tech_controller = TechController(self.tech_tab, self.tech_service, self.song_service)
+        # Controllers. Their refreshes on data_changed go through the scheduler, which runs each once
+        # per event loop tick however many services asked for it
+        self.refresh_scheduler = RefreshScheduler(self)
+        self.profile_controller = ProfileController(self.profile_tab, self.profile_service, self.refresh_scheduler)
+        self.song_controller = SongController(self.song_tab, self.song_service, self.refresh_scheduler)
+        self.session_controller = SessionController(self.session_tab, self.session_service, self.refresh_scheduler)
+        self.tech_controller = TechController(self.tech_tab, self.tech_service, self.song_service, self.refresh_scheduler)
         
         # Connect Signals for Cross-Module Updates
-        self.profile_service.data_changed.connect(self.session_controller.refresh_data)
-        self.song_service.data_changed.connect(self.session_controller.refresh_data)
-        
+        self.refresh_scheduler.connect(self.profile_service.data_changed, self.session_controller.refresh_data)
+        self.refresh_scheduler.connect(self.song_service.data_changed, self.session_controller.refresh_data)
+
+        self.project_loader = ProjectLoader(self.data_handler, self)
+        self.project_loader.stage_loaded.connect(self.on_load_stage)
+        self.project_loader.songs_loaded.connect(self.song_controller.show_loaded_songs)
+        self.project_loader.load_finished.connect(self.on_load_finished)
+        self.project_loader.load_failed.connect(self.on_load_failed)
+        
+        # Unsaved edits are journaled next to the project file for crash recovery
+        self.journal = ProjectJournal(self.data_handler)
+        self.undo_stack.indexChanged.connect(self.journal.flush)
+        self.recover_on_load = None # Project path whose journal was already accepted for replay
+
         # Initial State
         self.set_project_loaded(False)
+        QTimer.singleShot(0, self.check_crash_recovery)
         
     def get_resource_path(self, relative_path):
         """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -88,6 +119,7 @@ class MainWindow(QMainWindow):
         
         # 2. Tabs
         self.tabs = QTabWidget()
+        self.tabs_editable = True
         self.stack.addWidget(self.tabs)
         
         # Add Tabs
@@ -182,7 +214,7 @@ class MainWindow(QMainWindow):
         self.undo_action.setShortcut("Ctrl+Z")
         self.undo_action.triggered.connect(self.undo_stack.undo)
         self.undo_action.setEnabled(False)
-        self.undo_stack.canUndoChanged.connect(self.undo_action.setEnabled)
+        self.undo_stack.undo_available.connect(self.undo_action.setEnabled)
 
         self.redo_action = QAction("다시 실행", self)
         self.redo_action.setShortcut("Ctrl+Y")
@@ -193,11 +225,20 @@ class MainWindow(QMainWindow):
         toolbar.addAction(self.undo_action)
         toolbar.addAction(self.redo_action)
 
+        # Undo memory diagnostics
+        memory_act = toolbar.addAction("작업 기록")
+        memory_act.triggered.connect(self.show_undo_memory)
+
         # Configure Recent Button to show menu
         widget = toolbar.widgetForAction(self.recent_act)
         if widget:
             widget.setPopupMode(widget.ToolButtonPopupMode.InstantPopup)
 
+    def show_undo_memory(self):
+        dialog = UndoMemoryDialog(self.undo_stack, self)
+        dialog.exec()
+        dialog.deleteLater() # Stops it following memory_changed
+
     def update_recent_menu(self):
         self.recent_menu.clear()
         files = self.data_handler.recent_files
@@ -205,9 +246,16 @@ class MainWindow(QMainWindow):
             action = self.recent_menu.addAction("최근 파일 없음")
             action.setEnabled(False)
         else:
+            self.recent_menu.setToolTipsVisible(True)
             for f in files:
                 name = os.path.basename(f)
+                # Only the file header is read, the projects aren't loaded
+                summary = read_project_summary(f)
+                if summary:
+                    saved_at = str(summary.get("saved_at", "")).replace("T", " ")[:16]
+                    name += f"  —  곡 {summary.get('songs', 0)} · 멤버 {summary.get('members', 0)} · {saved_at}"
                 action = self.recent_menu.addAction(name)
+                action.setToolTip(f)
                 action.triggered.connect(lambda checked, path=f: self.load_recent_file(path))
 
     def update_window_title(self, is_clean):
@@ -218,6 +266,10 @@ class MainWindow(QMainWindow):
         title = f"Acoustic Herb Sketch - {self.data_handler.filepath}"
         if not is_clean:
             title += "*"
+        if self.project_saver.is_busy():
+            title += " (저장 중...)"
+        if self.project_loader.is_busy():
+            title += " (불러오는 중...)"
         self.setWindowTitle(title)
 
     def set_project_loaded(self, loaded: bool):
@@ -242,7 +294,11 @@ class MainWindow(QMainWindow):
         filename, _ = QFileDialog.getSaveFileName(self, "새 프로젝트 저장", "", "Acoustic Files (*.acou)")
         if filename:
             try:
+                self.project_loader.cancel()
+                self.set_tabs_editable(True)
+                self.journal.close()
                 self.data_handler.create_new_project(filename)
+                self.journal.open(filename)
                 self.reload_all_controllers()
                 self.set_project_loaded(True)
                 self.undo_stack.clear()
@@ -269,55 +325,148 @@ class MainWindow(QMainWindow):
                 self.data_handler.recent_files.remove(filepath)
                 self.data_handler.save_recent_files_list()
 
+    def set_tabs_editable(self, editable: bool):
+        # Pages only, so the tab bar still switches between them while a project loads
+        self.tabs_editable = editable
+        for i in range(self.tabs.count()):
+            self.tabs.widget(i).setEnabled(editable)
+
     def load_project(self, filepath):
-        try:
-            self.data_handler.load_data(filepath)
-            self.reload_all_controllers()
-            self.set_project_loaded(True)
+        # Staged: the tabs fill in as the loader attaches each stage (see on_load_stage).
+        # The current project stays loaded (and journaled) until the core stage replaces it, but can't be
+        # edited or saved meanwhile
+        self.set_tabs_editable(False)
+        self.save_act.setEnabled(False)
+        self.project_loader.load(filepath)
+
+    def on_load_stage(self, stage):
+        if stage == STAGE_CORE:
+            # Old project is gone, its edits were saved or discarded before the load started;
+            # tabs stay read-only until every stage is in place
+            self.journal.close()
             self.undo_stack.clear()
-            self.undo_stack.setClean()
-            
-            # Show migration message if data was updated
-            if hasattr(self.data_handler, 'migration_log') and self.data_handler.migration_log:
-                changes_text = "\n".join(f"• {c}" for c in self.data_handler.migration_log)
-                QMessageBox.information(
-                    self, "프로젝트 최신화",
-                    f"이전 버전의 프로젝트 파일을 최신화합니다.\n\n{changes_text}\n\n저장하면 변경사항이 반영됩니다."
-                )
-        except Exception as e:
-            QMessageBox.critical(self, "오류", f"파일 불러오기 실패: {str(e)}")
+            self.set_project_loaded(True)
+            self.set_tabs_editable(False)
+            self.save_act.setEnabled(False)
+            self.profile_controller.refresh_ui()
+            self.song_controller.clear_song_boxes() # Boxes are added chunk by chunk (songs_loaded)
+        elif stage == STAGE_ASSIGNMENTS:
+            # Migration may have touched equipments and sound settings
+            self.session_controller.refresh_data()
+            self.tech_controller.refresh_ui()
+
+    def on_load_finished(self, filepath):
+        self.set_tabs_editable(True)
+        self.undo_stack.clear()
+        self.undo_stack.setClean()
+        self.set_project_loaded(True)
+        self.recover_journal(filepath)
+
+        # Show migration message if data was updated
+        if hasattr(self.data_handler, 'migration_log') and self.data_handler.migration_log:
+            changes_text = "\n".join(f"• {c}" for c in self.data_handler.migration_log)
+            QMessageBox.information(
+                self, "프로젝트 최신화",
+                f"이전 버전의 프로젝트 파일을 최신화합니다.\n\n{changes_text}\n\n저장하면 변경사항이 반영됩니다."
+            )
+
+    def check_crash_recovery(self):
+        # Offer to reopen the most recent project whose last session ended without saving
+        for path in self.data_handler.recent_files:
+            if not ProjectJournal.has_recovery(path):
+                continue
+            reply = QMessageBox.question(
+                self, "작업 복구",
+                f"'{os.path.basename(path)}'에 저장되지 않은 작업 기록이 있습니다.\n프로젝트를 열고 복구하시겠습니까?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                self.recover_on_load = path
+                self.load_project(path)
+            else:
+                self.journal.discard(path)
+            return
+
+    def recover_journal(self, filepath):
+        records = ProjectJournal.read(filepath)
+        accepted = self.recover_on_load == filepath
+        self.recover_on_load = None
+        if records and not accepted:
+            reply = QMessageBox.question(
+                self, "작업 복구",
+                "저장되지 않은 작업 기록이 있습니다.\n마지막 저장 이후의 작업을 복구하시겠습니까?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            accepted = reply == QMessageBox.StandardButton.Yes
+
+        if records and accepted:
+            self.journal.replay(records)
+            self.reload_all_controllers()
+            self.undo_stack.resetClean() # Recovered edits aren't in the file yet
+            self.journal.open(filepath, keep_records=True)
+        else:
+            self.journal.open(filepath)
+
+    def on_load_failed(self, filepath, error):
+        self.set_tabs_editable(True)
+        if self.project_loader.core_attached:
+            # Failed after the old project was replaced
+            self.set_project_loaded(False)
+        else:
+            # The old project is still the one loaded, with its own path and journal
+            self.save_act.setEnabled(self.stack.currentWidget() is self.tabs)
+        QMessageBox.critical(self, "오류", f"파일 불러오기 실패: {error}")
 
     def save_file(self):
         if not self.data_handler.filepath:
             self.save_file_as()
             return
             
-        try:
-            self.data_handler.save_data()
-            self.undo_stack.setClean()
-            self.update_window_title(True)
-            QMessageBox.information(self, "저장", "저장되었습니다.")
-        except Exception as e:
-            QMessageBox.critical(self, "오류", f"저장 실패: {str(e)}")
+        self.start_save()
 
     def save_file_as(self):
-        filename, _ = QFileDialog.getSaveFileName(self, "다른 이름으로 저장", "", "Acoustic Files (*.acou)")
+        filters = list(SAVE_FILTERS)
+        current = next((f for f, fmt in SAVE_FILTERS.items() if fmt == self.data_handler.file_format), filters[0])
+        filename, selected = QFileDialog.getSaveFileName(self, "다른 이름으로 저장", "", ";;".join(filters), current)
         if filename:
-            try:
-                self.data_handler.save_data(filename)
-                self.undo_stack.setClean()
-                self.set_project_loaded(True) # Update title
-                QMessageBox.information(self, "저장", f"저장되었습니다: {filename}")
-            except Exception as e:
-                QMessageBox.critical(self, "오류", f"저장 실패: {str(e)}")
+            self.start_save(filename, SAVE_FILTERS.get(selected, FORMAT_JSON))
+
+    def start_save(self, filepath=None, file_format=None):
+        if self.project_loader.is_busy():
+            return # Project being replaced (or partly loaded), see load_project
+        self.journal.flush()
+        if self.project_saver.save(filepath, file_format):
+            self.journal.mark_save()
+            # The snapshot matches the current undo index; a failed write marks the stack dirty again
+            self.undo_stack.setClean()
+
+    def on_save_started(self, filepath):
+        self.update_window_title(self.undo_stack.isClean())
+
+    def on_save_finished(self, filepath):
+        self.journal.save_completed(filepath)
+        self.set_project_loaded(True) # Update title (path may have changed)
+        QMessageBox.information(self, "저장", f"저장되었습니다: {filepath}")
+
+    def on_save_failed(self, filepath, error):
+        self.journal.save_failed()
+        if not self.project_saver.is_busy():
+            self.undo_stack.resetClean()
+        self.update_window_title(self.undo_stack.isClean())
+        QMessageBox.critical(self, "오류", f"저장 실패: {error}")
 
     def closeEvent(self, event):
         if self.check_unsaved_changes():
+            self.project_loader.shutdown()
+            self.project_saver.shutdown()
+            self.journal.close()
             event.accept()
         else:
             event.ignore()
 
     def check_unsaved_changes(self):
+        # Settle saves still in flight first, a failed one makes the stack dirty again
+        self.project_saver.wait()
         if not self.undo_stack.isClean():
             reply = QMessageBox.question(self, "저장되지 않은 변경사항", 
                                          "변경사항이 저장되지 않았습니다.\n저장하시겠습니까?",
@@ -325,6 +474,7 @@ class MainWindow(QMainWindow):
             
             if reply == QMessageBox.StandardButton.Save:
                 self.save_file()
+                self.project_saver.wait()
                 return self.undo_stack.isClean()
             elif reply == QMessageBox.StandardButton.Discard:
                 return True
@@ -1,6 +1,7 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, fields, is_dataclass, MISSING
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, get_origin, get_args
+import sys
 import uuid
 
 # Constants
@@ -11,6 +12,15 @@ DEFAULT_SECTION_NAMES = [
     "솔로", "솔로 (기타)", "솔로 (피아노)", "솔로 (베이스)", "솔로 (드럼)"
 ]
 
+# Highest-note options offered for vocal sessions and vocal skills
+VOCAL_RANGE = ["E5", "F5", "F#5", "G5", "G#5", "A5", "A#5", "B5", 
+               "C6", "C#6", "D6", "D#6", "E6", "F6", "F#6", "G6", "G#6", "A6", "A#6", "B6", 
+               "C7"]
+
+# Version of the saved data layout, stored in project files as "schema_version".
+# Bump it together with a new step in DataHandler.MIGRATIONS.
+SCHEMA_VERSION = 4
+
 # Enums
 class Grade(Enum):
     BON4 = "본4"
@@ -46,8 +56,13 @@ class SongCategory(Enum):
     VOCAL = "보컬곡"
     INSTRUMENTAL = "기악곡"
 
+# Field metadata: only read from older files, see serializable()
+LEGACY = {"legacy": True}
+
 # Base Mixin for Serialization
 class SerializableMixin:
+    __slots__ = () # Keeps the slotted models free of a per-instance __dict__
+
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
@@ -55,7 +70,104 @@ class SerializableMixin:
     def from_dict(cls, data: Dict[str, Any]):
         return cls(**data)
 
-@dataclass
+def _bad_keys(cls, data: Dict[str, Any]) -> TypeError:
+    names = {f.name for f in fields(cls)}
+    unknown = sorted(set(data) - names)
+    if unknown:
+        return TypeError(f"{cls.__name__}.from_dict() got unexpected keys {unknown}")
+    missing = [f.name for f in fields(cls) if f.default is MISSING and f.default_factory is MISSING and f.name not in data]
+    return TypeError(f"{cls.__name__}.from_dict() missing required keys {missing}")
+
+def serializable(cls):
+    """
+    Replaces the generic to_dict/from_dict with ones generated from the dataclass fields.
+
+    to_dict reads each field once: nested models are converted by their own to_dict, other lists and
+    dicts are copied one level, like asdict does for plain values. Fields marked LEGACY are read from
+    older files (for migrate_data to convert) but never written back.
+
+    from_dict assigns every field explicitly on a new instance (the dataclass __init__ only assigns them too,
+    so the classes can't have a __post_init__), nested models built from their dicts. A dict holding exactly
+    the fields to_dict writes (what saved files have) takes a path with no key checks; otherwise missing
+    fields get their defaults, and unknown or missing required keys raise TypeError like cls(**data).
+    The input dict is left untouched. Ids ("id" and "*_id" fields) are interned, so the many references
+    to one id share a single string after a load.
+    Apply above @dataclass, after the nested model classes are defined.
+    """
+    if hasattr(cls, "__post_init__"):
+        raise TypeError(f"{cls.__name__}: serializable from_dict skips __post_init__")
+    namespace = {"cls": cls, "_new": object.__new__, "_intern": sys.intern, "_bad_keys": _bad_keys}
+    to_items = []
+    exact_lines = [] # Every written field present
+    lines = []
+    required = []
+    for f in fields(cls):
+        name = f.name
+        origin, type_args = get_origin(f.type), get_args(f.type)
+        item = type_args[-1] if type_args else None
+        nested = item is not None and is_dataclass(item)
+        legacy = f.metadata.get("legacy")
+
+        value = f"self.{name}"
+        if origin is list:
+            value = f"[x.to_dict() for x in {value}]" if nested else f"list({value})"
+        elif origin is dict:
+            value = f"{{k: x.to_dict() for k, x in {value}.items()}}" if nested else f"dict({value})"
+        if not legacy:
+            to_items.append(f"{name!r}: {value}")
+
+        read = f"data[{name!r}]"
+        if nested:
+            namespace[f"_from_{name}"] = item.from_dict
+            if origin is list:
+                read = f"[_from_{name}(x) for x in {read}]"
+            elif origin is dict:
+                read = f"{{k: _from_{name}(x) for k, x in {read}.items()}}"
+        if name == "id" or name.endswith("_id"):
+            read = f"(_intern(v) if (v := {read}).__class__ is str else v)"
+
+        if f.default is not MISSING:
+            namespace[f"_default_{name}"] = f.default
+            default = f"_default_{name}"
+        elif f.default_factory is not MISSING:
+            namespace[f"_factory_{name}"] = f.default_factory
+            default = f"_factory_{name}()"
+        else:
+            default = None
+            required.append(name)
+        exact_lines.append(f"    self.{name} = {default if legacy else read}\n")
+        lines.append(f"    self.{name} = {read if default is None else f'{read} if {name!r} in data else {default}'}\n")
+
+    namespace["_names"] = frozenset(f.name for f in fields(cls))
+    check = "not _names.issuperset(data)" + "".join(f" or {name!r} not in data" for name in required)
+    source = (
+        "def to_dict(self):\n"
+        f"    return {{{', '.join(to_items)}}}\n"
+        "def from_dict(data):\n"
+        "    self = _new(cls)\n"
+        f"    if len(data) == {len(to_items)}:\n"
+        "        try:\n"
+        + "".join("        " + line for line in exact_lines) +
+        "            return self\n"
+        "        except KeyError:\n"
+        "            pass\n"
+        f"    if {check}:\n"
+        "        raise _bad_keys(cls, data)\n"
+        + "".join(lines) +
+        "    return self\n"
+    )
+    exec(compile(source, f"<serializable {cls.__name__}>", "exec"), namespace)
+
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{cls.__name__}.to_dict"
+    from_dict = namespace["from_dict"]
+    from_dict.__qualname__ = f"{cls.__name__}.from_dict"
+    cls.to_dict = to_dict
+    cls.from_dict = staticmethod(from_dict)
+    return cls
+
+@serializable
+@dataclass(slots=True)
 class Instrument(SerializableMixin):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = ""
@@ -63,30 +175,22 @@ class Instrument(SerializableMixin):
     connection_type: str = ConnectionType.NONE.value
     is_default: bool = False # New field to prevent deletion
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class MemberInstrument(SerializableMixin):
     instrument_id: str  # References Instrument.id
     skill: str = SkillLevel.BEGINNER.value
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class Member(SerializableMixin):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = ""
     grade: str = Grade.YE1.value
     instruments: List[MemberInstrument] = field(default_factory=list)
 
-    def to_dict(self) -> Dict[str, Any]:
-        data = super().to_dict()
-        data['instruments'] = [i.to_dict() for i in self.instruments]
-        return data
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        if 'instruments' in data:
-            data['instruments'] = [MemberInstrument.from_dict(i) for i in data['instruments']]
-        return cls(**data)
-
-@dataclass
+@serializable
+@dataclass(slots=True)
 class SongSession(SerializableMixin):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     instrument_id: str = "" # References Instrument.id
@@ -94,49 +198,41 @@ class SongSession(SerializableMixin):
     # Storing as string or distinct fields? String is flexible.
     difficulty_param: str = ""
 
-@dataclass
+@serializable
+@dataclass(slots=True)
+class CueEntry(SerializableMixin):
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    instrument_name: str = ""
+    use_effect: bool = False
+    effect_name: str = ""
+    effect_level: int = 0 # 1-5 (연하게 ~ 진하게), 0 if not set
+    memo: str = ""
+
+@serializable
+@dataclass(slots=True)
 class CueSection(SerializableMixin):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "새 섹션" # Intro, Verse 1, etc.
-    # Notes for each instrument in the song
-    # Key: instrument_id (or session_id?), Value: note string
-    # Using session_id is safer as one song might have 2 Guitars
-    instrument_notes: Dict[str, str] = field(default_factory=dict) 
+    # Notes for each instrument in the song, in cue sheet order
+    entries: List[CueEntry] = field(default_factory=list)
     memo: str = ""
+    # Older files: entry id -> entry as a JSON string, converted into entries by DataHandler.migrate_data
+    instrument_notes: Optional[Dict[str, str]] = field(default=None, metadata=LEGACY)
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class Song(SerializableMixin):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     title: str = "새 곡"
-    nickname: str = "" # Added nickname field
+    nickname: str = "" # Added nickname field (missing in older files)
     bpm: int = 100
     category: str = SongCategory.INSTRUMENTAL.value
     reference_url: str = ""
     sessions: List[SongSession] = field(default_factory=list)
-    cue_sections: List[CueSection] = field(default_factory=list) # Added
-
-    def to_dict(self) -> Dict[str, Any]:
-        data = super().to_dict()
-        data['sessions'] = [s.to_dict() for s in self.sessions]
-        data['cue_sections'] = [s.to_dict() for s in self.cue_sections]
-        return data
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        if 'sessions' in data:
-            data['sessions'] = [SongSession.from_dict(s) for s in data['sessions']]
-        # Handle nickname if missing in older files
-        if 'nickname' not in data:
-             data['nickname'] = ""
-        # Handle cue_sections
-        if 'cue_sections' in data:
-            data['cue_sections'] = [CueSection.from_dict(s) for s in data['cue_sections']]
-        else:
-            data['cue_sections'] = []
-            
-        return cls(**data)
+    cue_sections: List[CueSection] = field(default_factory=list) # Added (missing in older files)
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class Equipment(SerializableMixin):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = ""
@@ -145,16 +241,10 @@ class Equipment(SerializableMixin):
     is_default: bool = False # New field to prevent deletion
 
 # To manage session assignments
-@dataclass
+@serializable
+@dataclass(slots=True)
 class SessionAssignment(SerializableMixin):
     song_id: str
     session_id: str # References SongSession.id
     member_id: Optional[str] = None # References Member.id, None if unassigned
-    ignore_warnings: bool = False
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        # Handle ignore_warnings if missing in older files
-        if 'ignore_warnings' not in data:
-            data['ignore_warnings'] = False
-        return cls(**data)
+    ignore_warnings: bool = False # Missing in older files
@@ -4,12 +4,14 @@ from profile_ui import ProfileWidget
 from profile_service import ProfileService
 from dialogs import ProfileAddEditDialog, InstrumentEditDialog
 from models import Grade
+from refresh_scheduler import RefreshScheduler, connect_refresh
 
 class ProfileController(QObject):
-    def __init__(self, ui: ProfileWidget, service: ProfileService):
+    def __init__(self, ui: ProfileWidget, service: ProfileService, scheduler: RefreshScheduler = None):
         super().__init__()
         self.ui = ui
         self.service = service
+        self.scheduler = scheduler # Refreshes run directly on each change without one
         
         self.grade_widgets = {
             Grade.BON4.value: self.ui.group_bon4,
@@ -24,7 +26,7 @@ class ProfileController(QObject):
         self.refresh_ui()
 
     def connect_signals(self):
-        self.service.data_changed.connect(self.refresh_ui)
+        connect_refresh(self.service.data_changed, self.refresh_ui, self.scheduler)
         self.ui.btn_edit_instruments.clicked.connect(self.open_instrument_edit_dialog)
         self.ui.btn_year_pass.clicked.connect(self.pass_year)
         
@@ -67,10 +69,8 @@ class ProfileController(QObject):
                 item_obj.setData(Qt.ItemDataRole.UserRole, member.id)
 
     def get_inst_name(self, inst_id):
-        for i in self.service.data_handler.instruments:
-            if i.id == inst_id:
-                return i.name
-        return "?"
+        inst = self.service.data_handler.get_instrument(inst_id)
+        return inst.name if inst else "?"
 
     def open_add_dialog(self, default_grade=None):
         dlg = ProfileAddEditDialog(self.ui, instruments_pool=self.service.data_handler.instruments)
@@ -88,7 +88,7 @@ class ProfileController(QObject):
             return
             
         member_id = item.data(Qt.ItemDataRole.UserRole)
-        member = next((m for m in self.service.data_handler.members if m.id == member_id), None)
+        member = self.service.data_handler.get_member(member_id)
         if not member:
             return
 
@@ -104,7 +104,7 @@ class ProfileController(QObject):
             return
 
         member_id = item.data(Qt.ItemDataRole.UserRole)
-        member = next((m for m in self.service.data_handler.members if m.id == member_id), None)
+        member = self.service.data_handler.get_member(member_id)
         
         reply = QMessageBox.question(self.ui, '삭제', '정말 해당 세션을 삭제하시겠습니까?', 
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
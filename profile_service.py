@@ -2,6 +2,7 @@ from PyQt6.QtGui import QUndoCommand
 from PyQt6.QtCore import QObject, pyqtSignal
 from models import Member, Grade
 from data_handler import DataHandler
+from undo_history import COMMAND_OVERHEAD, estimate_size, BatchService
 
 class AddMemberCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, member: Member, update_signal):
@@ -13,13 +14,20 @@ class AddMemberCommand(QUndoCommand):
 
     def redo(self):
         self.data_handler.members.append(self.member)
+        self.data_handler.index_member(self.member)
+        self.data_handler.notify_change("member", self.member.id, "added")
         self.update_signal.emit()
 
     def undo(self):
         if self.member in self.data_handler.members:
             self.data_handler.members.remove(self.member)
+            self.data_handler.unindex_member(self.member)
+            self.data_handler.notify_change("member", self.member.id, "removed")
             self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD # The member is the project's once added
+
 class DeleteMemberCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, member: Member, update_signal):
         super().__init__()
@@ -31,12 +39,19 @@ class DeleteMemberCommand(QUndoCommand):
     def redo(self):
         if self.member in self.data_handler.members:
             self.data_handler.members.remove(self.member)
+            self.data_handler.unindex_member(self.member)
+            self.data_handler.notify_change("member", self.member.id, "removed")
             self.update_signal.emit()
 
     def undo(self):
         self.data_handler.members.append(self.member)
+        self.data_handler.index_member(self.member)
+        self.data_handler.notify_change("member", self.member.id, "added")
         self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.member)
+
 class UpdateMemberCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, old_member: Member, new_member: Member, update_signal):
         super().__init__()
@@ -55,6 +70,9 @@ class UpdateMemberCommand(QUndoCommand):
             if self.old_member in self.data_handler.members:
                 idx = self.data_handler.members.index(self.old_member)
                 self.data_handler.members[idx] = self.new_member
+                self.data_handler.unindex_member(self.old_member)
+                self.data_handler.index_member(self.new_member)
+                self.data_handler.notify_change("member", self.new_member.id)
                 self.update_signal.emit()
         except ValueError:
             pass
@@ -64,10 +82,16 @@ class UpdateMemberCommand(QUndoCommand):
             if self.new_member in self.data_handler.members:
                 idx = self.data_handler.members.index(self.new_member)
                 self.data_handler.members[idx] = self.old_member
+                self.data_handler.unindex_member(self.new_member)
+                self.data_handler.index_member(self.old_member)
+                self.data_handler.notify_change("member", self.old_member.id)
                 self.update_signal.emit()
         except ValueError:
             pass
 
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.old_member, self.new_member, shared=(self.new_member,))
+
 class YearPassCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, update_signal):
         super().__init__()
@@ -100,16 +124,19 @@ class YearPassCommand(QUndoCommand):
             if member.grade == Grade.BON4.value:
                 self.deleted_members.append(member)
                 self.data_handler.members.remove(member)
+                self.data_handler.unindex_member(member)
+                self.data_handler.notify_change("member", member.id, "removed")
             elif member.grade in self.grade_map:
                 old_grade = member.grade
                 member.grade = self.grade_map[member.grade]
                 self.promoted_members.append((member, old_grade))
+                self.data_handler.notify_change("member", member.id)
                 
         # 2. Cascade Delete Assignments for Deleted Members
         deleted_ids = {m.id for m in self.deleted_members}
         
         # Iterate over global assignments list
-        for assign in list(self.data_handler.assignments):
+        for assign in self.data_handler.assignments:
             if assign.member_id in deleted_ids:
                 # Save for Undo (assign object is removed but still exists in memory)
                 self.deleted_assignments.append(assign)
@@ -120,19 +147,28 @@ class YearPassCommand(QUndoCommand):
     def undo(self):
         # 1. Restore Assignments
         for assign in self.deleted_assignments:
-            self.data_handler.assignments.append(assign)
+            self.data_handler.assignments.add(assign)
         
         # 2. Restore Member Grades
         for member, old_grade in self.promoted_members:
             member.grade = old_grade
+            self.data_handler.notify_change("member", member.id)
             
         # 3. Restore Deleted Members
         for member in self.deleted_members:
             self.data_handler.members.append(member)
+            self.data_handler.index_member(member)
+            self.data_handler.notify_change("member", member.id, "added")
             
         self.update_signal.emit()
 
-class ProfileService(QObject):
+    def cost(self):
+        # Promoted members stay in the project, only the (member, old grade) pairs are the command's
+        promoted = [member for member, _ in self.promoted_members]
+        return COMMAND_OVERHEAD + estimate_size(self.deleted_members, self.promoted_members, self.deleted_assignments,
+                                                self.grade_map, shared=promoted)
+
+class ProfileService(QObject, BatchService):
     data_changed = pyqtSignal()
 
     def __init__(self, data_handler: DataHandler, undo_stack):
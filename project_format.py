@@ -0,0 +1,197 @@
+import hashlib
+import json
+import lzma
+import zlib
+from collections import Counter
+from typing import Any, BinaryIO, Dict, List, Optional
+
+# On-disk formats of a project file
+FORMAT_JSON = "json"    # Pretty-printed JSON (original format)
+FORMAT_ZLIB = "zlib"    # Compact container, zlib
+FORMAT_LZMA = "lzma"    # Compact container, lzma (smaller, slower)
+
+# Compact container: MAGIC + version byte + codec byte + flags byte + compressed minified JSON.
+# The first byte can't start a JSON document, so plain files never match.
+MAGIC = b"\x89ACOU\r\n"
+VERSION = 2 # 2: optional summary header block
+HEADER_SIZE = len(MAGIC) + 3
+CODEC_IDS = {FORMAT_ZLIB: 1, FORMAT_LZMA: 2}
+CODEC_FORMATS = {v: k for k, v in CODEC_IDS.items()}
+
+# Repeated strings (ids, enum values) replaced by references into a string table.
+# Makes zlib files ~20% smaller (lzma ~2%) but expanding it makes parsing 2-3x slower,
+# so it's off unless asked for; see benchmarks/bench_file_format.py.
+FLAG_STRING_TABLE = 0x01
+
+# Summary header (counts, save time, content hash) that can be read without parsing the project.
+# Container: FLAG_SUMMARY set, then a 4-byte big-endian length and the header as uncompressed minified JSON
+# before the compressed body. JSON: the first key of the document, minified on the second line.
+FLAG_SUMMARY = 0x02
+SUMMARY_KEY = "header"
+SUMMARY_LEN_SIZE = 4
+SUMMARY_JSON_PREFIX = b'{\n    "header": '
+MAX_SUMMARY_SIZE = 1 << 16
+
+# Payload strings: a table reference is REF + index, a literal starting with REF or ESC gets ESC prepended
+REF = "\x01"
+ESC = "\x02"
+MIN_SHARED_LEN = 4 # Shorter strings aren't worth a table slot
+
+def sniff_format(head: bytes) -> str:
+    if head.startswith(MAGIC):
+        codec = head[len(MAGIC) + 1:len(MAGIC) + 2]
+        if codec:
+            return CODEC_FORMATS.get(codec[0], FORMAT_JSON)
+    return FORMAT_JSON
+
+def dump_bytes(data: Dict[str, Any], file_format: str = FORMAT_JSON, string_table: bool = False) -> bytes:
+    if file_format == FORMAT_JSON:
+        return json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')
+    if file_format not in CODEC_IDS:
+        raise ValueError(f"Unknown project format: {file_format}")
+
+    flags = 0
+    if string_table:
+        # Table and data are two minified JSON documents on separate lines (minified JSON has no raw newlines)
+        flags |= FLAG_STRING_TABLE
+        strings = _shared_strings(data)
+        refs = {s: REF + str(i) for i, s in enumerate(strings)}
+        text = _dumps(strings) + "\n" + _dumps(_encode(data, refs))
+    else:
+        text = _dumps(data)
+    return pack_payload(text.encode('utf-8'), file_format, flags)
+
+def pack_payload(payload: bytes, file_format: str, flags: int = 0, summary: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    File contents for an already encoded document: pretty JSON as is for FORMAT_JSON,
+    minified JSON compressed into the container otherwise.
+    With a summary, the file starts with a header holding it plus the SHA-256 of the document (see read_summary).
+    """
+    header = b""
+    if summary is not None:
+        header = _dumps({**summary, "hash": content_hash(payload)}).encode('utf-8')
+
+    if file_format == FORMAT_JSON:
+        if not header or not payload.startswith(b"{\n"):
+            return payload
+        return SUMMARY_JSON_PREFIX + header + b",\n" + payload[2:]
+    if file_format == FORMAT_ZLIB:
+        body = zlib.compress(payload, 6)
+    elif file_format == FORMAT_LZMA:
+        body = lzma.compress(payload, preset=6)
+    else:
+        raise ValueError(f"Unknown project format: {file_format}")
+    if header:
+        flags |= FLAG_SUMMARY
+        header = len(header).to_bytes(SUMMARY_LEN_SIZE, "big") + header
+    return MAGIC + bytes((VERSION, CODEC_IDS[file_format], flags)) + header + body
+
+def content_hash(payload: bytes) -> str:
+    """Hash of the encoded document, as stored in the summary header."""
+    return hashlib.sha256(payload).hexdigest()
+
+def read_summary(f: BinaryIO) -> Optional[Dict[str, Any]]:
+    """
+    Summary header of a project file opened for binary reading, without reading the rest of the file.
+    None for files saved before headers existed (or damaged ones).
+    """
+    head = f.read(HEADER_SIZE)
+    if head.startswith(MAGIC):
+        if len(head) < HEADER_SIZE or head[len(MAGIC)] > VERSION or not head[-1] & FLAG_SUMMARY:
+            return None
+        size = int.from_bytes(f.read(SUMMARY_LEN_SIZE), "big")
+        if size > MAX_SUMMARY_SIZE:
+            return None
+        return _parse_summary(f.read(size))
+
+    line = head + f.readline(MAX_SUMMARY_SIZE)
+    if not line.startswith(SUMMARY_JSON_PREFIX):
+        return None
+    return _parse_summary(line[len(SUMMARY_JSON_PREFIX):].rstrip().rstrip(b","))
+
+def _parse_summary(raw: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        summary = json.loads(raw.decode('utf-8'))
+    except ValueError:
+        return None
+    return summary if isinstance(summary, dict) else None
+
+def load_bytes(raw: bytes) -> Dict[str, Any]:
+    file_format = sniff_format(raw)
+    if file_format == FORMAT_JSON:
+        data = json.loads(raw.decode('utf-8'))
+        data.pop(SUMMARY_KEY, None)
+        return data
+
+    version, _, flags = raw[len(MAGIC):HEADER_SIZE]
+    if version > VERSION:
+        raise ValueError(f"Unsupported project file version: {version}")
+    start = HEADER_SIZE
+    if flags & FLAG_SUMMARY:
+        start += SUMMARY_LEN_SIZE + int.from_bytes(raw[HEADER_SIZE:HEADER_SIZE + SUMMARY_LEN_SIZE], "big")
+    body = raw[start:]
+    payload = zlib.decompress(body) if file_format == FORMAT_ZLIB else lzma.decompress(body)
+    if not flags & FLAG_STRING_TABLE:
+        return json.loads(payload.decode('utf-8'))
+
+    table, _, text = payload.decode('utf-8').partition("\n")
+    return json.loads(text, object_pairs_hook=_expand_hook(json.loads(table)))
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+# Only dict keys and dict string values go through the table, so the decoder can expand them
+# from an object_pairs_hook while the C parser walks the document.
+
+def _shared_strings(data) -> List[str]:
+    counts = Counter()
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for k, v in value.items():
+                counts[k] += 1
+                if isinstance(v, str):
+                    counts[v] += 1
+                elif isinstance(v, (dict, list)):
+                    stack.append(v)
+        elif isinstance(value, list):
+            stack.extend(v for v in value if isinstance(v, (dict, list)))
+
+    shared = [s for s, n in counts.items() if n > 1 and len(s) >= MIN_SHARED_LEN]
+    # Most used strings get the shortest references
+    shared.sort(key=lambda s: -counts[s])
+    return shared
+
+def _encode_str(s: str, refs) -> str:
+    ref = refs.get(s)
+    if ref is not None:
+        return ref
+    if s.startswith(REF) or s.startswith(ESC):
+        return ESC + s
+    return s
+
+def _encode(value, refs):
+    if isinstance(value, dict):
+        return {
+            _encode_str(k, refs): _encode_str(v, refs) if isinstance(v, str) else _encode(v, refs)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_encode(v, refs) for v in value]
+    return value
+
+def _expand_hook(strings):
+    def expand(s):
+        return strings[int(s[1:])] if s[0] == REF else s[1:]
+
+    def hook(pairs):
+        result = {}
+        for k, v in pairs:
+            if k[:1] in (REF, ESC):
+                k = expand(k)
+            if v.__class__ is str and v[:1] in (REF, ESC):
+                v = expand(v)
+            result[k] = v
+        return result
+    return hook
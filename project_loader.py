@@ -0,0 +1,139 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from data_handler import DataHandler, read_project_file, iter_load_stages, STAGE_CORE, STAGE_SONGS
+
+SONG_CHUNK_SIZE = 20 # Songs per UI update, building a song box takes a few ms
+
+class ProjectLoader(QObject):
+    """
+    Loads a project in stages without blocking the UI.
+
+    Reading, parsing and building the model objects run on a worker thread; each stage is handed to
+    the UI thread and attached to the DataHandler there, so the tabs can show it before the rest arrives.
+    Stages are attached one per event loop turn so input and painting get through in between.
+    A newer load() supersedes a running one, whose remaining stages are dropped.
+    """
+    stage_loaded = pyqtSignal(str)          # stage, once all of its data is attached
+    songs_loaded = pyqtSignal(list)         # song ids whose sessions/cue sheets were just attached
+    load_finished = pyqtSignal(str)         # filepath
+    load_failed = pyqtSignal(str, str)      # filepath, error message
+
+    _begin = pyqtSignal(int, str)           # job id, file format
+    _stage = pyqtSignal(int, str, object)   # job id, stage, payload
+    _end = pyqtSignal(int)                  # job id
+    _error = pyqtSignal(int, str)           # job id, error message
+
+    def __init__(self, data_handler: DataHandler, parent=None):
+        super().__init__(parent)
+        self.data_handler = data_handler
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-load")
+        self.job_id = 0
+        self.active_job: Optional[int] = None
+        self.filepath = ""
+        self.current_stage: Optional[str] = None
+        self.core_attached = False # The project being loaded has replaced the previous one
+        self.queue = deque() # (stage, payload) waiting to be attached, None marks the end
+
+        self.apply_timer = QTimer(self)
+        self.apply_timer.setSingleShot(True)
+        self.apply_timer.setInterval(0)
+        self.apply_timer.timeout.connect(self._apply_next)
+
+        # Emitted from the worker thread, so these connections are queued onto the UI thread
+        self._begin.connect(self._on_begin)
+        self._stage.connect(self._on_stage)
+        self._end.connect(self._on_end)
+        self._error.connect(self._on_error)
+
+    def is_busy(self) -> bool:
+        return self.active_job is not None
+
+    def load(self, filepath: str):
+        self.job_id += 1
+        self.active_job = self.job_id
+        self.filepath = filepath
+        self.current_stage = None
+        self.core_attached = False
+        self.queue.clear()
+        self.executor.submit(self._run, self.job_id, filepath)
+
+    def cancel(self):
+        self.job_id += 1
+        self.active_job = None
+        self.queue.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=True)
+
+    def _run(self, job_id, filepath):
+        try:
+            data, file_format = read_project_file(filepath)
+            self._begin.emit(job_id, file_format)
+            for stage, payload in iter_load_stages(data, SONG_CHUNK_SIZE):
+                if job_id != self.job_id:
+                    return # Superseded
+                self._stage.emit(job_id, stage, payload)
+            self._end.emit(job_id)
+        except Exception as e:
+            self._error.emit(job_id, str(e) or e.__class__.__name__)
+
+    def _on_begin(self, job_id, file_format):
+        if job_id == self.active_job:
+            self.data_handler.begin_load(self.filepath, file_format)
+
+    def _on_stage(self, job_id, stage, payload):
+        if job_id == self.active_job:
+            self.queue.append((stage, payload))
+            self.apply_timer.start()
+
+    def _on_end(self, job_id):
+        if job_id == self.active_job:
+            self.queue.append(None)
+            self.apply_timer.start()
+
+    def _apply_next(self):
+        if not self.queue or self.active_job is None:
+            return
+        item = self.queue.popleft()
+        if item is None:
+            self._finish()
+        else:
+            self._apply(*item)
+        if self.queue:
+            self.apply_timer.start()
+
+    def _apply(self, stage, payload):
+        if self.current_stage is not None and stage != self.current_stage:
+            self.stage_loaded.emit(self.current_stage)
+        self.current_stage = stage
+
+        if stage == STAGE_CORE:
+            self.core_attached = True # Even if attaching fails halfway
+        try:
+            self.data_handler.apply_load_stage(stage, payload)
+        except Exception as e:
+            self._on_error(self.active_job, str(e) or e.__class__.__name__)
+            return
+
+        if stage == STAGE_CORE:
+            # A single payload: the old project is gone now, so say so before the next turn
+            self.stage_loaded.emit(stage)
+            self.current_stage = None
+        elif stage == STAGE_SONGS:
+            self.songs_loaded.emit([self.data_handler.songs[index].id for index, _, _ in payload])
+
+    def _finish(self):
+        if self.current_stage is not None:
+            self.stage_loaded.emit(self.current_stage)
+        self.active_job = None
+        self.data_handler.finish_load()
+        self.load_finished.emit(self.filepath)
+
+    def _on_error(self, job_id, error):
+        if job_id != self.active_job:
+            return
+        self.cancel()
+        self.load_failed.emit(self.filepath, error)
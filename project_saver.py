@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from PyQt6.QtCore import QObject, pyqtSignal
+from data_handler import DataHandler
+
+class ProjectSaver(QObject):
+    """
+    Saves the project in the background.
+
+    The calling (UI) thread only takes the fragments changed since the last save as plain data
+    (DataHandler.snapshot_fragments); encoding, compression and the atomic write run on a single worker
+    thread so queued saves land on disk in order. Results come back as signals on the UI thread.
+    """
+    save_started = pyqtSignal(str)       # filepath
+    save_finished = pyqtSignal(str)      # filepath
+    save_failed = pyqtSignal(str, str)   # filepath, error message
+
+    _done = pyqtSignal(int, str, str, str) # job id, filepath, format, error ("" on success)
+
+    def __init__(self, data_handler: DataHandler, parent=None):
+        super().__init__(parent)
+        self.data_handler = data_handler
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-save")
+        self.pending: Dict[int, object] = {} # job id -> Future
+        self.next_job_id = 0
+        # Emitted from the worker thread, so this connection is queued onto the UI thread
+        self._done.connect(self._on_done)
+
+    def is_busy(self) -> bool:
+        return bool(self.pending)
+
+    def save(self, filepath: str = None, file_format: str = None) -> bool:
+        target_path = filepath if filepath else self.data_handler.filepath
+        if not target_path:
+            return False
+        file_format = file_format or self.data_handler.file_format
+
+        fragments = self.data_handler.snapshot_fragments(file_format)
+        summary = self.data_handler.project_summary()
+        job_id = self.next_job_id
+        self.next_job_id += 1
+        self.pending[job_id] = self.executor.submit(self._write, job_id, fragments, summary, target_path, file_format)
+        self.save_started.emit(target_path)
+        return True
+
+    def wait(self):
+        """Blocks until every queued save is written and delivers their results right away."""
+        for job_id in sorted(self.pending):
+            future = self.pending.get(job_id)
+            if future is None:
+                continue
+            self._on_done(job_id, *future.result())
+
+    def shutdown(self):
+        self.wait()
+        self.executor.shutdown(wait=True)
+
+    def _write(self, job_id, fragments, summary, target_path, file_format):
+        try:
+            DataHandler.write_project_file(fragments.encode(), target_path, file_format, summary)
+            error = ""
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        self._done.emit(job_id, target_path, file_format, error)
+        return target_path, file_format, error
+
+    def _on_done(self, job_id, target_path, file_format, error):
+        if self.pending.pop(job_id, None) is None:
+            return # Already delivered by wait()
+        if error:
+            self.save_failed.emit(target_path, error)
+        else:
+            self.data_handler.finish_save(target_path, file_format)
+            self.save_finished.emit(target_path)
@@ -0,0 +1,62 @@
+from collections import Counter
+from typing import Callable, Dict, Optional
+from PyQt6.QtCore import QObject, QTimer
+
+FRAME_INTERVAL = 16 # ms, one refresh per target per frame at most
+
+class RefreshScheduler(QObject):
+    """
+    Runs UI refreshes requested by change signals once per target, on the next event loop tick.
+
+    Several services can ask the same controller to refresh for one edit (the session tab listens to the
+    profile, song and session services); requests made before the scheduled run are merged, so the
+    target refreshes once, in the order it was first requested. interval=FRAME_INTERVAL runs them at
+    most once per frame instead of on the next tick. Refreshes requested while running go to the next run.
+
+    Counters: requested / ran per target name, `coalesced` = requests that did not cause a refresh.
+    """
+    def __init__(self, parent=None, interval: int = 0):
+        super().__init__(parent)
+        self.pending: Dict[Callable, None] = {} # Ordered set of targets
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+
+        self.requested: Counter = Counter()
+        self.ran: Counter = Counter()
+
+    def connect(self, signal, target: Callable):
+        """Refreshes target (no arguments) through the scheduler whenever signal is emitted."""
+        signal.connect(lambda *args: self.request(target))
+
+    def request(self, target: Callable):
+        self.requested[target_name(target)] += 1
+        self.pending[target] = None
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+        pending, self.pending = self.pending, {}
+        for target in pending:
+            self.ran[target_name(target)] += 1
+            target()
+
+    @property
+    def coalesced(self) -> int:
+        return sum(self.requested.values()) - sum(self.ran.values()) - len(self.pending)
+
+    def stats(self) -> Dict[str, tuple]:
+        """target name -> (requested, ran)"""
+        return {name: (count, self.ran[name]) for name, count in self.requested.items()}
+
+def target_name(target: Callable) -> str:
+    return getattr(target, "__qualname__", repr(target))
+
+def connect_refresh(signal, target: Callable, scheduler: Optional[RefreshScheduler]):
+    """signal -> target through the scheduler, or directly (synchronous refresh) without one."""
+    if scheduler is None:
+        signal.connect(target)
+    else:
+        scheduler.connect(signal, target)
@@ -1,19 +1,26 @@
 from PyQt6.QtWidgets import QVBoxLayout, QLabel, QWidget, QMessageBox, QStyleOptionViewItem, QStyle, QProgressDialog
-from session_ui import SessionWidget, SessionTableModel, FrozenTableView
+from session_ui import SessionWidget, SessionTableModel, FrozenTableView, WarningListModel, WarningFilterModel
 from session_service import SessionService
+from feasibility import TOO_LOW, TOO_HIGH
 from dialogs import SessionEditDialog
+from refresh_scheduler import RefreshScheduler, connect_refresh
 from PyQt6.QtCore import Qt, QRect, QObject, QEvent
 from PyQt6.QtGui import QPixmap, QPainter, QColor
 import os
 from datetime import datetime
 
 class SessionController(QObject):
-    def __init__(self, ui: SessionWidget, service: SessionService):
+    def __init__(self, ui: SessionWidget, service: SessionService, scheduler: RefreshScheduler = None):
         super().__init__()
         self.ui = ui
         self.service = service
+        self.scheduler = scheduler # Refreshes run directly on each change without one
         
         self.model = SessionTableModel(self.service.data_handler)
+        self.log_model = WarningListModel(self)
+        self.log_proxy = WarningFilterModel(self)
+        self.log_proxy.setSourceModel(self.log_model)
+        self.ui.log_view.setModel(self.log_proxy)
         self.table_view = FrozenTableView(self.model, self.service)
         
         # Setup Table Layout
@@ -25,9 +32,10 @@ class SessionController(QObject):
         self.refresh_data() # Initial refresh
         
     def connect_signals(self):
-        self.service.data_changed.connect(self.refresh_data)
+        connect_refresh(self.service.data_changed, self.refresh_data, self.scheduler)
         self.table_view.clicked.connect(self.on_cell_clicked)
         self.ui.btn_export.clicked.connect(self.export_image)
+        self.ui.log_filter.currentIndexChanged.connect(self.on_log_filter_changed)
         
         # Shortcuts
         self.table_view.installEventFilter(self)
@@ -52,40 +60,22 @@ class SessionController(QObject):
         return super().eventFilter(source, event)
 
     def refresh_data(self):
-        # Full refresh of structure (columns/rows might change)
-        self.model.refresh_structure()
-        self.table_view.update_frozen_geometry()
+        if self.model.apply_changes():
+            # Rows/columns were patched in place, column widths may still need to change
+            self.table_view.update_frozen_view_structure()
+        else:
+            # Full refresh of structure (project load)
+            self.model.refresh_structure()
+            self.table_view.update_frozen_geometry()
         
         self.update_log()
 
     def update_log(self):
-        # Clear existing log
-        while self.ui.log_layout.count():
-            item = self.ui.log_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-                
-        # Get warnings
-        warnings = self.service.get_all_warnings()
-        
-        if not warnings:
-            self.ui.log_layout.addWidget(QLabel("경고 없음"))
-        else:
-            for w in warnings:
-                lbl = QLabel(w)
-                if "배정되지 않았습니다" in w or "너무 적습니다" in w:
-                    lbl.setStyleSheet("color: #FF8C00;") # Dark Orange
-                elif "너무 많습니다" in w:
-                    lbl.setStyleSheet("color: #FF4800;") # Red-Orange
-                elif "너무 높습니다" in w:
-                    lbl.setStyleSheet("color: blue;")
-                else:
-                    lbl.setStyleSheet("color: red;")
-                self.ui.log_layout.addWidget(lbl)
-                
-        # Add stretch to push logs to top
-        self.ui.log_layout.addStretch()
+        self.service.update_warnings()
+        self.log_model.set_records(self.service.warning_engine.records)
+
+    def on_log_filter_changed(self, _index):
+        self.log_proxy.set_kinds(self.ui.log_filter.currentData())
 
     def on_cell_clicked(self, index):
         if not index.isValid(): return
@@ -96,7 +86,7 @@ class SessionController(QObject):
             member = self.model.rows[index.row()]
             if not member: return
 
-            song = next((s for s in self.service.data_handler.songs if s.id == song_id), None)
+            song = self.service.data_handler.get_song(song_id)
             
             if not song: return
             
@@ -295,21 +285,19 @@ class SessionController(QObject):
             song_feedback = []
             for session in song.sessions:
                 # Find assignment
-                assign = next((a for a in self.service.data_handler.assignments 
-                               if a.song_id == song.id and a.session_id == session.id), None)
+                assign = self.service.data_handler.assignments.get(song.id, session.id)
                 if not assign or not assign.member_id: continue
                 
                 # Skip if warnings are ignored
                 if assign.ignore_warnings: continue
                 
-                member = next((m for m in self.service.data_handler.members if m.id == assign.member_id), None)
+                member = self.service.data_handler.get_member(assign.member_id)
                 if not member: continue
                 
-                warnings = self.service.validate_assignment(member, song, session)
-                is_insufficient = any("모자랍니다" in w or "낮습니다" in w or "부족합니다" in w for w in warnings)
+                verdict = self.service.get_verdict(member.id, song.id, session.id)
                 
-                if is_insufficient:
-                    inst = next((i for i in self.service.data_handler.instruments if i.id == session.instrument_id), None)
+                if verdict and verdict & TOO_LOW:
+                    inst = self.service.data_handler.get_instrument(session.instrument_id)
                     inst_name = inst.name if inst else ""
                     
                     req_str = ""
@@ -1,11 +1,32 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableView, QHeaderView, 
                              QStyledItemDelegate, QAbstractItemView, QStyleOptionViewItem,
                              QApplication, QStyle, QHBoxLayout, QLabel, QScrollArea, QFrame,
-                             QLineEdit, QComboBox, QPushButton, QMessageBox)
-from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, pyqtSignal, QSize
+                             QLineEdit, QComboBox, QPushButton, QMessageBox, QListView)
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QAbstractListModel, QSortFilterProxyModel,
+                          QModelIndex, QRect, pyqtSignal, QSize, QEvent)
 from PyQt6.QtGui import QPainter, QColor, QBrush, QFontMetrics, QFont
+from difflib import SequenceMatcher
 from data_handler import DataHandler # Import explicitly
 from session_service import SessionService
+from feasibility import TOO_LOW, TOO_HIGH
+from skill_evaluator import CANNOT_PLAY, RANGE_TOO_LOW, SKILL_TOO_LOW, SKILL_TOO_HIGH
+from warning_engine import UNASSIGNED, COUNT_OVER, COUNT_UNDER
+
+# (label, kinds) for the warning log filter, None shows everything
+LOG_FILTERS = [
+    ("전체", None),
+    ("미배정", {UNASSIGNED}),
+    ("연주 불가/실력 부족", {CANNOT_PLAY, RANGE_TOO_LOW, SKILL_TOO_LOW}),
+    ("실력 과다", {SKILL_TOO_HIGH}),
+    ("배정 개수", {COUNT_OVER, COUNT_UNDER}),
+]
+
+WARNING_COLORS = {
+    UNASSIGNED: QColor("#FF8C00"), # Dark Orange
+    COUNT_UNDER: QColor("#FF8C00"),
+    COUNT_OVER: QColor("#FF4800"), # Red-Orange
+    SKILL_TOO_HIGH: QColor("blue"),
+}
 
 class SessionHeaderView(QHeaderView):
     def __init__(self, orientation, parent=None):
@@ -155,8 +176,7 @@ class SessionDelegate(QStyledItemDelegate):
             
             # 2. Assignment Count Column Highlight (Preserve in Export)
             if col_type == "COUNT_VOCAL":
-                stats = self.service.get_assignment_stats()
-                status = stats.get(member.id, "NONE")
+                status = self.service.get_member_status(member.id)
                 if status == "OVER":
                     option.backgroundBrush = QBrush(QColor(255, 200, 200)) # Red-ish
                 elif status == "UNDER":
@@ -181,8 +201,7 @@ class SessionDelegate(QStyledItemDelegate):
         try:
             # 2. Assignment Count Column (Vocal Included) - High Priority
             if col_type == "COUNT_VOCAL":
-                stats = self.service.get_assignment_stats()
-                status = stats.get(member.id, "NONE")
+                status = self.service.get_member_status(member.id)
                 if status == "OVER":
                     option.backgroundBrush = QBrush(QColor(255, 200, 200)) # Red-ish
                 elif status == "UNDER":
@@ -193,35 +212,56 @@ class SessionDelegate(QStyledItemDelegate):
             # 3. Song Column (Skill check) - High Priority
             elif col_type == "SONG":
                 # Find assignment for this cell
-                assignment = None
-                for a in self.service.data_handler.assignments:
-                    if a.song_id == song_id and a.member_id == member.id:
-                        assignment = a
-                        break
+                assignment = next((a for a in self.service.data_handler.assignments.for_song(song_id)
+                                   if a.member_id == member.id), None)
                         
                 if assignment:
                     if getattr(assignment, 'ignore_warnings', False):
                          return
                     
-                    song = next((s for s in self.service.data_handler.songs if s.id == song_id), None)
-                    if song:
-                        session = next((s for s in song.sessions if s.id == assignment.session_id), None)
-                        if session:
-                            warnings = self.service.validate_assignment(member, song, session)
-                            if warnings:
-                                # Determine color based on warning type
-                                is_too_high = any("너무 높습니다" in w for w in warnings)
-                                is_insufficient = any("부족합니다" in w or "낮습니다" in w for w in warnings)
-                                
-                                if is_insufficient:
-                                    option.backgroundBrush = QBrush(QColor(255, 200, 200)) # Red (Insufficient)
-                                elif is_too_high:
-                                    option.backgroundBrush = QBrush(QColor("#C9C2E8"))
-                                else:
-                                    option.backgroundBrush = QBrush(QColor(255, 200, 200)) # Default Red
+                    verdict = self.service.get_verdict(member.id, song_id, assignment.session_id)
+                    if verdict:
+                        # Determine color based on warning type
+                        if verdict & TOO_LOW:
+                            option.backgroundBrush = QBrush(QColor(255, 200, 200)) # Red (Insufficient)
+                        elif verdict & TOO_HIGH:
+                            option.backgroundBrush = QBrush(QColor("#C9C2E8"))
+                        else:
+                            option.backgroundBrush = QBrush(QColor(255, 200, 200)) # Default Red
         except:
             pass
 
+def sync_positions(old_keys, new_keys, remove, move, insert):
+    """
+    Turns old_keys into new_keys (unique keys) with remove(first, last), move(src, dst) and
+    insert(pos, key) callbacks, so a model can emit row/column signals for just what changed.
+    """
+    new_set = set(new_keys)
+    current = list(old_keys)
+    
+    # Removals, bottom-up in contiguous runs
+    i = len(current) - 1
+    while i >= 0:
+        if current[i] not in new_set:
+            last = i
+            while i > 0 and current[i - 1] not in new_set:
+                i -= 1
+            remove(i, last)
+            del current[i:last + 1]
+        i -= 1
+        
+    # Moves and inserts, top-down: current[:pos] always equals new_keys[:pos]
+    for pos, key in enumerate(new_keys):
+        if pos < len(current) and current[pos] == key:
+            continue
+        if key in current:
+            src = current.index(key)
+            move(src, pos)
+            current.insert(pos, current.pop(src))
+        else:
+            insert(pos, key)
+            current.insert(pos, key)
+
 class SessionTableModel(QAbstractTableModel):
     def __init__(self, data_handler: DataHandler):
         super().__init__()
@@ -229,14 +269,67 @@ class SessionTableModel(QAbstractTableModel):
         self.rows = [] 
         self.cols_map = [] 
         
+        # Display text per (row, col), built in refresh_structure and patched by apply_changes
+        self.cell_text = []
+        self.song_cols = {} # song_id -> column
+        self.member_rows = {} # member_id -> [row, ...]
+        
+        # Changes published since the last refresh (see DataHandler.notify_change)
+        self.needs_reset = True
+        self.rows_changed = False
+        self.cols_changed = False
+        self.all_songs_dirty = False
+        self.dirty_songs = set()
+        self.dirty_members = set()
+        self.data_handler.add_change_listener(self.on_data_change)
+        
         self.refresh_structure()
 
+    def on_data_change(self, event):
+        if event.kind == "project":
+            self.needs_reset = True
+        elif event.kind == "assignment":
+            if event.key is None:
+                self.all_songs_dirty = True
+            else:
+                self.dirty_songs.add(event.key[0])
+        elif event.kind == "member":
+            self.rows_changed = True
+            if event.key is None:
+                self.needs_reset = True
+            else:
+                self.dirty_members.add(event.key)
+        elif event.kind == "song":
+            self.cols_changed = True
+            if event.key is None:
+                self.all_songs_dirty = True
+            else:
+                self.dirty_songs.add(event.key)
+        elif event.kind == "instrument":
+            # Cell text uses instrument names
+            self.all_songs_dirty = True
+
     def refresh_structure(self):
         self.beginResetModel()
         
+        self.rows = self.build_rows()
+        self.cols_map = self.build_cols()
+        self.build_cell_text()
+        self.clear_pending()
+        
+        self.endResetModel()
+
+    def clear_pending(self):
+        self.needs_reset = False
+        self.rows_changed = False
+        self.cols_changed = False
+        self.all_songs_dirty = False
+        self.dirty_songs = set()
+        self.dirty_members = set()
+
+    def build_rows(self):
         from models import Grade # Lazy import or ensure imported
         
-        # 1. Rows
         grade_order = [Grade.BON2.value, Grade.BON1.value, Grade.YE2.value, Grade.YE1.value, Grade.BON4.value, Grade.BON3.value]
         groups = []
         for g in grade_order:
@@ -244,32 +337,241 @@ class SessionTableModel(QAbstractTableModel):
             if members:
                 groups.append(members)
                 
-        self.rows = []
+        rows = []
         for i, group in enumerate(groups):
-            self.rows.extend(group)
+            rows.extend(group)
             if i < len(groups) - 1:
-                self.rows.append(None)
-            
-        # 2. Columns
+                rows.append(None)
+        return rows
+
+    def build_cols(self):
         # First column: Name (combined with Grade)
-        self.cols_map = [
+        cols_map = [
             ("MEMBER_INFO", "name", None)
         ]
         
         # One column per Song
         for song in self.data_handler.songs:
-            self.cols_map.append(("SONG", song.id, None))
+            cols_map.append(("SONG", song.id, None))
         
         # Order requested: Count No Vocal, then Count Vocal
-        self.cols_map.append(("COUNT_NO_VOCAL", None, None))
-        self.cols_map.append(("COUNT_VOCAL", None, None))
+        cols_map.append(("COUNT_NO_VOCAL", None, None))
+        cols_map.append(("COUNT_VOCAL", None, None))
+        return cols_map
+
+    def build_cell_text(self):
+        self.update_lookups()
+        song_texts = {song_id: self.song_cell_text(song_id) for song_id in self.song_cols}
+        self.cell_text = [self.row_text(member, song_texts) for member in self.rows]
+
+    def update_lookups(self):
+        self.member_rows = {}
+        for row, member in enumerate(self.rows):
+            if member is not None:
+                self.member_rows.setdefault(member.id, []).append(row)
+        self.song_cols = {song_id: col for col, (col_type, song_id, _) in enumerate(self.cols_map) if col_type == "SONG"}
+
+    def row_text(self, member, song_texts):
+        if member is None:
+            return [None] * len(self.cols_map)
+        return [self.cell_value(member, col, song_texts) for col in self.cols_map]
+
+    def cell_value(self, member, col, song_texts):
+        col_type, song_id, _ = col
+        if member is None:
+            return None
+        if col_type == "MEMBER_INFO":
+            return member.name
+        elif col_type == "SONG":
+            if song_id not in song_texts:
+                song_texts[song_id] = self.song_cell_text(song_id)
+            return song_texts[song_id].get(member.id, "")
+        elif col_type == "COUNT_VOCAL":
+            return str(self.calculate_count(member, include_vocal=True))
+        elif col_type == "COUNT_NO_VOCAL":
+            return str(self.calculate_count(member, include_vocal=False))
+        return None
+
+    def song_cell_text(self, song_id):
+        """Returns { member_id: text } for one song column, one line per assigned session (e.g. "기타 1")."""
+        song = self.data_handler.get_song(song_id)
+        if not song:
+            return {}
+            
+        # Pre-calculate instrument counts for this song for display logic
+        inst_counts = {}
+        for s in song.sessions:
+            inst_counts[s.instrument_id] = inst_counts.get(s.instrument_id, 0) + 1
         
-        self.endResetModel()
+        # Track index
+        inst_current_indices = {} # inst_id -> current_idx
+        assigned_instruments = {} # member_id -> [label, ...]
+        
+        for session in song.sessions:
+            # Update index counter
+            if inst_counts.get(session.instrument_id, 0) > 1:
+                inst_current_indices[session.instrument_id] = inst_current_indices.get(session.instrument_id, 0) + 1
+                current_display_idx = inst_current_indices[session.instrument_id]
+            else:
+                current_display_idx = 0 # No number
+                
+            # Check assignment
+            assign = self.data_handler.assignments.get(song.id, session.id)
+            if not assign or not assign.member_id:
+                continue
+                
+            inst = self.data_handler.get_instrument(session.instrument_id)
+            if inst:
+                if current_display_idx > 0:
+                    label = f"{inst.name} {current_display_idx}"
+                else:
+                    label = inst.name
+                assigned_instruments.setdefault(assign.member_id, []).append(label)
+                
+        return {member_id: "\n".join(labels) for member_id, labels in assigned_instruments.items()}
+
+    def apply_changes(self):
+        """
+        Applies the pending change events with insert/remove/move and dataChanged signals
+        for just the affected rows and columns. Returns False if a full reset is needed instead.
+        """
+        if self.needs_reset:
+            return False
+            
+        song_texts = {}
+        if self.cols_changed:
+            new_cols = self.build_cols()
+            if not self.sync_columns(new_cols, song_texts):
+                return False
+        if self.rows_changed:
+            new_rows = self.build_rows()
+            if not self.sync_rows(new_rows, song_texts):
+                return False
+        self.update_lookups()
+        
+        last_row = len(self.rows) - 1
+        last_col = len(self.cols_map) - 1
+        if last_row < 0:
+            self.clear_pending()
+            return True
+            
+        # Song columns: text, header and (through ignore_warnings / skills) cell colors
+        dirty_songs = self.song_cols.keys() if self.all_songs_dirty else self.dirty_songs
+        for song_id in dirty_songs:
+            col_idx = self.song_cols.get(song_id)
+            if col_idx is None:
+                continue
+            texts = song_texts[song_id] if song_id in song_texts else self.song_cell_text(song_id)
+            for row, member in enumerate(self.rows):
+                if member is not None:
+                    self.cell_text[row][col_idx] = texts.get(member.id, "")
+            self.dataChanged.emit(self.index(0, col_idx), self.index(last_row, col_idx))
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, col_idx, col_idx)
+            
+        # Edited members: name and skill colors of the whole row
+        for member_id in self.dirty_members:
+            for row in self.member_rows.get(member_id, ()):
+                self.cell_text[row][0] = self.rows[row].name
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_col))
+                
+        # Counts of the touched members and OVER/UNDER of everyone can change
+        for row, member in enumerate(self.rows):
+            if member is None:
+                continue
+            for col_idx in (last_col - 1, last_col):
+                self.cell_text[row][col_idx] = self.cell_value(member, self.cols_map[col_idx], song_texts)
+        if last_col >= 1:
+            self.dataChanged.emit(self.index(0, last_col - 1), self.index(last_row, last_col))
+            
+        self.clear_pending()
+        return True
+
+    def sync_columns(self, new_cols, song_texts):
+        old_keys = [(col_type, song_id) for col_type, song_id, _ in self.cols_map]
+        new_keys = [(col_type, song_id) for col_type, song_id, _ in new_cols]
+        if len(set(new_keys)) != len(new_keys):
+            return False
+        by_key = dict(zip(new_keys, new_cols))
+        parent = QModelIndex()
+        
+        def remove(first, last):
+            self.beginRemoveColumns(parent, first, last)
+            del self.cols_map[first:last + 1]
+            for row_text in self.cell_text:
+                del row_text[first:last + 1]
+            self.endRemoveColumns()
+            
+        def move(src, dst):
+            self.beginMoveColumns(parent, src, src, parent, dst)
+            self.cols_map.insert(dst, self.cols_map.pop(src))
+            for row_text in self.cell_text:
+                row_text.insert(dst, row_text.pop(src))
+            self.endMoveColumns()
+            
+        def insert(pos, key):
+            col = by_key[key]
+            self.beginInsertColumns(parent, pos, pos)
+            self.cols_map.insert(pos, col)
+            for member, row_text in zip(self.rows, self.cell_text):
+                row_text.insert(pos, self.cell_value(member, col, song_texts))
+            self.endInsertColumns()
+            
+        sync_positions(old_keys, new_keys, remove, move, insert)
+        return True
+
+    def sync_rows(self, new_rows, song_texts):
+        def row_keys(rows):
+            # Separators are interchangeable, key them by their ordinal
+            keys = []
+            separators = 0
+            for m in rows:
+                if m is not None:
+                    keys.append(("MEMBER", m.id))
+                else:
+                    keys.append(("SEPARATOR", separators))
+                    separators += 1
+            return keys
+            
+        old_keys = row_keys(self.rows)
+        new_keys = row_keys(new_rows)
+        if len(set(new_keys)) != len(new_keys) or len(set(old_keys)) != len(old_keys):
+            return False
+        by_key = dict(zip(new_keys, new_rows))
+        parent = QModelIndex()
+        
+        def remove(first, last):
+            self.beginRemoveRows(parent, first, last)
+            del self.rows[first:last + 1]
+            del self.cell_text[first:last + 1]
+            self.endRemoveRows()
+            
+        def move(src, dst):
+            self.beginMoveRows(parent, src, src, parent, dst)
+            self.rows.insert(dst, self.rows.pop(src))
+            self.cell_text.insert(dst, self.cell_text.pop(src))
+            self.endMoveRows()
+            
+        def insert(pos, key):
+            member = by_key[key]
+            self.beginInsertRows(parent, pos, pos)
+            self.rows.insert(pos, member)
+            self.cell_text.insert(pos, self.row_text(member, song_texts))
+            self.endInsertRows()
+            
+        sync_positions(old_keys, new_keys, remove, move, insert)
+        
+        # Edited members are new objects with the same id
+        self.rows = list(new_rows)
+        return True
 
     def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
         return len(self.rows)
 
     def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
         return len(self.cols_map)
 
     def flags(self, index):
@@ -297,51 +599,7 @@ class SessionTableModel(QAbstractTableModel):
         col_type, song_id, _ = self.cols_map[col_idx]
         
         if role == Qt.ItemDataRole.DisplayRole:
-            if col_type == "MEMBER_INFO":
-                return member.name
-            
-            elif col_type == "SONG":
-                assigned_instruments = []
-                song = next((s for s in self.data_handler.songs if s.id == song_id), None)
-                
-                if song:
-                    # Pre-calculate instrument counts for this song for display logic
-                    inst_counts = {}
-                    for s in song.sessions:
-                        inst_counts[s.instrument_id] = inst_counts.get(s.instrument_id, 0) + 1
-                    
-                    # Track index
-                    inst_current_indices = {} # inst_id -> current_idx
-                    # Need to know WHICH one is assigned to this user.
-                    # Iterate sessions in order
-                    
-                    for session in song.sessions:
-                        # Update index counter
-                        if inst_counts.get(session.instrument_id, 0) > 1:
-                            inst_current_indices[session.instrument_id] = inst_current_indices.get(session.instrument_id, 0) + 1
-                            current_display_idx = inst_current_indices[session.instrument_id]
-                        else:
-                            current_display_idx = 0 # No number
-                            
-                        # Check assignment
-                        assign = next((a for a in self.data_handler.assignments 
-                                       if a.song_id == song.id and a.session_id == session.id and a.member_id == member.id), None)
-                        
-                        if assign:
-                            inst = next((i for i in self.data_handler.instruments if i.id == session.instrument_id), None)
-                            if inst:
-                                if current_display_idx > 0:
-                                    assigned_instruments.append(f"{inst.name} {current_display_idx}")
-                                else:
-                                    assigned_instruments.append(inst.name)
-                
-                return "\n".join(assigned_instruments)
-            
-            elif col_type == "COUNT_VOCAL":
-                return str(self.calculate_count(member, include_vocal=True))
-                
-            elif col_type == "COUNT_NO_VOCAL":
-                return str(self.calculate_count(member, include_vocal=False))
+            return self.cell_text[row_idx][col_idx]
         
         elif role == Qt.ItemDataRole.TextAlignmentRole:
             if col_type == "MEMBER_INFO":
@@ -365,7 +623,7 @@ class SessionTableModel(QAbstractTableModel):
             if col_type == "MEMBER_INFO":
                 return "이름"
             elif col_type == "SONG":
-                song = next((s for s in self.data_handler.songs if s.id == song_id), None)
+                song = self.data_handler.get_song(song_id)
                 title_text = "Unknown"
                 if song:
                     title_text = song.nickname if song.nickname else song.title
@@ -379,7 +637,7 @@ class SessionTableModel(QAbstractTableModel):
             if col_type == "MEMBER_INFO":
                 return ""
             elif col_type == "SONG":
-                song = next((s for s in self.data_handler.songs if s.id == song_id), None)
+                song = self.data_handler.get_song(song_id)
                 return song.category if song else ""
             elif col_type == "COUNT_NO_VOCAL" or col_type == "COUNT_VOCAL":
                 return "배정 개수"
@@ -387,20 +645,82 @@ class SessionTableModel(QAbstractTableModel):
         return None
 
     def calculate_count(self, member, include_vocal):
-        count = 0
-        for a in self.data_handler.assignments:
-            if a.member_id == member.id:
-                if include_vocal:
-                    count += 1
-                else:
-                    song = next((s for s in self.data_handler.songs if s.id == a.song_id), None)
-                    if song:
-                        session = next((s for s in song.sessions if s.id == a.session_id), None)
-                        if session:
-                            inst = next((i for i in self.data_handler.instruments if i.id == session.instrument_id), None)
-                            if inst and inst.name != "보컬/랩":
-                                count += 1
-        return count
+        return self.data_handler.assignment_counters.count(member.id, include_vocal)
+
+class WarningListModel(QAbstractListModel):
+    """
+    Warning records of the warning engine, one row each.
+    set_records() diffs against the current rows and only inserts/removes the rows that changed.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return record.text
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            return WARNING_COLORS.get(record.kind, QColor("red"))
+        elif role == Qt.ItemDataRole.UserRole:
+            return record
+        return None
+
+    def set_records(self, records):
+        if records == self.records:
+            return
+        old = self.records
+        new = list(records)
+        opcodes = SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+
+        # Back to front so the row numbers of the remaining opcodes stay valid
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == 'equal':
+                continue
+            if i2 > i1:
+                self.beginRemoveRows(QModelIndex(), i1, i2 - 1)
+                del self.records[i1:i2]
+                self.endRemoveRows()
+            if j2 > j1:
+                self.beginInsertRows(QModelIndex(), i1, i1 + j2 - j1 - 1)
+                self.records[i1:i1] = new[j1:j2]
+                self.endInsertRows()
+
+class WarningFilterModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.kinds = None # None: all kinds
+
+    def set_kinds(self, kinds):
+        self.kinds = set(kinds) if kinds is not None else None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.kinds is None:
+            return True
+        record = self.sourceModel().records[source_row]
+        return record.kind in self.kinds
+
+class WarningListView(QListView):
+    """List view that shows a placeholder text while it has no rows."""
+    def __init__(self, placeholder="", parent=None):
+        super().__init__(parent)
+        self.placeholder = placeholder
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.model() is not None and self.model().rowCount() == 0 and self.placeholder:
+            painter = QPainter(self.viewport())
+            rect = self.viewport().rect().adjusted(4, 2, -4, -2)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self.placeholder)
 
 class FrozenTableView(QTableView):
     def __init__(self, model, service: SessionService):
@@ -437,6 +757,16 @@ class FrozenTableView(QTableView):
         self.entered.connect(self.on_cell_entered)
         self.frozen_view.entered.connect(self.on_cell_entered)
         
+        # Measured minimum width per song column (keyed by song id so column moves keep it)
+        # and per text line; only invalidated when contents or the font change
+        self.min_width_cache = {}
+        self.text_width_cache = {}
+        model.modelReset.connect(self.clear_width_cache)
+        model.rowsInserted.connect(self.clear_width_cache)
+        model.rowsRemoved.connect(self.clear_width_cache)
+        model.dataChanged.connect(self.on_model_data_changed)
+        model.headerDataChanged.connect(self.on_header_data_changed)
+        
         # Connect model reset signal
         model.modelReset.connect(self.update_frozen_view_structure)
         
@@ -472,6 +802,60 @@ class FrozenTableView(QTableView):
         else:
             self.reset_hover()
 
+    def clear_width_cache(self, *args):
+        self.min_width_cache = {}
+
+    def invalidate_column_widths(self, first, last):
+        cols_map = self.model().cols_map
+        for col in range(first, min(last, len(cols_map) - 1) + 1):
+            self.min_width_cache.pop(cols_map[col][1], None)
+
+    def on_model_data_changed(self, top_left, bottom_right, roles=()):
+        self.invalidate_column_widths(top_left.column(), bottom_right.column())
+
+    def on_header_data_changed(self, orientation, first, last):
+        if orientation == Qt.Orientation.Horizontal:
+            self.invalidate_column_widths(first, last)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.FontChange:
+            self.min_width_cache = {}
+            self.text_width_cache = {}
+        super().changeEvent(event)
+
+    def text_width(self, fm, text):
+        width = self.text_width_cache.get(text)
+        if width is None:
+            width = fm.horizontalAdvance(text)
+            self.text_width_cache[text] = width
+        return width
+
+    def column_min_width(self, col, fm):
+        key = self.model().cols_map[col][1]
+        max_width = self.min_width_cache.get(key)
+        if max_width is not None:
+            return max_width
+            
+        # (1) Header Width
+        header_text = self.model().headerData(col, Qt.Orientation.Horizontal, Qt.ItemDataRole.DisplayRole)
+        max_width = 60 # Absolute minimum
+        if header_text:
+            max_width = max(max_width, self.text_width(fm, header_text) + 20)
+        
+        # (2) Data Width
+        rows = self.model().rowCount()
+        for row in range(rows):
+            index = self.model().index(row, col)
+            data_text = self.model().data(index, Qt.ItemDataRole.DisplayRole)
+            if data_text:
+                lines = data_text.split('\n')
+                for line in lines:
+                    width = self.text_width(fm, line) + 20
+                    max_width = max(max_width, width)
+                    
+        self.min_width_cache[key] = max_width
+        return max_width
+
     def reset_hover(self):
         if self.delegate.hover_row != -1:
             self.delegate.set_hover(-1, -1)
@@ -541,23 +925,7 @@ class FrozenTableView(QTableView):
             
             song_cols.append(col)
             
-            # (1) Header Width
-            header_text = self.model().headerData(col, Qt.Orientation.Horizontal, Qt.ItemDataRole.DisplayRole)
-            max_width = 60 # Absolute minimum
-            if header_text:
-                max_width = max(max_width, fm.horizontalAdvance(header_text) + 20)
-            
-            # (2) Data Width
-            rows = self.model().rowCount()
-            for row in range(rows):
-                index = self.model().index(row, col)
-                data_text = self.model().data(index, Qt.ItemDataRole.DisplayRole)
-                if data_text:
-                    lines = data_text.split('\n')
-                    for line in lines:
-                        width = fm.horizontalAdvance(line) + 20
-                        max_width = max(max_width, width)
-            
+            max_width = self.column_min_width(col, fm)
             song_col_min_widths[col] = max_width
             total_song_min_width += max_width
 
@@ -655,12 +1023,19 @@ class SessionWidget(QWidget):
         
         log_export_layout = QHBoxLayout()
         
-        self.log_area = QScrollArea()
+        self.log_area = QWidget()
         self.log_area.setFixedHeight(150)
-        self.log_container = QWidget()
-        self.log_layout = QVBoxLayout(self.log_container)
-        self.log_area.setWidget(self.log_container)
-        self.log_area.setWidgetResizable(True)
+        log_layout = QVBoxLayout(self.log_area)
+        log_layout.setContentsMargins(0, 0, 0, 0)
+        log_layout.setSpacing(2)
+
+        self.log_filter = QComboBox()
+        for label, kinds in LOG_FILTERS:
+            self.log_filter.addItem(label, kinds)
+        log_layout.addWidget(self.log_filter, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        self.log_view = WarningListView("경고 없음")
+        log_layout.addWidget(self.log_view)
         
         log_export_layout.addWidget(self.log_area)
         
@@ -0,0 +1,106 @@
+import re
+from bisect import bisect_left
+from typing import Dict, Tuple
+from models import SkillLevel, VOCAL_RANGE
+
+# Verdict codes
+CANNOT_PLAY = "CANNOT_PLAY" # Decided by the caller: member doesn't play the instrument at all
+RANGE_TOO_LOW = "RANGE_TOO_LOW"
+SKILL_TOO_LOW = "SKILL_TOO_LOW"
+SKILL_TOO_HIGH = "SKILL_TOO_HIGH"
+
+NOTE_MAP = {'C': 0, 'C#': 1, 'D': 2, 'D#': 3, 'E': 4, 'F': 5, 'F#': 6, 'G': 7, 'G#': 8, 'A': 9, 'A#': 10, 'B': 11}
+NOTE_PATTERN = re.compile(r"([A-G]#?)([0-9]+)")
+
+# 5: Youtuber, 4: Expert, 3: High, 2: Mid, 1: Low, 0: Beginner
+SKILL_LEVELS = {
+    SkillLevel.YOUTUBER.value: 5,
+    SkillLevel.EXPERT.value: 4,
+    SkillLevel.HIGH.value: 3,
+    SkillLevel.MID.value: 2,
+    SkillLevel.LOW.value: 1,
+    SkillLevel.BEGINNER.value: 0
+}
+
+SKILL_BASE_BPM = {
+    SkillLevel.YOUTUBER.value: 180,
+    SkillLevel.EXPERT.value: 160,
+    SkillLevel.HIGH.value: 140,
+    SkillLevel.MID.value: 120,
+    SkillLevel.LOW.value: 90,
+    SkillLevel.BEGINNER.value: 50
+}
+
+# Skill x 16
+SKILL_CAPS = {skill: bpm * 16 for skill, bpm in SKILL_BASE_BPM.items()}
+
+# Required level for a song value (BPM x max beat): index of the first threshold it does not exceed
+# 90*16, 120*16, 140*16, 160*16, 180*16
+LEVEL_THRESHOLDS = [1440, 1920, 2240, 2560, 2880]
+
+def parse_note(note_str) -> int:
+    if not note_str: return -1
+    try:
+        match = NOTE_PATTERN.match(note_str)
+        if not match: return -1
+        return int(match.group(2)) * 12 + NOTE_MAP.get(match.group(1), 0)
+    except Exception:
+        return -1
+
+def required_level(song_req_val) -> int:
+    return bisect_left(LEVEL_THRESHOLDS, song_req_val)
+
+class SkillEvaluator:
+    """
+    Table-driven version of the skill/vocal-range rules used by validate_assignment.
+
+    Verdicts only depend on (is_vocal, skill, bpm, difficulty_param), so they are memoized;
+    the caller turns them into messages with the member and instrument names.
+    """
+    def __init__(self):
+        self.note_codes: Dict[str, int] = {note: parse_note(note) for note in VOCAL_RANGE}
+        self.verdicts: Dict[tuple, Tuple[tuple, ...]] = {}
+
+    def note_to_int(self, note_str) -> int:
+        code = self.note_codes.get(note_str)
+        if code is None:
+            code = parse_note(note_str)
+            if isinstance(note_str, str):
+                self.note_codes[note_str] = code
+        return code
+
+    def evaluate(self, is_vocal: bool, skill: str, bpm, difficulty_param) -> Tuple[tuple, ...]:
+        """Returns a tuple of (code, max_beat) verdicts, empty if the assignment is fine."""
+        key = (is_vocal, skill, bpm, difficulty_param)
+        verdict = self.verdicts.get(key)
+        if verdict is None:
+            verdict = self._evaluate_vocal(skill, difficulty_param) if is_vocal else self._evaluate_instrument(skill, bpm, difficulty_param)
+            self.verdicts[key] = verdict
+        return verdict
+
+    def _evaluate_vocal(self, skill, difficulty_param):
+        # Compare Highest Note
+        req_note = self.note_to_int(difficulty_param)
+        mem_note = self.note_to_int(skill)
+        if req_note != -1 and mem_note != -1 and mem_note < req_note:
+            return ((RANGE_TOO_LOW, None),)
+        return ()
+
+    def _evaluate_instrument(self, skill, bpm, difficulty_param):
+        try:
+            max_beat = int(difficulty_param)
+        except Exception:
+            max_beat = 16 # Default fallback
+
+        song_req_val = bpm * max_beat
+        verdict = []
+
+        # Youtuber exception applies ONLY here
+        if song_req_val > SKILL_CAPS.get(skill, 0) and skill != SkillLevel.YOUTUBER.value:
+            verdict.append((SKILL_TOO_LOW, max_beat))
+
+        # Too High (Member Level >= Req Level + 3), skipped from 180*16 up
+        if song_req_val < 2880 and SKILL_LEVELS.get(skill, 0) >= required_level(song_req_val) + 3:
+            verdict.append((SKILL_TOO_HIGH, max_beat))
+
+        return tuple(verdict)
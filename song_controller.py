@@ -1,29 +1,43 @@
+from collections import Counter
 from PyQt6.QtWidgets import QMessageBox
 from song_ui import SongWidget, SongBoxWidget, SessionBoxWidget
 from song_service import SongService
-from models import Song, SongSession, SongCategory
+from models import Song, SongSession, SongCategory, VOCAL_RANGE
 from PyQt6.QtCore import Qt
-import copy
 from dialogs import InstrumentSelectDialog
+from refresh_scheduler import RefreshScheduler, connect_refresh
+
+VOCAL_OPTIONS = list(VOCAL_RANGE)
+BEAT_OPTIONS = ["1", "4", "8", "16", "24", "32"]
+
+def set_text(edit, text):
+    # Leaves the cursor alone when the text is already right
+    if edit.text() != text:
+        edit.setText(text)
 
 class SongController:
-    def __init__(self, ui: SongWidget, service: SongService):
+    BOX_POOL_LIMIT = 50
+
+    def __init__(self, ui: SongWidget, service: SongService, scheduler: RefreshScheduler = None):
         self.ui = ui
         self.service = service
-        self.widget_map = {} 
+        self.scheduler = scheduler # Refreshes run directly on each change without one
+        self.widget_map = {} # song id -> SongBoxWidget, in layout order
+        self.box_pool = [] # Hidden boxes of removed songs, reused before creating new ones
+        self.session_pool = [] # Same for session widgets
         
         self.connect_signals()
         self.refresh_ui()
 
     def connect_signals(self):
-        self.service.data_changed.connect(self.refresh_ui)
+        connect_refresh(self.service.data_changed, self.refresh_ui, self.scheduler)
         self.ui.btn_add_song.clicked.connect(self.add_default_song)
         self.ui.btn_reset.clicked.connect(self.confirm_reset)
 
     def add_default_song(self):
         # Create a default song structure
         # Must be Vocal song with "Vocal/Rap" session by default
-        vocal_inst = next((i for i in self.service.data_handler.instruments if i.name == "보컬/랩"), None)
+        vocal_inst = self.service.data_handler.get_instrument_by_name("보컬/랩")
         new_song = Song(category=SongCategory.VOCAL.value)
         if vocal_inst:
             new_song.sessions.append(SongSession(instrument_id=vocal_inst.id, difficulty_param="A5"))
@@ -44,82 +58,146 @@ class SongController:
             self.service.reset_concert()
 
     def refresh_ui(self):
-        # Clear existing
-        while self.ui.songs_layout.count():
-            item = self.ui.songs_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self.widget_map = {}
-
+        # Diff the song list against the boxes shown: only changed boxes are filled again,
+        # boxes of removed songs go back to the pool and the rest are reordered in place
         songs = self.service.data_handler.songs
-        if not songs:
-             # Do not force add here if load is empty, wait for user action or init
-             pass
+        current_ids = {song.id for song in songs}
+        for song_id in [song_id for song_id in self.widget_map if song_id not in current_ids]:
+            self.recycle_box(self.widget_map.pop(song_id))
 
+        layout = self.ui.songs_layout
         for index, song in enumerate(songs):
-            box = SongBoxWidget()
-            self.setup_box(box, song, index)
+            box = self.widget_map.get(song.id)
+            if box is None:
+                box = self.take_box()
+                self.widget_map[song.id] = box
+            self.fill_box(box, song, index)
+            if layout.indexOf(box) != index:
+                layout.removeWidget(box)
+                layout.insertWidget(index, box)
+                box.show()
+
+    def clear_song_boxes(self):
+        for box in self.widget_map.values():
+            self.recycle_box(box)
+        self.widget_map = {}
+
+    def append_song_boxes(self, songs):
+        # Also used by the staged project load, which adds songs as their sessions arrive
+        for song in songs:
+            box = self.take_box()
+            self.fill_box(box, song, len(self.widget_map))
             self.ui.songs_layout.addWidget(box)
+            box.show()
             self.widget_map[song.id] = box
-            
-    def setup_box(self, box: SongBoxWidget, song: Song, index: int):
-        # Fill data
-        box.lbl_number.setText(f"No.{index + 1}")
-        box.edit_name.setText(song.title)
-        box.edit_nickname.setText(song.nickname) # Fill nickname
-        box.edit_bpm.setText(str(song.bpm))
-        box.combo_category.setCurrentText(song.category)
-        box.edit_ref.setText(song.reference_url)
-        
-        # Always show delete button, but disable if only one song
-        box.btn_delete.show()
-        if len(self.service.data_handler.songs) <= 1:
-            box.btn_delete.setEnabled(False)
+
+    def show_loaded_songs(self, song_ids):
+        dh = self.service.data_handler
+        self.append_song_boxes([dh.get_song(song_id) for song_id in song_ids if dh.get_song(song_id)])
+
+    def take_box(self) -> SongBoxWidget:
+        if self.box_pool:
+            return self.box_pool.pop()
+        box = SongBoxWidget()
+        box.song = None
+        box.header_state = None
+        box.sessions_state = None
+        box.session_widgets = []
+
+        # Connected once, the handlers act on the song the box shows at the time
+        box.edit_name.editingFinished.connect(lambda: self.update_field(box.song, "title", box.edit_name.text()))
+        box.edit_nickname.editingFinished.connect(lambda: self.update_field(box.song, "nickname", box.edit_nickname.text()))
+        box.edit_bpm.editingFinished.connect(lambda: self.update_field(box.song, "bpm", box.edit_bpm.text()))
+        box.combo_category.currentTextChanged.connect(lambda t: self.on_category_changed(box.song, t))
+        # Use textChanged for URL to ensure it's saved even without Enter (the edits merge into one undo step)
+        box.edit_ref.textChanged.connect(lambda t: self.update_field(box.song, "reference_url", t))
+
+        box.btn_delete.clicked.connect(lambda: self.delete_song_confirm(box.song))
+        box.btn_up.clicked.connect(lambda: self.service.move_song(box.song.id, -1))
+        box.btn_down.clicked.connect(lambda: self.service.move_song(box.song.id, 1))
+
+        box.btn_add_session.clicked.connect(lambda: self.add_session(box.song))
+        return box
+
+    def recycle_box(self, box: SongBoxWidget):
+        self.ui.songs_layout.removeWidget(box)
+        box.hide()
+        if len(self.box_pool) < self.BOX_POOL_LIMIT:
+            box.song = None # Filled again in full when reused
+            self.box_pool.append(box)
         else:
-            box.btn_delete.setEnabled(True)
-
-        # Connect signals
-        box.edit_name.editingFinished.connect(lambda: self.update_field(song, "title", box.edit_name.text()))
-        box.edit_nickname.editingFinished.connect(lambda: self.update_field(song, "nickname", box.edit_nickname.text())) # Nickname signal
-        box.edit_bpm.editingFinished.connect(lambda: self.update_field(song, "bpm", box.edit_bpm.text()))
-        box.combo_category.currentTextChanged.connect(lambda t: self.on_category_changed(song, t))
-        # Use textChanged for URL to ensure it's saved even without Enter
-        box.edit_ref.textChanged.connect(lambda t: self.update_ref_direct(song, t))
-        
-        box.btn_delete.clicked.connect(lambda: self.delete_song_confirm(song))
-        box.btn_up.clicked.connect(lambda: self.service.move_song(song.id, -1))
-        box.btn_down.clicked.connect(lambda: self.service.move_song(song.id, 1))
-        
-        box.btn_add_session.clicked.connect(lambda: self.add_session(song))
-        
-        # Populate sessions
-        for sess_idx, session in enumerate(song.sessions):
-            self.add_session_widget(box, song, session, sess_idx)
+            box.deleteLater()
+
+    def fill_box(self, box: SongBoxWidget, song: Song, index: int):
+        if box.song is not song:
+            box.song = song
+            box.header_state = None
+            box.sessions_state = None
+
+        # Always show delete button, but disable if only one song
+        header_state = (index, len(self.service.data_handler.songs) > 1,
+                        song.title, song.nickname, song.bpm, song.category, song.reference_url)
+        if header_state != box.header_state:
+            box.header_state = header_state
+            for widget in (box.edit_name, box.edit_nickname, box.edit_bpm, box.combo_category, box.edit_ref):
+                widget.blockSignals(True)
+            box.lbl_number.setText(f"No.{index + 1}")
+            set_text(box.edit_name, song.title)
+            set_text(box.edit_nickname, song.nickname)
+            set_text(box.edit_bpm, str(song.bpm))
+            box.combo_category.setCurrentText(song.category)
+            set_text(box.edit_ref, song.reference_url)
+            box.btn_delete.setEnabled(header_state[1])
+            for widget in (box.edit_name, box.edit_nickname, box.edit_bpm, box.combo_category, box.edit_ref):
+                widget.blockSignals(False)
+
+        sessions_state = (song.category,) + tuple(
+            (s.id, s.instrument_id, self.get_inst_name(s.instrument_id), s.difficulty_param) for s in song.sessions)
+        if sessions_state != box.sessions_state:
+            box.sessions_state = sessions_state
+            self.fill_sessions(box, song)
+
+    def fill_sessions(self, box: SongBoxWidget, song: Song):
+        widgets = box.session_widgets
+        while len(widgets) > len(song.sessions):
+            sess_widget = widgets.pop()
+            box.sessions_layout.removeWidget(sess_widget)
+            sess_widget.hide()
+            self.session_pool.append(sess_widget)
+
+        # Number sessions only when 2+ of the same instrument
+        inst_counts = Counter(s.instrument_id for s in song.sessions)
+        seen = Counter()
+        for index, session in enumerate(song.sessions):
+            if index == len(widgets):
+                sess_widget = self.session_pool.pop() if self.session_pool else self.create_session_widget()
+                # Insert before add button
+                box.sessions_layout.insertWidget(box.sessions_layout.count() - 1, sess_widget)
+                sess_widget.show()
+                widgets.append(sess_widget)
+            seen[session.instrument_id] += 1
+            number = seen[session.instrument_id] if inst_counts[session.instrument_id] > 1 else None
+            self.fill_session_widget(widgets[index], song, session, index, number)
 
-    def add_session_widget(self, box, song, session, index):
+    def create_session_widget(self) -> SessionBoxWidget:
         sess_widget = SessionBoxWidget()
-        
+        sess_widget.song = None
+        sess_widget.session = None
+        sess_widget.options = None
+
+        # Connected once, like the song box signals
+        sess_widget.btn_inst.clicked.connect(lambda: self.select_instrument(sess_widget.song, sess_widget.session))
+        sess_widget.combo_difficulty.currentTextChanged.connect(
+            lambda t: self.update_session_field(sess_widget.song, sess_widget.session, "difficulty_param", t))
+        sess_widget.btn_remove.clicked.connect(lambda: self.delete_session(sess_widget.song, sess_widget.session))
+        return sess_widget
+
+    def fill_session_widget(self, sess_widget, song, session, index, number):
+        sess_widget.song = song
+        sess_widget.session = session
+
         inst_name = self.get_inst_name(session.instrument_id)
-        
-        # Count instances of each instrument ID in this song to determine if numbering is needed
-        inst_counts = {}
-        for s in song.sessions:
-            inst_counts[s.instrument_id] = inst_counts.get(s.instrument_id, 0) + 1
-        
-        # Determine display name with numbering if needed (only when 2+ of same instrument)
-        if inst_counts.get(session.instrument_id, 0) > 1:
-            # Calculate this session's index among same instrument sessions
-            same_inst_index = 0
-            for s in song.sessions:
-                if s.instrument_id == session.instrument_id:
-                    same_inst_index += 1
-                    if s.id == session.id:
-                        break
-            display_name = f"{inst_name} {same_inst_index}"
-        else:
-            display_name = inst_name
-        
-        sess_widget.btn_inst.setText(display_name)
+        sess_widget.btn_inst.setText(f"{inst_name} {number}" if number else inst_name)
         
         # Logic: Label and Options based on Instrument Name (Vocal/Rap vs Others)
         # Assuming "보컬/랩" is the name. ID check is safer but name is used in logic req.
@@ -127,16 +205,22 @@ class SongController:
         
         if is_vocal_inst:
             sess_widget.lbl_difficulty.setText("최고음")
-            opts = ["E5", "F5", "F#5", "G5", "G#5", "A5", "A#5", "B5", "C6", "C#6", "D6", "D#6", "E6", "F6", "F#6", "G6", "G#6", "A6", "A#6", "B6", "C7"]
+            opts = VOCAL_OPTIONS
         else:
             sess_widget.lbl_difficulty.setText("최대비트")
-            opts = ["1", "4", "8", "16", "24", "32"]
-            
-        sess_widget.combo_difficulty.clear()
-        sess_widget.combo_difficulty.addItems(opts)
-        
+            opts = BEAT_OPTIONS
+
+        combo = sess_widget.combo_difficulty
+        combo.blockSignals(True)
+        if sess_widget.options is not opts:
+            sess_widget.options = opts
+            combo.clear()
+            combo.addItems(opts)
         if session.difficulty_param in opts:
-            sess_widget.combo_difficulty.setCurrentText(session.difficulty_param)
+            combo.setCurrentText(session.difficulty_param)
+        else:
+            combo.setCurrentIndex(0) # Shows the first option, as a freshly filled combo does
+        combo.blockSignals(False)
         
         # Hide remove button for FIRST session always
         if index == 0:
@@ -150,74 +234,25 @@ class SongController:
         else:
             sess_widget.btn_remove.show()
             sess_widget.btn_inst.setEnabled(True)
-        
-        # Signals
-        sess_widget.btn_inst.clicked.connect(lambda: self.select_instrument(song, session))
-        sess_widget.combo_difficulty.currentTextChanged.connect(lambda t: self.update_session_field(song, session, "difficulty_param", t))
-        sess_widget.btn_remove.clicked.connect(lambda: self.delete_session(song, session))
-        
-        # Insert before add button
-        count = box.sessions_layout.count()
-        box.sessions_layout.insertWidget(count - 1, sess_widget)
 
     def get_inst_name(self, inst_id):
-        for i in self.service.data_handler.instruments:
-            if i.id == inst_id:
-                return i.name
-        return "악기 선택"
-
-    def update_ref_direct(self, song, value):
-        song.reference_url = value
+        inst = self.service.data_handler.get_instrument(inst_id)
+        return inst.name if inst else "악기 선택"
 
     def update_field(self, song, field_name, value):
-        if getattr(song, field_name) == value:
-            return
-
-        new_song = copy.deepcopy(song)
         if field_name == "bpm":
             try:
-                setattr(new_song, field_name, int(value))
+                value = int(value)
             except ValueError:
-                return 
-        else:
-            setattr(new_song, field_name, value)
-            
-        self.service.update_song(song, new_song)
+                return
 
-    def on_category_changed(self, song, new_category):
-        if song.category == new_category:
-            return
+        self.service.set_song_field(song, field_name, value)
 
-        new_song = copy.deepcopy(song)
-        new_song.category = new_category
-        
-        vocal_inst = next((i for i in self.service.data_handler.instruments if i.name == "보컬/랩"), None)
-        vocal_id = vocal_inst.id if vocal_inst else "UNKNOWN"
-
-        if new_category == SongCategory.VOCAL.value:
-            # Instrumental -> Vocal
-            # Add 'Vocal/Rap' at the beginning
-            # Check if already exists? Usually not in Inst song.
-            # Just insert at 0
-            new_session = SongSession(instrument_id=vocal_id, difficulty_param="A5")
-            new_song.sessions.insert(0, new_session)
-            
-        else:
-            # Vocal -> Instrumental
-            # Remove 'Vocal/Rap' sessions (or just the first one?)
-            # Req: "'보컬/랩'에 해당하는 악기를 지워야 해."
-            # Remove all vocal/rap instances or just the first locked one?
-            # Safest is to remove all instances of Vocal/Rap
-            new_song.sessions = [s for s in new_song.sessions if s.instrument_id != vocal_id]
-            
-            # If sessions become empty, add a default placeholder?
-            # An instrumental song needs at least one instrument usually?
-            # If empty, maybe add a default instrument? (e.g. Piano or Guitar)
-            if not new_song.sessions:
-                 # Add dummy
-                 pass 
-
-        self.service.update_song(song, new_song)
+    def on_category_changed(self, song, new_category):
+        # Instrumental -> Vocal adds a 'Vocal/Rap' session at the beginning,
+        # Vocal -> Instrumental removes all 'Vocal/Rap' sessions
+        # Req: "'보컬/랩'에 해당하는 악기를 지워야 해."
+        self.service.change_category(song, new_category)
 
     def delete_song_confirm(self, song):
         reply = QMessageBox.question(self.ui, '삭제', '정말 이 곡을 지우시겠습니까?',
@@ -226,7 +261,6 @@ class SongController:
             self.service.delete_song(song)
 
     def add_session(self, song):
-        new_song = copy.deepcopy(song)
         new_session = SongSession()
         
         # Default logic
@@ -235,13 +269,10 @@ class SongController:
         # Let's just add empty/default and let user select.
         new_session.difficulty_param = "16" 
         
-        new_song.sessions.append(new_session)
-        self.service.update_song(song, new_song)
+        self.service.add_session(song, new_session)
         
     def delete_session(self, song, session_to_delete):
-         new_song = copy.deepcopy(song)
-         new_song.sessions = [s for s in new_song.sessions if s.id != session_to_delete.id]
-         self.service.update_song(song, new_song)
+         self.service.remove_session(song, session_to_delete)
          
     def select_instrument(self, song, session):
         dlg = InstrumentSelectDialog(self.service.data_handler.instruments, self.ui)
@@ -254,27 +285,9 @@ class SongController:
                     QMessageBox.warning(self.ui, "경고", "기악곡에는 보컬/랩 세션을 추가할 수 없습니다.")
                     return
 
-                new_song = copy.deepcopy(song)
-                for s in new_song.sessions:
-                    if s.id == session.id:
-                        s.instrument_id = selected.id
-                        # Reset difficulty param based on type
-                        if selected.name == "보컬/랩":
-                            s.difficulty_param = "A5"
-                        else:
-                            s.difficulty_param = "16"
-                        break
-                self.service.update_song(song, new_song)
+                # Reset difficulty param based on type
+                difficulty = "A5" if selected.name == "보컬/랩" else "16"
+                self.service.update_session(song, session, instrument_id=selected.id, difficulty_param=difficulty)
 
     def update_session_field(self, song, session, field, value):
-        new_song = copy.deepcopy(song)
-        changed = False
-        for s in new_song.sessions:
-            if s.id == session.id:
-                if getattr(s, field) != value:
-                    setattr(s, field, value)
-                    changed = True
-                break
-        
-        if changed:
-            self.service.update_song(song, new_song)
+        self.service.update_session(song, session, **{field: value})
@@ -1,7 +1,8 @@
 from PyQt6.QtGui import QUndoCommand
 from PyQt6.QtCore import QObject, pyqtSignal
-from models import Song, SongSession
+from models import Song, SongSession, SongCategory
 from data_handler import DataHandler
+from undo_history import COMMAND_OVERHEAD, estimate_size, BatchService
 import copy
 
 class AddSongCommand(QUndoCommand):
@@ -14,13 +15,20 @@ class AddSongCommand(QUndoCommand):
 
     def redo(self):
         self.data_handler.songs.append(self.song)
+        self.data_handler.index_song(self.song)
+        self.data_handler.notify_change("song", self.song.id, "added")
         self.update_signal.emit()
 
     def undo(self):
         if self.song in self.data_handler.songs:
             self.data_handler.songs.remove(self.song)
+            self.data_handler.unindex_song(self.song)
+            self.data_handler.notify_change("song", self.song.id, "removed")
             self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD # The song is the project's once added
+
 class DeleteSongCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, song: Song, update_signal):
         super().__init__()
@@ -35,9 +43,11 @@ class DeleteSongCommand(QUndoCommand):
         if self.song in self.data_handler.songs:
             self.index = self.data_handler.songs.index(self.song)
             self.data_handler.songs.remove(self.song)
+            self.data_handler.unindex_song(self.song)
+            self.data_handler.notify_change("song", self.song.id, "removed")
             
             # Remove related assignments
-            self.deleted_assignments = [a for a in self.data_handler.assignments if a.song_id == self.song.id]
+            self.deleted_assignments = self.data_handler.assignments.for_song(self.song.id)
             for a in self.deleted_assignments:
                 self.data_handler.assignments.remove(a)
                 
@@ -45,10 +55,16 @@ class DeleteSongCommand(QUndoCommand):
 
     def undo(self):
         self.data_handler.songs.insert(self.index, self.song)
+        self.data_handler.index_song(self.song)
+        self.data_handler.notify_change("song", self.song.id, "added")
         # Restore assignments
-        self.data_handler.assignments.extend(self.deleted_assignments)
+        for a in self.deleted_assignments:
+            self.data_handler.assignments.add(a)
         self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.song, self.deleted_assignments)
+
 class MoveSongCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, old_idx: int, new_idx: int, update_signal):
         super().__init__()
@@ -62,38 +78,183 @@ class MoveSongCommand(QUndoCommand):
         songs = self.data_handler.songs
         if 0 <= self.old_idx < len(songs) and 0 <= self.new_idx < len(songs):
             songs[self.old_idx], songs[self.new_idx] = songs[self.new_idx], songs[self.old_idx]
+            self.data_handler.notify_change("song", songs[self.old_idx].id, "moved")
+            self.data_handler.notify_change("song", songs[self.new_idx].id, "moved")
             self.update_signal.emit()
 
     def undo(self):
         # Swap back
         self.redo()
 
-class UpdateSongCommand(QUndoCommand):
-    def __init__(self, data_handler: DataHandler, old_song: Song, new_song: Song, update_signal):
+    def cost(self):
+        return COMMAND_OVERHEAD
+
+class SetSongFieldCommand(QUndoCommand):
+    """
+    Sets one field of a song (title, nickname, bpm, ...), keeping only the old and new value.
+    Reference URL edits are sent per keystroke, consecutive ones on the same song merge into one step.
+    """
+    def __init__(self, data_handler: DataHandler, song: Song, field: str, value, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.field = field
+        self.old_value = getattr(song, field)
+        self.new_value = value
+        self.update_signal = update_signal
+        self.setText(f"Update Song {song.title}")
+
+    def redo(self):
+        self._set(self.new_value)
+
+    def undo(self):
+        self._set(self.old_value)
+
+    def _set(self, value):
+        setattr(self.song, self.field, value)
+        self.data_handler.notify_change("song", self.song.id)
+        self.update_signal.emit()
+
+    def id(self):
+        # Released commands (see UndoHistory) have no fields left
+        return 1002 if not self.isObsolete() and self.field == "reference_url" else -1
+
+    def mergeWith(self, other):
+        if other.id() != self.id() or self.isObsolete() or other.song is not self.song:
+            return False
+        self.new_value = other.new_value
+        return True
+
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.old_value, self.new_value, shared=(self.new_value,))
+
+class AddSessionCommand(QUndoCommand):
+    def __init__(self, data_handler: DataHandler, song: Song, session: SongSession, update_signal, index: int = None):
         super().__init__()
         self.data_handler = data_handler
-        self.old_song = old_song
-        self.new_song = new_song
+        self.song = song
+        self.session = session
+        self.index = len(song.sessions) if index is None else index
         self.update_signal = update_signal
-        self.setText(f"Update Song {new_song.title}")
+        self.setText(f"Add Session {song.title}")
 
     def redo(self):
-        try:
-            if self.old_song in self.data_handler.songs:
-                idx = self.data_handler.songs.index(self.old_song)
-                self.data_handler.songs[idx] = self.new_song
-                self.update_signal.emit()
-        except ValueError:
-            pass
+        self.song.sessions.insert(self.index, self.session)
+        self.data_handler.index_session(self.song, self.session)
+        self.data_handler.notify_change("song", self.song.id)
+        self.update_signal.emit()
 
     def undo(self):
-        try:
-            if self.new_song in self.data_handler.songs:
-                idx = self.data_handler.songs.index(self.new_song)
-                self.data_handler.songs[idx] = self.old_song
-                self.update_signal.emit()
-        except ValueError:
-            pass
+        if self.session in self.song.sessions:
+            self.song.sessions.remove(self.session)
+            self.data_handler.unindex_session(self.song, self.session)
+            self.data_handler.notify_change("song", self.song.id)
+            self.update_signal.emit()
+
+    def cost(self):
+        return COMMAND_OVERHEAD # The session is the project's once added
+
+class RemoveSessionCommand(QUndoCommand):
+    # Assignments to the session stay, like they did when the whole song was replaced
+    def __init__(self, data_handler: DataHandler, song: Song, session: SongSession, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.session = session
+        self.index = 0
+        self.update_signal = update_signal
+        self.setText(f"Remove Session {song.title}")
+
+    def redo(self):
+        if self.session in self.song.sessions:
+            self.index = self.song.sessions.index(self.session)
+            self.song.sessions.remove(self.session)
+            self.data_handler.unindex_session(self.song, self.session)
+            self.data_handler.notify_change("song", self.song.id)
+            self.update_signal.emit()
+
+    def undo(self):
+        self.song.sessions.insert(self.index, self.session)
+        self.data_handler.index_session(self.song, self.session)
+        self.data_handler.notify_change("song", self.song.id)
+        self.update_signal.emit()
+
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.session)
+
+class UpdateSessionCommand(QUndoCommand):
+    """Sets fields of one session of a song, e.g. {"difficulty_param": "16"}."""
+    def __init__(self, data_handler: DataHandler, song: Song, session: SongSession, values: dict, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.session = session
+        self.new_values = values
+        self.old_values = {field: getattr(session, field) for field in values}
+        self.update_signal = update_signal
+        self.setText(f"Update Session {song.title}")
+
+    def redo(self):
+        self._set(self.new_values)
+
+    def undo(self):
+        self._set(self.old_values)
+
+    def _set(self, values):
+        for field, value in values.items():
+            setattr(self.session, field, value)
+        self.data_handler.notify_change("song", self.song.id)
+        self.update_signal.emit()
+
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.old_values, self.new_values, shared=self.new_values.values())
+
+class ChangeSongCategoryCommand(QUndoCommand):
+    """
+    Switches a song between vocal and instrumental: a vocal song gets a Vocal/Rap session in front,
+    an instrumental one loses its Vocal/Rap sessions. Keeps the sessions it removed, with their positions.
+    """
+    def __init__(self, data_handler: DataHandler, song: Song, category: str, vocal_id: str, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.old_category = song.category
+        self.new_category = category
+        self.update_signal = update_signal
+        self.added_session = None
+        self.removed_sessions = [] # (index, session), in ascending index order
+        if category == SongCategory.VOCAL.value:
+            self.added_session = SongSession(instrument_id=vocal_id, difficulty_param="A5")
+        else:
+            self.removed_sessions = [(i, s) for i, s in enumerate(song.sessions) if s.instrument_id == vocal_id]
+        self.setText(f"Update Song {song.title}")
+
+    def redo(self):
+        song = self.song
+        song.category = self.new_category
+        if self.added_session:
+            song.sessions.insert(0, self.added_session)
+            self.data_handler.index_session(song, self.added_session)
+        for _, session in self.removed_sessions:
+            song.sessions.remove(session)
+            self.data_handler.unindex_session(song, session)
+        self.data_handler.notify_change("song", song.id)
+        self.update_signal.emit()
+
+    def undo(self):
+        song = self.song
+        song.category = self.old_category
+        if self.added_session:
+            song.sessions.remove(self.added_session)
+            self.data_handler.unindex_session(song, self.added_session)
+        for index, session in self.removed_sessions:
+            song.sessions.insert(index, session)
+            self.data_handler.index_session(song, session)
+        self.data_handler.notify_change("song", song.id)
+        self.update_signal.emit()
+
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.added_session, self.removed_sessions, shared=(self.added_session,))
 
 class ResetConcertCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, update_signal):
@@ -113,7 +274,7 @@ class ResetConcertCommand(QUndoCommand):
         from models import SongCategory, SongSession # Import here to avoid circular imports
 
         # Create default vocal song
-        vocal_inst = next((i for i in self.data_handler.instruments if i.name == "보컬/랩"), None)
+        vocal_inst = self.data_handler.get_instrument_by_name("보컬/랩")
         new_first = Song(title="새 곡", bpm=100, category=SongCategory.VOCAL.value)
         if vocal_inst:
             new_first.sessions.append(SongSession(instrument_id=vocal_inst.id, difficulty_param="A5"))
@@ -123,21 +284,30 @@ class ResetConcertCommand(QUndoCommand):
             new_first.id = self.data_handler.songs[0].id
             
         self.data_handler.songs = [new_first]
-        self.data_handler.assignments = []
+        self.data_handler.assignments.clear()
         
         # Reset equipment required_count
         for eq in self.data_handler.equipments:
             eq.required_count = 0
             
+        self.data_handler.rebuild_index()
+        self.data_handler.notify_change("song", action="reset")
+        self.data_handler.notify_change("equipment", action="reset")
         self.update_signal.emit()
 
     def undo(self):
         self.data_handler.songs = self.backup_songs
-        self.data_handler.assignments = self.backup_assignments
+        self.data_handler.assignments.replace(self.backup_assignments)
         self.data_handler.equipments = self.backup_equipments
+        self.data_handler.rebuild_index()
+        self.data_handler.notify_change("song", action="reset")
+        self.data_handler.notify_change("equipment", action="reset")
         self.update_signal.emit()
 
-class SongService(QObject):
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.backup_songs, self.backup_assignments, self.backup_equipments)
+
+class SongService(QObject, BatchService):
     data_changed = pyqtSignal()
 
     def __init__(self, data_handler: DataHandler, undo_stack):
@@ -165,16 +335,35 @@ class SongService(QObject):
              cmd = MoveSongCommand(self.data_handler, idx, new_idx, self.data_changed)
              self.undo_stack.push(cmd)
 
-    def update_song(self, old_song: Song, new_song: Song):
-        cmd = UpdateSongCommand(self.data_handler, old_song, new_song, self.data_changed)
+    def set_song_field(self, song: Song, field: str, value):
+        if getattr(song, field) == value:
+            return
+        cmd = SetSongFieldCommand(self.data_handler, song, field, value, self.data_changed)
+        self.undo_stack.push(cmd)
+
+    def change_category(self, song: Song, category: str):
+        if song.category == category:
+            return
+        vocal_inst = self.data_handler.get_instrument_by_name("보컬/랩")
+        vocal_id = vocal_inst.id if vocal_inst else "UNKNOWN"
+        cmd = ChangeSongCategoryCommand(self.data_handler, song, category, vocal_id, self.data_changed)
+        self.undo_stack.push(cmd)
+
+    def add_session(self, song: Song, session: SongSession):
+        cmd = AddSessionCommand(self.data_handler, song, session, self.data_changed)
+        self.undo_stack.push(cmd)
+
+    def remove_session(self, song: Song, session: SongSession):
+        cmd = RemoveSessionCommand(self.data_handler, song, session, self.data_changed)
+        self.undo_stack.push(cmd)
+
+    def update_session(self, song: Song, session: SongSession, **values):
+        if all(getattr(session, field) == value for field, value in values.items()):
+            return
+        cmd = UpdateSessionCommand(self.data_handler, song, session, values, self.data_changed)
         self.undo_stack.push(cmd)
         
     def reset_concert(self):
          cmd = ResetConcertCommand(self.data_handler, self.data_changed)
          self.undo_stack.push(cmd)
-         
-    # Session management inside song is treated as Song Update for simplicity now, 
-    # but ideally should have granular commands if we want undo for just adding a session.
-    # For now, I will assume the Controller constructs the new Song object with sessions modified 
-    # and calls update_song.
 
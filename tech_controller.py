@@ -8,25 +8,27 @@ from PyQt6.QtCore import Qt, QSizeF, QObject, QEvent
 from PyQt6.QtGui import QPdfWriter, QPainter, QPageSize, QPageLayout, QColor, QFont, QTextDocument, QPixmap, QTextCursor, QTextCharFormat
 from dialogs import CueSheetEditDialog, SoundDesignDialog
 from models import CueSection, Equipment, InstrumentCategory
-import copy
+from refresh_scheduler import RefreshScheduler, connect_refresh
 
 class NoScrollSpinBox(QSpinBox):
     def wheelEvent(self, event):
         event.ignore()
 
 class TechController(QObject):
-    def __init__(self, ui: TechWidget, service: TechService, song_service: SongService):
+    def __init__(self, ui: TechWidget, service: TechService, song_service: SongService, scheduler: RefreshScheduler = None):
         super().__init__()
         self.ui = ui
         self.service = service
         self.song_service = song_service
+        self.scheduler = scheduler # Refreshes run directly on each change without one
         
         self.connect_signals()
         self.refresh_ui()
 
     def connect_signals(self):
-        self.service.data_changed.connect(self.refresh_ui)
-        self.song_service.data_changed.connect(self.refresh_songs)
+        connect_refresh(self.service.data_changed, self.refresh_ui, self.scheduler)
+        self.service.cue_changed.connect(self.on_cue_changed)
+        connect_refresh(self.song_service.data_changed, self.refresh_songs, self.scheduler)
         
         # Cue Sheet Signals
         self.ui.song_list.itemSelectionChanged.connect(self.on_song_selected)
@@ -158,18 +160,25 @@ class TechController(QObject):
             return
             
         song_id = item.data(Qt.ItemDataRole.UserRole)
-        song = next((s for s in self.service.data_handler.songs if s.id == song_id), None)
+        song = self.service.data_handler.get_song(song_id)
         if not song: return
         
         self.refresh_cue_table(song)
 
 
+    def on_cue_changed(self, song_id):
+        item = self.ui.song_list.currentItem()
+        if item and item.data(Qt.ItemDataRole.UserRole) == song_id:
+            song = self.service.data_handler.get_song(song_id)
+            if song:
+                self.refresh_cue_table(song)
+
     def add_cue_section(self):
         item = self.ui.song_list.currentItem()
         if not item: return
         
         song_id = item.data(Qt.ItemDataRole.UserRole)
-        song = next((s for s in self.service.data_handler.songs if s.id == song_id), None)
+        song = self.service.data_handler.get_song(song_id)
         if not song: return
 
         # Determine target section based on selection
@@ -190,7 +199,7 @@ class TechController(QObject):
         # Open Dialog (target_section can be None if nothing selected)
         dlg = CueSheetEditDialog(self.ui, song, section_data=target_section, service=self.service)
         if dlg.exec():
-            # Dialog returns (section_name, entry_data_dict)
+            # Dialog returns (section_name, CueEntry)
             result = dlg.get_data()
             if not result: return
             
@@ -201,7 +210,7 @@ class TechController(QObject):
         item = self.ui.song_list.currentItem()
         if not item: return
         song_id = item.data(Qt.ItemDataRole.UserRole)
-        song = next((s for s in self.service.data_handler.songs if s.id == song_id), None)
+        song = self.service.data_handler.get_song(song_id)
         if not song: return
 
         table_items = self.ui.cue_table.selectedItems()
@@ -236,11 +245,8 @@ class TechController(QObject):
         target_section = next((s for s in song.cue_sections if s.id == sec_id), None)
         if not target_section: return
         
-        import json
-        note_json = target_section.instrument_notes.get(entry_id)
-        if not note_json: return
-        
-        existing_data = json.loads(note_json)
+        existing = next((e for e in target_section.entries if e.id == entry_id), None)
+        if not existing: return
         
         # Open Dialog in "Edit Mode" -> Pre-fill data
         # CueSheetEditDialog supports `section_data`, but does it support filling fields?
@@ -260,78 +266,37 @@ class TechController(QObject):
             dlg.on_section_selected(items[0])
         
         # Fill input fields
-        dlg.input_inst_name.setText(existing_data.get('instrument_name', ''))
+        dlg.input_inst_name.setText(existing.instrument_name)
         
-        if existing_data.get('use_effect'):
+        if existing.use_effect:
             dlg.cb_effect.setChecked(True)
-            dlg.input_effect_name.setText(existing_data.get('effect_name', ''))
-            lvl = existing_data.get('effect_level')
+            dlg.input_effect_name.setText(existing.effect_name)
+            lvl = existing.effect_level
             if lvl:
                 btn = dlg.group_level.button(lvl)
                 if btn: btn.setChecked(True)
         else:
             dlg.cb_effect.setChecked(False)
             
-        dlg.edit_memo.setPlainText(existing_data.get('memo', ''))
+        dlg.edit_memo.setPlainText(existing.memo)
 
         if dlg.exec():
             result = dlg.get_data()
             if not result: return
             
-            section_name, entry_data = result
-            
-            # Update Logic
-            new_song = copy.deepcopy(song)
+            section_name, entry = result
+            entry.id = entry_id
             
             # If section name changed, we might need to move it to another section?
             # "섹션 내 항목을 선택한 상태에서만 해당 항목의 큐시트 편집" implies modifying THAT entry.
-            # If user changes section name in combo, it effectively moves it to that section.
-            
-            target_sec_new = next((s for s in new_song.cue_sections if s.name == section_name), None)
-            if not target_sec_new:
-                 # Create new section if not exists? Or revert to old?
-                 # Should exist as per dialog logic.
-                 target_sec_new = CueSection(name=section_name)
-                 new_song.cue_sections.append(target_sec_new)
-            
-            # If section changed, remove from old, add to new.
-            # If same section, just update.
-            
-            old_section = next((s for s in new_song.cue_sections if s.id == sec_id), None)
-            
-            if old_section.id == target_sec_new.id:
-                # Same section, update in place (preserve order)
-                # Python 3.7+ dicts preserve insertion order. 
-                # We just update value.
-                old_section.instrument_notes[entry_id] = json.dumps(entry_data, ensure_ascii=False)
-            else:
-                # Move to new section
-                if entry_id in old_section.instrument_notes:
-                    del old_section.instrument_notes[entry_id]
-                
-                # Add to new section (at end)
-                # Generate new ID or keep old? New ID is safer to avoid conflicts?
-                # Keep old ID is fine if unique across song? UUID is unique globally.
-                target_sec_new.instrument_notes[entry_id] = json.dumps(entry_data, ensure_ascii=False)
-                
-            self.song_service.update_song(song, new_song)
+            # If user changes section name in combo, it effectively moves it to that section (at the end).
+            self.service.update_cue_entry(song, target_section, existing, section_name, entry)
 
     def add_cue_section_logic(self, result, song):
         if not result: return
-        section_name, entry_data = result
-        new_song = copy.deepcopy(song)
-        target_section = next((s for s in new_song.cue_sections if s.name == section_name), None)
-        
-        # Should not happen given we passed existing section, but for safety
-        if not target_section:
-            target_section = CueSection(name=section_name)
-            new_song.cue_sections.append(target_section)
-        
-        import uuid
-        import json
-        entry_id = str(uuid.uuid4())
-        target_section.instrument_notes[entry_id] = json.dumps(entry_data, ensure_ascii=False)
-        self.song_service.update_song(song, new_song)
+        section_name, entry = result
+        # Creates the section if the song has none of that name
+        self.service.add_cue_entry(song, section_name, entry)
 
     def on_table_double_clicked(self, item):
         self.edit_cue_section()
@@ -340,7 +305,7 @@ class TechController(QObject):
         item = self.ui.song_list.currentItem()
         if not item: return
         song_id = item.data(Qt.ItemDataRole.UserRole)
-        song = next((s for s in self.service.data_handler.songs if s.id == song_id), None)
+        song = self.service.data_handler.get_song(song_id)
         if not song: return
 
         table_items = self.ui.cue_table.selectedItems()
@@ -355,8 +320,6 @@ class TechController(QObject):
         inst_item = self.ui.cue_table.item(row, 1)
         entry_info = inst_item.data(Qt.ItemDataRole.UserRole)
         
-        new_song = copy.deepcopy(song)
-        
         if entry_info:
             # Entry Selected
             sec_id, entry_id = entry_info
@@ -365,10 +328,10 @@ class TechController(QObject):
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if reply != QMessageBox.StandardButton.Yes: return
             
-            target_section = next((s for s in new_song.cue_sections if s.id == sec_id), None)
-            if target_section and entry_id in target_section.instrument_notes:
-                del target_section.instrument_notes[entry_id]
-                self.song_service.update_song(song, new_song)
+            target_section = next((s for s in song.cue_sections if s.id == sec_id), None)
+            target_entry = next((e for e in target_section.entries if e.id == entry_id), None) if target_section else None
+            if target_entry:
+                self.service.delete_cue_entry(song, target_section, target_entry)
                 
         else:
             # Section Selected (No entry info in Col 1 means it's a section row with no entries OR user selected the Section cell of a spanned row?)
@@ -421,8 +384,9 @@ class TechController(QObject):
                 if reply != QMessageBox.StandardButton.Yes: return
                 
                 # Delete section from song
-                new_song.cue_sections = [s for s in new_song.cue_sections if s.id != section_data.id]
-                self.song_service.update_song(song, new_song)
+                target_section = next((s for s in song.cue_sections if s.id == section_data.id), None)
+                if target_section:
+                    self.service.delete_cue_section(song, target_section)
                 
             else:
                 # Entry Delete (User clicked Col 1,2,3)
@@ -435,18 +399,10 @@ class TechController(QObject):
 
     def refresh_cue_table(self, song):
         self.ui.cue_table.setRowCount(0)
-        import json
         
         row_idx = 0
         for section in song.cue_sections:
-            entries = []
-            # Collect entries
-            for entry_id, note_json in section.instrument_notes.items():
-                try:
-                    data = json.loads(note_json)
-                    entries.append((entry_id, data))
-                except:
-                    continue
+            entries = section.entries
             
             if not entries:
                 self.ui.cue_table.insertRow(row_idx)
@@ -467,7 +423,7 @@ class TechController(QObject):
 
             # If entries exist
             start_row = row_idx
-            for entry_id, data in entries:
+            for entry in entries:
                 self.ui.cue_table.insertRow(row_idx)
                 
                 # Section Name (will span later)
@@ -477,20 +433,18 @@ class TechController(QObject):
                 self.ui.cue_table.setItem(row_idx, 0, sec_item)
                 
                 # Instrument
-                inst_name = data.get('instrument_name', '')
-                inst_item = QTableWidgetItem(inst_name)
-                inst_item.setData(Qt.ItemDataRole.UserRole, (section.id, entry_id)) # Store (sec_id, entry_id)
+                inst_item = QTableWidgetItem(entry.instrument_name)
+                inst_item.setData(Qt.ItemDataRole.UserRole, (section.id, entry.id)) # Store (sec_id, entry_id)
                 inst_item.setFlags(inst_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
                 self.ui.cue_table.setItem(row_idx, 1, inst_item)
                 
                 # Effect
                 effect_str = ""
-                if data.get('use_effect'):
-                    effect_name = data.get('effect_name')
-                    effect_str = effect_name if effect_name else "이펙트"
+                if entry.use_effect:
+                    effect_str = entry.effect_name if entry.effect_name else "이펙트"
                     
                     # Level?
-                    lvl = data.get('effect_level')
+                    lvl = entry.effect_level
                     levels = ["연하게", "살짝 연하게", "적당히", "살짝 진하게", "진하게"]
                     if lvl and 1 <= lvl <= 5:
                         effect_str += f" {levels[lvl-1]}"
@@ -500,8 +454,7 @@ class TechController(QObject):
                 self.ui.cue_table.setItem(row_idx, 2, eff_item)
                 
                 # Memo
-                memo = data.get('memo', '')
-                memo_item = QTableWidgetItem(memo)
+                memo_item = QTableWidgetItem(entry.memo)
                 memo_item.setFlags(memo_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
                 self.ui.cue_table.setItem(row_idx, 3, memo_item)
                 
@@ -523,7 +476,7 @@ class TechController(QObject):
         item = self.ui.song_list.currentItem()
         if not item: return
         song_id = item.data(Qt.ItemDataRole.UserRole)
-        song = next((s for s in self.service.data_handler.songs if s.id == song_id), None)
+        song = self.service.data_handler.get_song(song_id)
         
         table_items = self.ui.cue_table.selectedItems()
         if not table_items: return
@@ -532,23 +485,20 @@ class TechController(QObject):
         col = self.ui.cue_table.column(first_item)
         row = self.ui.cue_table.row(first_item)
         
-        new_song = copy.deepcopy(song)
-        
         if col == 0:
             # Section Move
             sec_item = self.ui.cue_table.item(row, 0)
             section_data = sec_item.data(Qt.ItemDataRole.UserRole)
             
-            idx = next((i for i, s in enumerate(new_song.cue_sections) if s.id == section_data.id), -1)
+            idx = next((i for i, s in enumerate(song.cue_sections) if s.id == section_data.id), -1)
             if idx == -1: return
             
             new_idx = idx + direction
-            if 0 <= new_idx < len(new_song.cue_sections):
-                new_song.cue_sections[idx], new_song.cue_sections[new_idx] = new_song.cue_sections[new_idx], new_song.cue_sections[idx]
-                self.song_service.update_song(song, new_song)
+            if 0 <= new_idx < len(song.cue_sections):
+                self.service.move_cue_section(song, idx, new_idx)
                 
                 # Restore selection?
-                # Ideally yes, but refresh_ui clears it.
+                # Ideally yes, but refresh_cue_table clears it.
         else:
             # Entry Move
             inst_item = self.ui.cue_table.item(row, 1)
@@ -556,27 +506,17 @@ class TechController(QObject):
             if not entry_info: return
             
             sec_id, entry_id = entry_info
-            target_section = next((s for s in new_song.cue_sections if s.id == sec_id), None)
+            target_section = next((s for s in song.cue_sections if s.id == sec_id), None)
             if not target_section: return
             
-            # Reorder instrument_notes
-            # Dicts are ordered in Python 3.7+.
-            keys = list(target_section.instrument_notes.keys())
-            try:
-                idx = keys.index(entry_id)
-            except ValueError:
-                return
+            # Reorder entries
+            entries = target_section.entries
+            idx = next((i for i, e in enumerate(entries) if e.id == entry_id), -1)
+            if idx == -1: return
                 
             new_idx = idx + direction
-            if 0 <= new_idx < len(keys):
-                # Swap keys
-                keys[idx], keys[new_idx] = keys[new_idx], keys[idx]
-                
-                # Reconstruct dict
-                new_notes = {k: target_section.instrument_notes[k] for k in keys}
-                target_section.instrument_notes = new_notes
-                
-                self.song_service.update_song(song, new_song)
+            if 0 <= new_idx < len(entries):
+                self.service.move_cue_entry(song, target_section, idx, new_idx)
 
     # Equipment Methods
     def add_equipment(self):
@@ -783,7 +723,7 @@ class TechController(QObject):
             for song in self.service.data_handler.songs:
                 current_counts = {}
                 for sess in song.sessions:
-                    inst = next((i for i in self.service.data_handler.instruments if i.id == sess.instrument_id), None)
+                    inst = self.service.data_handler.get_instrument(sess.instrument_id)
                     if inst:
                         current_counts[inst.name] = current_counts.get(inst.name, 0) + 1
                 
@@ -803,7 +743,7 @@ class TechController(QObject):
             summary_items = []
             for name, count in max_inst_usage.items():
                 if count > 0:
-                    inst_obj = next((i for i in self.service.data_handler.instruments if i.name == name), None)
+                    inst_obj = self.service.data_handler.get_instrument_by_name(name)
                     cat_name = inst_obj.category if inst_obj else InstrumentCategory.ETC.value
                     sort_idx = category_order.get(cat_name, 99)
                     summary_items.append((sort_idx, name, count))
@@ -841,7 +781,7 @@ class TechController(QObject):
                 
                 inst_list = []
                 for sess in song.sessions:
-                    inst = next((i for i in self.service.data_handler.instruments if i.id == sess.instrument_id), None)
+                    inst = self.service.data_handler.get_instrument(sess.instrument_id)
                     if inst:
                         inst_list.append(inst.name)
                 
@@ -937,7 +877,7 @@ class TechController(QObject):
                 song_method_counts = {}
                 song_inst_counts = {}
                 for sess in song.sessions:
-                    inst = next((i for i in self.service.data_handler.instruments if i.id == sess.instrument_id), None)
+                    inst = self.service.data_handler.get_instrument(sess.instrument_id)
                     if inst:
                         song_inst_counts[inst.name] = song_inst_counts.get(inst.name, 0) + 1
                         
@@ -1138,8 +1078,6 @@ class TechController(QObject):
             font.setBold(False)
             painter.setFont(font)
             
-            import json
-            
             # Iterate Songs - each song starts on a new page
             for idx, song in enumerate(self.service.data_handler.songs):
                 # Each song starts a new page (except first if memo fits)
@@ -1155,7 +1093,7 @@ class TechController(QObject):
                 # Collect instruments for this song
                 song_inst_list = []
                 for sess in song.sessions:
-                    inst = next((i for i in self.service.data_handler.instruments if i.id == sess.instrument_id), None)
+                    inst = self.service.data_handler.get_instrument(sess.instrument_id)
                     if inst:
                         song_inst_list.append(inst.name)
                 inst_str = ", ".join(song_inst_list)
@@ -1230,13 +1168,7 @@ class TechController(QObject):
                 painter.setFont(font)
                 
                 for sec_idx, section in enumerate(song.cue_sections):
-                    entries = []
-                    for note_json in section.instrument_notes.values():
-                        try:
-                            entries.append(json.loads(note_json))
-                        except:
-                            continue
-                            
+                    entries = section.entries
                     if not entries:
                         continue
 
@@ -1245,13 +1177,13 @@ class TechController(QObject):
                     
                     section_start_y = y
 
-                    for entry_idx, data in enumerate(entries):
-                        inst_name = data.get('instrument_name', '')
+                    for entry_idx, entry in enumerate(entries):
+                        inst_name = entry.instrument_name
                         
                         effect_str = ""
-                        if data.get('use_effect', False):
-                            effect_name = data.get('effect_name', '')
-                            effect_level = data.get('effect_level', 0)
+                        if entry.use_effect:
+                            effect_name = entry.effect_name
+                            effect_level = entry.effect_level
                             level_symbols = ["①", "②", "③", "④", "⑤"]
                             if effect_level and 1 <= effect_level <= 5:
                                 level_display = []
@@ -1264,7 +1196,7 @@ class TechController(QObject):
                             else:
                                 effect_str = effect_name
                             
-                        memo = data.get('memo', '')
+                        memo = entry.memo
                         
                         # Note: we only calculate height for 2~4 cols, col 1 is merged visually
                         texts = ["", inst_name, effect_str, memo]
@@ -1,7 +1,8 @@
 from PyQt6.QtGui import QUndoCommand
 from PyQt6.QtCore import QObject, pyqtSignal
-from models import Equipment, ConnectionType, InstrumentCategory
+from models import Equipment, ConnectionType, InstrumentCategory, Song, CueSection, CueEntry
 from data_handler import DataHandler
+from undo_history import COMMAND_OVERHEAD, estimate_size, BatchService
 
 class AddEquipmentCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, eq: Equipment, update_signal):
@@ -13,13 +14,18 @@ class AddEquipmentCommand(QUndoCommand):
 
     def redo(self):
         self.data_handler.equipments.append(self.eq)
+        self.data_handler.notify_change("equipment", self.eq.id, "added")
         self.update_signal.emit()
 
     def undo(self):
         if self.eq in self.data_handler.equipments:
             self.data_handler.equipments.remove(self.eq)
+            self.data_handler.notify_change("equipment", self.eq.id, "removed")
             self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD # The equipment is the project's once added
+
 class DeleteEquipmentCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, eq: Equipment, update_signal):
         super().__init__()
@@ -33,12 +39,17 @@ class DeleteEquipmentCommand(QUndoCommand):
         if self.eq in self.data_handler.equipments:
             self.index = self.data_handler.equipments.index(self.eq)
             self.data_handler.equipments.remove(self.eq)
+            self.data_handler.notify_change("equipment", self.eq.id, "removed")
             self.update_signal.emit()
 
     def undo(self):
         self.data_handler.equipments.insert(self.index, self.eq)
+        self.data_handler.notify_change("equipment", self.eq.id, "added")
         self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.eq)
+
 class UpdateEquipmentCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, eq_id: str, field: str, new_val, update_signal):
         super().__init__()
@@ -58,13 +69,18 @@ class UpdateEquipmentCommand(QUndoCommand):
     def redo(self):
         if self.target_eq:
             setattr(self.target_eq, self.field, self.new_val)
+            self.data_handler.notify_change("equipment", self.eq_id)
             self.update_signal.emit()
 
     def undo(self):
         if self.target_eq:
             setattr(self.target_eq, self.field, self.old_val)
+            self.data_handler.notify_change("equipment", self.eq_id)
             self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.old_val, self.new_val, shared=(self.new_val,))
+
 class BatchUpdateRequirementsCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, new_requirements: dict, update_signal):
         super().__init__()
@@ -84,14 +100,19 @@ class BatchUpdateRequirementsCommand(QUndoCommand):
                 eq.required_count = self.new_requirements[eq.id]
             else:
                 eq.required_count = 0 # Reset others to 0? Or keep? Prompt says "Start from 0"
+        self.data_handler.notify_change("equipment")
         self.update_signal.emit()
 
     def undo(self):
         for eq in self.data_handler.equipments:
             if eq.id in self.old_requirements:
                 eq.required_count = self.old_requirements[eq.id]
+        self.data_handler.notify_change("equipment")
         self.update_signal.emit()
 
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.old_requirements, self.new_requirements)
+
 class UpdatePerformanceMemoCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, new_memo: str, update_signal):
         super().__init__()
@@ -103,23 +124,28 @@ class UpdatePerformanceMemoCommand(QUndoCommand):
 
     def redo(self):
         self.data_handler.performance_memo = self.new_memo
+        self.data_handler.notify_change("memo")
         # Memo update usually doesn't need to refresh entire UI, but consistent with others
         # self.update_signal.emit() 
 
     def undo(self):
         self.data_handler.performance_memo = self.old_memo
+        self.data_handler.notify_change("memo")
         self.update_signal.emit() # Signal needed to update UI text box
 
     def id(self):
         return 1001 # Unique ID for this command type
 
     def mergeWith(self, other):
-        if other.id() != self.id():
+        if other.id() != self.id() or self.isObsolete():
             return False
         # Update new value, keep original old value
         self.new_memo = other.new_memo
         return True
 
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.old_memo, self.new_memo, shared=(self.new_memo,))
+
 class UpdateSoundDesignCommand(QUndoCommand):
     def __init__(self, data_handler: DataHandler, key: str, value: int, update_signal):
         super().__init__()
@@ -132,6 +158,7 @@ class UpdateSoundDesignCommand(QUndoCommand):
 
     def redo(self):
         self.data_handler.sound_design_settings[self.key] = self.new_value
+        self.data_handler.notify_change("settings", self.key)
         # self.update_signal.emit() # Optional, radio buttons are already updated by UI
 
     def undo(self):
@@ -140,16 +167,162 @@ class UpdateSoundDesignCommand(QUndoCommand):
                 del self.data_handler.sound_design_settings[self.key]
         else:
             self.data_handler.sound_design_settings[self.key] = self.old_value
+        self.data_handler.notify_change("settings", self.key)
         self.update_signal.emit() # Need to update UI
 
-class TechService(QObject):
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.key)
+
+# Cue sheet commands. They edit one song's cue sections in place and keep only what they replace;
+# update_signal is TechService.cue_changed, emitted with the song id.
+
+class AddCueEntryCommand(QUndoCommand):
+    """Appends an entry to the song's section of that name, creating the section if it has none."""
+    def __init__(self, data_handler: DataHandler, song: Song, section_name: str, entry: CueEntry, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.entry = entry
+        self.update_signal = update_signal
+        self.section = next((s for s in song.cue_sections if s.name == section_name), None)
+        self.new_section = self.section is None
+        if self.new_section:
+            self.section = CueSection(name=section_name)
+        self.setText(f"Add Cue {song.title}")
+
+    def redo(self):
+        if self.new_section:
+            self.song.cue_sections.append(self.section)
+        self.section.entries.append(self.entry)
+        self.data_handler.notify_change("cue", self.song.id)
+        self.update_signal.emit(self.song.id)
+
+    def undo(self):
+        self.section.entries.remove(self.entry)
+        if self.new_section:
+            self.song.cue_sections.remove(self.section)
+        self.data_handler.notify_change("cue", self.song.id)
+        self.update_signal.emit(self.song.id)
+
+    def cost(self):
+        return COMMAND_OVERHEAD # The entry (and new section) are the project's once added
+
+class UpdateCueEntryCommand(QUndoCommand):
+    """
+    Replaces an entry with an edited one. In the same section it keeps its place; moved to another
+    section (created if the song has none of that name) it goes to the end.
+    """
+    def __init__(self, data_handler: DataHandler, song: Song, section: CueSection, old_entry: CueEntry,
+                 section_name: str, new_entry: CueEntry, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.old_section = section
+        self.old_entry = old_entry
+        self.new_entry = new_entry
+        self.update_signal = update_signal
+        self.old_index = 0
+        self.new_section = next((s for s in song.cue_sections if s.name == section_name), None)
+        self.created_section = self.new_section is None
+        if self.created_section:
+            self.new_section = CueSection(name=section_name)
+        self.setText(f"Update Cue {song.title}")
+
+    def redo(self):
+        self.old_index = self.old_section.entries.index(self.old_entry)
+        if self.new_section is self.old_section:
+            self.old_section.entries[self.old_index] = self.new_entry
+        else:
+            del self.old_section.entries[self.old_index]
+            if self.created_section:
+                self.song.cue_sections.append(self.new_section)
+            self.new_section.entries.append(self.new_entry)
+        self.data_handler.notify_change("cue", self.song.id)
+        self.update_signal.emit(self.song.id)
+
+    def undo(self):
+        if self.new_section is self.old_section:
+            self.old_section.entries[self.old_index] = self.old_entry
+        else:
+            self.new_section.entries.remove(self.new_entry)
+            if self.created_section:
+                self.song.cue_sections.remove(self.new_section)
+            self.old_section.entries.insert(self.old_index, self.old_entry)
+        self.data_handler.notify_change("cue", self.song.id)
+        self.update_signal.emit(self.song.id)
+
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.old_entry) # The new entry (and section) are the project's
+
+class RemoveCueItemCommand(QUndoCommand):
+    """Removes an entry from its section, or a section from the song (items is section.entries or song.cue_sections)."""
+    def __init__(self, data_handler: DataHandler, song: Song, items: list, item, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.items = items
+        self.item = item
+        self.index = 0
+        self.update_signal = update_signal
+        self.setText(f"Delete Cue {song.title}")
+
+    def redo(self):
+        if self.item in self.items:
+            self.index = self.items.index(self.item)
+            self.items.remove(self.item)
+            self.data_handler.notify_change("cue", self.song.id)
+            self.update_signal.emit(self.song.id)
+
+    def undo(self):
+        self.items.insert(self.index, self.item)
+        self.data_handler.notify_change("cue", self.song.id)
+        self.update_signal.emit(self.song.id)
+
+    def cost(self):
+        return COMMAND_OVERHEAD + estimate_size(self.item)
+
+class MoveCueItemCommand(QUndoCommand):
+    """Swaps two neighbouring entries of a section, or two sections of a song."""
+    def __init__(self, data_handler: DataHandler, song: Song, items: list, old_idx: int, new_idx: int, update_signal):
+        super().__init__()
+        self.data_handler = data_handler
+        self.song = song
+        self.items = items
+        self.old_idx = old_idx
+        self.new_idx = new_idx
+        self.update_signal = update_signal
+        self.setText(f"Move Cue {song.title}")
+
+    def redo(self):
+        items = self.items
+        if 0 <= self.old_idx < len(items) and 0 <= self.new_idx < len(items):
+            items[self.old_idx], items[self.new_idx] = items[self.new_idx], items[self.old_idx]
+            self.data_handler.notify_change("cue", self.song.id)
+            self.update_signal.emit(self.song.id)
+
+    def undo(self):
+        # Swap back
+        self.redo()
+
+    def cost(self):
+        return COMMAND_OVERHEAD
+
+CUE_COMMANDS = (AddCueEntryCommand, UpdateCueEntryCommand, RemoveCueItemCommand, MoveCueItemCommand)
+
+class TechService(QObject, BatchService):
     data_changed = pyqtSignal()
+    cue_changed = pyqtSignal(str) # song id
     
     def __init__(self, data_handler: DataHandler, undo_stack):
         super().__init__()
         self.data_handler = data_handler
         self.undo_stack = undo_stack
 
+    def notify_batch(self, commands: list):
+        self.data_changed.emit()
+        for song_id in dict.fromkeys(cmd.song.id for cmd in commands if isinstance(cmd, CUE_COMMANDS)):
+            self.cue_changed.emit(song_id)
+
     def add_equipment(self, name: str):
         eq = Equipment(name=name)
         cmd = AddEquipmentCommand(self.data_handler, eq, self.data_changed)
@@ -173,6 +346,31 @@ class TechService(QObject):
         cmd = UpdateSoundDesignCommand(self.data_handler, key, value, self.data_changed)
         self.undo_stack.push(cmd)
 
+    # Cue Sheet
+    def add_cue_entry(self, song: Song, section_name: str, entry: CueEntry):
+        cmd = AddCueEntryCommand(self.data_handler, song, section_name, entry, self.cue_changed)
+        self.undo_stack.push(cmd)
+
+    def update_cue_entry(self, song: Song, section: CueSection, old_entry: CueEntry, section_name: str, new_entry: CueEntry):
+        cmd = UpdateCueEntryCommand(self.data_handler, song, section, old_entry, section_name, new_entry, self.cue_changed)
+        self.undo_stack.push(cmd)
+
+    def delete_cue_entry(self, song: Song, section: CueSection, entry: CueEntry):
+        cmd = RemoveCueItemCommand(self.data_handler, song, section.entries, entry, self.cue_changed)
+        self.undo_stack.push(cmd)
+
+    def delete_cue_section(self, song: Song, section: CueSection):
+        cmd = RemoveCueItemCommand(self.data_handler, song, song.cue_sections, section, self.cue_changed)
+        self.undo_stack.push(cmd)
+
+    def move_cue_entry(self, song: Song, section: CueSection, old_idx: int, new_idx: int):
+        cmd = MoveCueItemCommand(self.data_handler, song, section.entries, old_idx, new_idx, self.cue_changed)
+        self.undo_stack.push(cmd)
+
+    def move_cue_section(self, song: Song, old_idx: int, new_idx: int):
+        cmd = MoveCueItemCommand(self.data_handler, song, song.cue_sections, old_idx, new_idx, self.cue_changed)
+        self.undo_stack.push(cmd)
+
     def get_calculated_requirements(self, settings: dict):
         """
         Calculates equipment requirements using per-song-max approach.
@@ -201,7 +399,7 @@ class TechService(QObject):
             song_inst_counts = {}  # inst_name -> count in this song
 
             for session in song.sessions:
-                inst = next((i for i in self.data_handler.instruments if i.id == session.instrument_id), None)
+                inst = self.data_handler.get_instrument(session.instrument_id)
                 if not inst: continue
                 song_inst_counts[inst.name] = song_inst_counts.get(inst.name, 0) + 1
                 inst_songs_map.setdefault(inst.name, set()).add(song.title)
@@ -0,0 +1,140 @@
+import pytest
+
+from sample_project import build_project
+from data_handler import AssignmentStore
+from models import Grade, SessionAssignment
+from undo_history import UndoHistory
+from profile_service import ProfileService
+
+def check_indexes(store: AssignmentStore):
+    """Every index agrees with the records the store iterates, with no empty buckets left behind."""
+    records = list(store)
+    by_slot = {(a.song_id, a.session_id): a for a in records}
+    assert len(by_slot) == len(records) == len(store)
+    assert store.by_slot == by_slot
+
+    by_member, by_song = {}, {}
+    for slot, a in by_slot.items():
+        if a.member_id:
+            by_member.setdefault(a.member_id, {})[slot] = a
+        by_song.setdefault(a.song_id, {})[a.session_id] = a
+    assert store.by_member == by_member
+    assert store.by_song == by_song
+    for slot, a in by_slot.items():
+        assert store.get(*slot) is a
+        assert a in store
+        assert a in store.for_song(a.song_id)
+        assert (a in store.for_member(a.member_id)) == bool(a.member_id)
+
+def record(song, session, member=None, ignore=False):
+    return SessionAssignment(song_id=song, session_id=session, member_id=member, ignore_warnings=ignore)
+
+@pytest.fixture
+def store():
+    store = AssignmentStore([record("s1", "a", "m1"), record("s1", "b", "m2"), record("s2", "a", "m1")])
+    store.events = []
+    store.on_change = lambda slot, action: store.events.append((slot, action))
+    check_indexes(store)
+    return store
+
+def test_add_and_remove(store):
+    a = record("s3", "a", "m3")
+    store.add(a)
+    check_indexes(store)
+    store.remove(a)
+    check_indexes(store)
+    assert "m3" not in store.by_member and "s3" not in store.by_song
+    assert store.events == [(("s3", "a"), "added"), (("s3", "a"), "removed")]
+
+def test_add_replaces_the_slot(store):
+    old = store.get("s1", "b")
+    new = record("s1", "b", "m3")
+    store.add(new)
+    check_indexes(store)
+    assert old not in store and store.get("s1", "b") is new
+    assert "m2" not in store.by_member # Its only slot went to m3
+    assert store.for_member("m3") == [new]
+    assert list(store)[-1] is new # Replaced slots go to the end, like remove + add
+
+    store.remove(old) # The replaced record is no longer the slot's, nothing happens
+    check_indexes(store)
+    assert store.get("s1", "b") is new
+    assert store.events == [(("s1", "b"), "added")]
+
+def test_set_member_to_and_from_none(store):
+    a = store.get("s1", "a")
+    store.set_member(a, None, False)
+    check_indexes(store)
+    assert store.for_member("m1") == [store.get("s2", "a")]
+    assert store.get("s1", "a") is a # Stays in its slot, unassigned
+
+    store.set_member(a, "m4", True)
+    check_indexes(store)
+    assert store.for_member("m4") == [a] and a.ignore_warnings
+
+    store.set_member(a, "m1", False)
+    check_indexes(store)
+    assert "m4" not in store.by_member
+    assert [event[1] for event in store.events] == ["updated"] * 3
+    assert list(store)[0] is a # Keeps its position
+
+def test_set_member_of_a_record_not_in_the_store(store):
+    stray = record("s1", "a", "m9")
+    store.set_member(stray, "m8", False)
+    check_indexes(store)
+    assert stray.member_id == "m8" and "m8" not in store.by_member
+    assert store.events == []
+
+def test_unassigned_records(store):
+    a = record("s4", "a")
+    store.add(a)
+    check_indexes(store)
+    store.set_member(a, "m1", False)
+    check_indexes(store)
+    store.set_member(a, None, False)
+    store.remove(a)
+    check_indexes(store)
+
+def test_replace_keeps_the_first_record_of_a_slot(store):
+    first = record("s1", "a", "m5")
+    store.replace([first, record("s2", "b", "m6"), record("s1", "a", "m7"), record("s2", "b", None)])
+    check_indexes(store)
+    assert store.get("s1", "a") is first
+    assert store.get("s2", "b").member_id == "m6"
+    assert len(store) == 2 and "m7" not in store.by_member and "m1" not in store.by_member
+    assert store.events == [(None, "reset")]
+
+    store.clear()
+    check_indexes(store)
+    assert len(store) == 0 and not store.by_member and not store.by_song
+
+@pytest.fixture
+def project():
+    dh = build_project(40, 20)
+    for member in dh.members[::4]:
+        member.grade = Grade.BON4.value # Graduate with the year pass, with their assignments
+    stack = UndoHistory()
+    return dh, stack, ProfileService(dh, stack)
+
+def test_year_pass_redo_and_undo(project):
+    dh, stack, profiles = project
+    graduating = {m.id for m in dh.members if m.grade == Grade.BON4.value}
+    before = {slot: a.member_id for slot, a in dh.assignments.by_slot.items()}
+    assert any(member_id in graduating for member_id in before.values())
+
+    profiles.pass_year()
+    check_indexes(dh.assignments)
+    assert not graduating & dh.assignments.by_member.keys()
+    assert {slot: a.member_id for slot, a in dh.assignments.by_slot.items()} == {
+        slot: member_id for slot, member_id in before.items() if member_id not in graduating}
+
+    stack.undo()
+    check_indexes(dh.assignments)
+    assert {slot: a.member_id for slot, a in dh.assignments.by_slot.items()} == before
+
+    stack.redo()
+    check_indexes(dh.assignments)
+    assert not graduating & dh.assignments.by_member.keys()
+    stack.undo()
+    check_indexes(dh.assignments)
+    assert {slot: a.member_id for slot, a in dh.assignments.by_slot.items()} == before
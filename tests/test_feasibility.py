@@ -0,0 +1,121 @@
+import copy
+
+import pytest
+
+from sample_project import build_project
+from models import Member, MemberInstrument, SongSession
+from undo_history import UndoHistory
+from profile_service import ProfileService
+from song_service import SongService
+from session_service import SessionService
+from feasibility import FeasibilityMatrix, OK, TOO_LOW, TOO_HIGH, CANT_PLAY
+from skill_evaluator import CANNOT_PLAY, RANGE_TOO_LOW, SKILL_TOO_LOW, SKILL_TOO_HIGH
+
+FLAGS = {CANNOT_PLAY: CANT_PLAY, RANGE_TOO_LOW: TOO_LOW, SKILL_TOO_LOW: TOO_LOW, SKILL_TOO_HIGH: TOO_HIGH}
+
+@pytest.fixture
+def project():
+    dh = build_project(60, 40)
+    stack = UndoHistory()
+    return dh, stack, SessionService(dh, stack)
+
+def expected_verdict(service, member, song, session) -> int:
+    verdict = OK
+    for code, _ in service.assignment_warnings(member, song, session):
+        verdict |= FLAGS[code]
+    return verdict
+
+def assert_matches(dh, service):
+    matrix = service.feasibility
+    seen = set()
+    for member in dh.members:
+        for song in dh.songs:
+            for session in song.sessions:
+                assert matrix.verdict(member.id, song.id, session.id) == expected_verdict(service, member, song, session)
+                seen.add(matrix.verdict(member.id, song.id, session.id))
+    return seen
+
+@pytest.fixture
+def rebuilds(project, monkeypatch):
+    """Counts full rebuilds of the session service's matrix."""
+    _, _, service = project
+    count = [0]
+    rebuild = FeasibilityMatrix._rebuild
+    def counted(matrix):
+        count[0] += 1
+        rebuild(matrix)
+    monkeypatch.setattr(service.feasibility, "_rebuild", counted.__get__(service.feasibility))
+    return count
+
+def test_matches_assignment_warnings(project):
+    dh, _, service = project
+    assert assert_matches(dh, service) == {OK, TOO_LOW, TOO_HIGH, CANT_PLAY}
+
+def test_unknown_member_or_slot(project):
+    dh, _, service = project
+    song = dh.songs[0]
+    assert service.get_verdict("없는 부원", song.id, song.sessions[0].id) is None
+    assert service.get_verdict(dh.members[0].id, song.id, "없는 세션") is None
+
+def test_member_update_patches_its_row(project, rebuilds):
+    dh, stack, service = project
+    profiles = ProfileService(dh, stack)
+    assert_matches(dh, service)
+    assert rebuilds[0] == 1
+
+    member = dh.members[4]
+    edited = copy.deepcopy(member)
+    for mi in edited.instruments:
+        mi.skill = "유튜버" if mi.skill != "유튜버" else "초보"
+    profiles.update_member(member, edited)
+    assert service.feasibility.dirty_members == {member.id}
+    assert_matches(dh, service)
+    stack.undo()
+    assert_matches(dh, service)
+    assert rebuilds[0] == 1 # Patched in place both times
+
+def test_member_add_and_remove_rebuild(project, rebuilds):
+    dh, stack, service = project
+    profiles = ProfileService(dh, stack)
+    assert_matches(dh, service)
+
+    vocal = dh.get_instrument_by_name("보컬/랩")
+    drum = dh.get_instrument_by_name("드럼")
+    # The first entry of a duplicated instrument counts, as in validate_assignment
+    profiles.add_member(Member(name="신입", instruments=[
+        MemberInstrument(instrument_id=vocal.id, skill="C7"),
+        MemberInstrument(instrument_id=drum.id, skill="초보"),
+        MemberInstrument(instrument_id=drum.id, skill="유튜버"),
+    ]))
+    assert_matches(dh, service)
+    assert rebuilds[0] == 2
+
+    profiles.delete_member(dh.members[0])
+    assert_matches(dh, service)
+    assert service.get_verdict(stack.command(1).member.id, dh.songs[0].id, dh.songs[0].sessions[0].id) is None
+    stack.undo()
+    stack.undo()
+    assert_matches(dh, service)
+    assert rebuilds[0] == 4
+
+def test_song_edits_rebuild(project):
+    dh, stack, service = project
+    songs = SongService(dh, stack)
+    assert_matches(dh, service)
+    songs.set_song_field(dh.songs[0], "bpm", 240)
+    songs.update_session(dh.songs[1], dh.songs[1].sessions[-1], difficulty_param="32")
+    songs.update_session(dh.songs[2], dh.songs[2].sessions[0], difficulty_param="E5")
+    songs.add_session(dh.songs[3], SongSession(instrument_id=dh.get_instrument_by_name("드럼").id, difficulty_param="8"))
+    songs.remove_session(dh.songs[4], dh.songs[4].sessions[-1])
+    assert_matches(dh, service)
+    while stack.canUndo():
+        stack.undo()
+    assert_matches(dh, service)
+
+def test_instrument_rename_rebuilds(project):
+    dh, _, service = project
+    assert_matches(dh, service)
+    vocal = dh.get_instrument_by_name("보컬/랩")
+    vocal.name = "보컬"
+    dh.rebuild_instrument_index()
+    assert_matches(dh, service)
@@ -0,0 +1,144 @@
+import copy
+
+import pytest
+
+from sample_project import build_project
+from data_handler import DataHandler
+from journal import ProjectJournal, journal_path
+from models import Member, Song, SongSession, CueEntry
+from undo_history import UndoHistory
+from profile_service import ProfileService
+from song_service import SongService
+from session_service import SessionService
+from tech_service import TechService
+
+class Session:
+    """A project opened from path with a journal recording its undo stack, as MainWindow wires them."""
+    def __init__(self, path):
+        self.dh = DataHandler(filepath="")
+        self.dh.load_data(path)
+        self.journal = ProjectJournal(self.dh)
+        self.journal.open(path)
+        self.stack = UndoHistory()
+        self.stack.indexChanged.connect(self.journal.flush)
+        self.profiles = ProfileService(self.dh, self.stack)
+        self.songs = SongService(self.dh, self.stack)
+        self.sessions = SessionService(self.dh, self.stack)
+        self.tech = TechService(self.dh, self.stack)
+
+def rename_member(s):
+    member = s.dh.members[3]
+    renamed = copy.deepcopy(member)
+    renamed.name = "새 이름"
+    s.profiles.update_member(member, renamed)
+
+def assign(s):
+    song = s.dh.songs[2]
+    s.sessions.assign_member(song.id, song.sessions[1].id, s.dh.members[5].id)
+
+def reassign(s):
+    song = s.dh.songs[4]
+    s.sessions.update_member_assignments(song.id, s.dh.members[7].id, [x.id for x in song.sessions[:2]])
+
+def add_cue(s):
+    s.tech.add_cue_entry(s.dh.songs[1], "곡 전반", CueEntry(instrument_name="기타", memo="크게"))
+
+# Pushed in order; each covers a kind of change the journal records
+EDITS = [
+    lambda s: s.songs.set_song_field(s.dh.songs[0], "title", "바뀐 제목"),
+    rename_member,
+    assign,
+    reassign,
+    add_cue,
+    lambda s: s.profiles.add_member(Member(name="신입")),
+    lambda s: s.profiles.delete_member(s.dh.members[0]),
+    lambda s: s.songs.add_song(Song(title="새 곡")),
+    lambda s: s.songs.add_session(s.dh.songs[1], SongSession(difficulty_param="16")),
+    lambda s: s.songs.move_song(s.dh.songs[3].id, 1),
+    lambda s: s.songs.delete_song(s.dh.songs[6]),
+    lambda s: s.tech.update_performance_memo("메모"),
+    lambda s: s.tech.add_equipment("새 장비"),
+    lambda s: s.tech.update_sound_design_setting("기타_0_conn", 2),
+    lambda s: s.profiles.pass_year(),
+]
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # Saves and loads record recent files in the working directory
+    path = str(tmp_path / "project.acou")
+    build_project(40, 12).save_data(path)
+    return path
+
+def recovered(path) -> dict:
+    """The project as crash recovery rebuilds it: the file on disk with its journal replayed over it."""
+    dh = DataHandler(filepath="")
+    dh.load_data(path)
+    records = ProjectJournal.read(path)
+    if records:
+        ProjectJournal(dh).replay(records)
+    return dh.snapshot()
+
+def test_replay_restores_each_step(path):
+    s = Session(path)
+    for edit in EDITS:
+        edit(s)
+        assert recovered(path) == s.dh.snapshot()
+
+def test_replay_after_undo_and_redo(path):
+    s = Session(path)
+    for edit in EDITS:
+        edit(s)
+    for _ in range(6):
+        s.stack.undo()
+        assert recovered(path) == s.dh.snapshot()
+    for _ in range(3):
+        s.stack.redo()
+        assert recovered(path) == s.dh.snapshot()
+    # A push after undoing discards the redo branch
+    EDITS[0](s)
+    assert recovered(path) == s.dh.snapshot()
+    while s.stack.canUndo():
+        s.stack.undo()
+    assert recovered(path) == s.dh.snapshot()
+
+def test_replay_after_reset_concert(path):
+    s = Session(path)
+    assign(s)
+    s.songs.reset_concert()
+    assert recovered(path) == s.dh.snapshot()
+    s.stack.undo()
+    assert recovered(path) == s.dh.snapshot()
+
+def test_save_keeps_later_records(path):
+    s = Session(path)
+    for edit in EDITS[:4]:
+        edit(s)
+    s.journal.mark_save()
+    fragments = s.dh.snapshot_fragments(s.dh.file_format)
+    saved = s.dh.snapshot()
+    for edit in EDITS[4:8]: # Made while the save is written
+        edit(s)
+    DataHandler.write_project_file(fragments.encode(), path, s.dh.file_format, s.dh.project_summary())
+    s.journal.save_completed(path)
+
+    dh = DataHandler(filepath="")
+    dh.load_data(path)
+    assert dh.snapshot() == saved
+    assert recovered(path) == s.dh.snapshot()
+
+def test_journal_of_rewritten_file_is_ignored(path):
+    s = Session(path)
+    assign(s)
+    assert ProjectJournal.has_recovery(path)
+    build_project(40, 12, seed=1).save_data(path)
+    assert ProjectJournal.read(path) is None
+
+def test_torn_last_record_is_dropped(path):
+    s = Session(path)
+    assign(s)
+    state = s.dh.snapshot()
+    add_cue(s)
+    s.journal.close(delete=False)
+    with open(journal_path(path), 'rb+') as f:
+        f.truncate(len(f.read()) - 10)
+    assert recovered(path) == state
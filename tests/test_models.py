@@ -0,0 +1,125 @@
+import copy
+import json
+
+import pytest
+
+from models import (Instrument, MemberInstrument, Member, SongSession, CueEntry, CueSection, Song, Equipment,
+                    SessionAssignment, InstrumentCategory, ConnectionType, SongCategory)
+
+def fresh(text: str) -> str:
+    """An equal string that is a different object, like two reads of the same id from a file."""
+    return "".join(list(text))
+
+def samples():
+    """One instance of every model, with every field set away from its default."""
+    entry = CueEntry(instrument_name="기타", use_effect=True, effect_name="딜레이", effect_level=3, memo="2절부터")
+    return [
+        Instrument(name="일렉기타", category=InstrumentCategory.GUITAR.value,
+                   connection_type=ConnectionType.TS_PASSIVE.value, is_default=True),
+        MemberInstrument(instrument_id="inst-1", skill="고수"),
+        Member(name="홍길동", grade="본2", instruments=[MemberInstrument(instrument_id="inst-1", skill="중"),
+                                                     MemberInstrument(instrument_id="inst-2", skill="C6")]),
+        SongSession(instrument_id="inst-1", difficulty_param="16"),
+        entry,
+        CueSection(name="Intro", entries=[entry, CueEntry(instrument_name="베이스")], memo="페이드 인"),
+        Song(title="곡", nickname="별명", bpm=132, category=SongCategory.VOCAL.value, reference_url="https://example.com/a",
+             sessions=[SongSession(instrument_id="inst-1", difficulty_param="A5")],
+             cue_sections=[CueSection(name="곡 전반", entries=[CueEntry(instrument_name="드럼")])]),
+        Equipment(name="DI", owned_count=2, required_count=1, is_default=True),
+        SessionAssignment(song_id="song-1", session_id="sess-1", member_id="member-1", ignore_warnings=True),
+        SessionAssignment(song_id="song-1", session_id="sess-2"),
+    ]
+
+MODELS = sorted({type(obj) for obj in samples()}, key=lambda cls: cls.__name__)
+
+@pytest.mark.parametrize("obj", samples(), ids=lambda obj: type(obj).__name__)
+def test_round_trip(obj):
+    data = obj.to_dict()
+    assert type(obj).from_dict(data) == obj
+    # Through the file encoding too
+    assert type(obj).from_dict(json.loads(json.dumps(data, ensure_ascii=False))) == obj
+
+@pytest.mark.parametrize("obj", samples(), ids=lambda obj: type(obj).__name__)
+def test_from_dict_leaves_input_alone(obj):
+    data = obj.to_dict()
+    before = copy.deepcopy(data)
+    type(obj).from_dict(data)
+    assert data == before
+
+def test_every_model_is_covered():
+    assert {cls.__name__ for cls in MODELS} == {"Instrument", "MemberInstrument", "Member", "SongSession", "CueEntry",
+                                                "CueSection", "Song", "Equipment", "SessionAssignment"}
+
+@pytest.mark.parametrize("cls", MODELS, ids=lambda cls: cls.__name__)
+def test_models_are_slotted(cls):
+    assert "__slots__" in cls.__dict__
+    obj = next(o for o in samples() if type(o) is cls)
+    loaded = cls.from_dict(obj.to_dict())
+    assert not hasattr(loaded, "__dict__")
+    with pytest.raises(AttributeError):
+        loaded.not_a_field = 1
+
+def test_to_dict_shares_no_containers():
+    song = next(o for o in samples() if isinstance(o, Song))
+    data = song.to_dict()
+    data["sessions"].clear()
+    data["cue_sections"][0]["entries"].clear()
+    assert song.sessions and song.cue_sections[0].entries
+
+    loaded = Song.from_dict(song.to_dict())
+    assert loaded.sessions[0] is not song.sessions[0]
+
+def test_ids_are_interned():
+    first = SessionAssignment.from_dict({"song_id": fresh("song-interned"), "session_id": fresh("sess-interned"),
+                                         "member_id": fresh("member-interned"), "ignore_warnings": False})
+    second = SessionAssignment.from_dict({"song_id": fresh("song-interned"), "session_id": fresh("sess-interned"),
+                                          "member_id": fresh("member-interned")})
+    assert first.song_id is second.song_id
+    assert first.session_id is second.session_id
+    assert first.member_id is second.member_id
+
+    song = Song.from_dict({"id": fresh("song-interned"), "sessions": [{"id": fresh("sess-interned"),
+                                                                        "instrument_id": fresh("inst-interned")}]})
+    member = Member.from_dict({"id": fresh("member-interned"),
+                               "instruments": [{"instrument_id": fresh("inst-interned")}]})
+    assert song.id is first.song_id
+    assert song.sessions[0].id is first.session_id
+    assert member.id is first.member_id
+    assert song.sessions[0].instrument_id is member.instruments[0].instrument_id
+
+def test_unassigned_member_id_stays_none():
+    assignment = SessionAssignment.from_dict({"song_id": "a", "session_id": "b", "member_id": None})
+    assert assignment.member_id is None
+
+def test_missing_fields_get_defaults():
+    # Older files have no nickname, cue sheet or ignore_warnings
+    song = Song.from_dict({"id": "s", "title": "곡", "bpm": 90, "category": SongCategory.INSTRUMENTAL.value,
+                           "reference_url": "", "sessions": []})
+    assert song.nickname == "" and song.cue_sections == []
+    other = Song.from_dict({"id": "t"})
+    assert other.sessions is not song.sessions # Default factories run per instance
+
+    assignment = SessionAssignment.from_dict({"song_id": "a", "session_id": "b", "member_id": "c"})
+    assert assignment.ignore_warnings is False
+
+    # A missing id gets a new one, like the constructor
+    assert Member.from_dict({"name": "a"}).id != Member.from_dict({"name": "a"}).id
+
+def test_legacy_fields_are_read_but_not_written():
+    section = CueSection.from_dict({"id": "c", "name": "Intro", "memo": "", "instrument_notes": {"e1": "{}"}})
+    assert section.instrument_notes == {"e1": "{}"}
+    assert "instrument_notes" not in section.to_dict()
+    assert CueSection.from_dict(section.to_dict()).instrument_notes is None
+
+@pytest.mark.parametrize("cls, data", [
+    (Song, {"bogus": 1}),
+    (Song, {**Song().to_dict(), "bogus": 1}),
+    # As many keys as to_dict writes, one of them unknown
+    (Song, {**{k: v for k, v in Song().to_dict().items() if k != "bpm"}, "bogus": 1}),
+    (SessionAssignment, {"song_id": "a"}),
+    (SessionAssignment, {"song_id": "a", "member_id": None, "ignore_warnings": False, "x": 1}),
+    (MemberInstrument, {}),
+])
+def test_bad_keys_are_rejected(cls, data):
+    with pytest.raises(TypeError):
+        cls.from_dict(data)
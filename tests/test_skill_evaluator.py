@@ -0,0 +1,68 @@
+import itertools
+
+import pytest
+
+from bench_skill_evaluator import reference_warnings
+from data_handler import DataHandler
+from models import Member, MemberInstrument, Song, SongSession, SkillLevel, VOCAL_RANGE
+from undo_history import UndoHistory
+from session_service import SessionService
+from skill_evaluator import CANNOT_PLAY, RANGE_TOO_LOW, SKILL_TOO_LOW, SKILL_TOO_HIGH
+
+SKILLS = [s.value for s in SkillLevel] + ["", "모름"]
+BPMS = list(range(0, 301, 5)) + [89, 91, 119, 121, 139, 141, 159, 161, 179, 181]
+BEATS = ["1", "4", "8", "16", "24", "32", "3", "64", "0", "", "16비트"]
+NOTES = VOCAL_RANGE + ["", "C5", "D#4", "C8", "H5", "5", "가"]
+
+@pytest.fixture
+def project():
+    dh = DataHandler(filepath="")
+    dh.create_defaults()
+    dh.rebuild_index()
+    return dh, SessionService(dh, UndoHistory())
+
+def instrument(dh, vocal: bool):
+    return next(i for i in dh.instruments if (i.name == "보컬/랩") == vocal)
+
+def check(dh, service, member, song, session):
+    expected = reference_warnings(dh, member, song, session)
+    warnings = service.assignment_warnings(member, song, session)
+    assert [message for _, message in warnings] == expected
+    assert service.validate_assignment(member, song, session) == expected
+    return [code for code, _ in warnings]
+
+def test_instrument_grid_matches_reference(project):
+    dh, service = project
+    inst = instrument(dh, vocal=False)
+    codes = set()
+    for _ in range(2): # Second pass answers from the memo
+        for skill, bpm, beat in itertools.product(SKILLS, BPMS, BEATS):
+            member = Member(name="부원", instruments=[MemberInstrument(instrument_id=inst.id, skill=skill)])
+            song = Song(bpm=bpm, sessions=[SongSession(instrument_id=inst.id, difficulty_param=beat)])
+            codes.update(check(dh, service, member, song, song.sessions[0]))
+    assert codes == {SKILL_TOO_LOW, SKILL_TOO_HIGH}
+
+def test_vocal_grid_matches_reference(project):
+    dh, service = project
+    inst = instrument(dh, vocal=True)
+    codes = set()
+    for _ in range(2):
+        for skill, note, bpm in itertools.product(NOTES, NOTES, (60, 200)):
+            member = Member(name="보컬", instruments=[MemberInstrument(instrument_id=inst.id, skill=skill)])
+            song = Song(bpm=bpm, sessions=[SongSession(instrument_id=inst.id, difficulty_param=note)])
+            codes.update(check(dh, service, member, song, song.sessions[0]))
+    assert codes == {RANGE_TOO_LOW}
+
+def test_member_without_the_instrument(project):
+    dh, service = project
+    vocal, other = instrument(dh, vocal=True), instrument(dh, vocal=False)
+    member = Member(name="부원", instruments=[MemberInstrument(instrument_id=vocal.id, skill="A5")])
+    for inst_id in (other.id, "없는 악기"):
+        song = Song(bpm=120, sessions=[SongSession(instrument_id=inst_id, difficulty_param="16")])
+        assert check(dh, service, member, song, song.sessions[0]) == [CANNOT_PLAY]
+
+def test_missing_arguments(project):
+    dh, service = project
+    song = Song(bpm=120, sessions=[SongSession()])
+    assert service.assignment_warnings(None, song, song.sessions[0]) == []
+    assert service.validate_assignment(Member(), song, None) == reference_warnings(dh, Member(), song, None) == []
@@ -0,0 +1,64 @@
+import pytest
+
+from data_handler import DataHandler
+from models import Song, CueEntry
+from undo_history import UndoHistory, released_cost
+from song_service import SongService
+from tech_service import TechService
+
+@pytest.fixture
+def project():
+    dh = DataHandler(filepath="")
+    dh.create_defaults()
+    dh.songs = [Song(title=f"곡 {k}") for k in range(20)]
+    dh.rebuild_index()
+    return dh
+
+def edit(services, dh, k):
+    songs, tech = services
+    song = dh.songs[k % len(dh.songs)]
+    if k % 2:
+        songs.set_song_field(song, "title", f"제목 {k} " + "가" * (k % 50))
+    else:
+        tech.add_cue_entry(song, "곡 전반", CueEntry(instrument_name="기타", memo="메모" * (k % 30)))
+
+def test_budget_kept_after_many_pushes(project):
+    # Small enough to release most commands, big enough to hold their shells (see released_cost)
+    budget = 512 * 1024
+    stack = UndoHistory(memory_budget=budget)
+    services = SongService(project, stack), TechService(project, stack)
+    titles = [[s.title for s in project.songs]]
+    for k in range(1000):
+        edit(services, project, k)
+        titles.append([s.title for s in project.songs])
+        assert stack.memory_used() <= budget
+    assert stack.floor > 0 # Commands were released to stay within it
+
+    while stack.canUndo():
+        stack.undo()
+    assert stack.index() == stack.floor
+    assert [s.title for s in project.songs] == titles[stack.floor]
+
+def test_released_commands_still_count(project):
+    stack = UndoHistory(memory_budget=1 << 40)
+    services = SongService(project, stack), TechService(project, stack)
+    for k in range(100):
+        edit(services, project, k)
+    used = stack.memory_used()
+    stack.set_memory_budget(0)
+    # Only the newest step is kept, the released ones cost what their shells hold
+    assert stack.floor == stack.index() - 1
+    assert stack.memory_used() == stack.costs[-1] + sum(released_cost(stack.command(i)) for i in range(stack.floor))
+    assert 0 < stack.memory_used() < used
+    stack.clear()
+    assert stack.memory_used() == 0 and stack.floor == 0
+
+def test_newest_step_kept_over_budget(project):
+    stack = UndoHistory(memory_budget=1)
+    services = SongService(project, stack), TechService(project, stack)
+    edit(services, project, 1)
+    edit(services, project, 3)
+    assert stack.memory_used() > stack.memory_budget
+    assert stack.canUndo()
+    stack.undo()
+    assert not stack.canUndo()
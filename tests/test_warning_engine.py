@@ -0,0 +1,139 @@
+import copy
+from collections import Counter
+
+import pytest
+
+from sample_project import build_project
+from models import Member, MemberInstrument, Song, SongSession
+from undo_history import UndoHistory
+from profile_service import ProfileService
+from song_service import SongService
+from session_service import SessionService
+from warning_engine import WarningEngine
+
+class Project:
+    def __init__(self):
+        self.dh = build_project(40, 25)
+        self.stack = UndoHistory()
+        self.profiles = ProfileService(self.dh, self.stack)
+        self.songs = SongService(self.dh, self.stack)
+        self.sessions = SessionService(self.dh, self.stack)
+        self.sessions.update_warnings()
+
+    def slot(self, song_index, session_index=0):
+        song = self.dh.songs[song_index]
+        return song.id, song.sessions[session_index].id
+
+@pytest.fixture
+def project():
+    return Project()
+
+def full_scan(p) -> list:
+    """Records of a freshly built engine, which scans everything."""
+    engine = WarningEngine(p.sessions)
+    engine.update()
+    p.dh.change_listeners.remove(engine.on_change)
+    return engine.records
+
+def check_step(p):
+    old = list(p.sessions.warning_engine.records)
+    diff = p.sessions.update_warnings()
+    new = p.sessions.warning_engine.records
+    assert new == full_scan(p)
+    assert Counter(diff.added) == Counter(new) - Counter(old)
+    assert Counter(diff.removed) == Counter(old) - Counter(new)
+
+def edit_member(p, index, **changes):
+    member = p.dh.members[index]
+    edited = copy.deepcopy(member)
+    for name, value in changes.items():
+        setattr(edited, name, value)
+    p.profiles.update_member(member, edited)
+
+def raise_skills(p, index):
+    member = p.dh.members[index]
+    edit_member(p, index, instruments=[MemberInstrument(instrument_id=mi.instrument_id, skill="유튜버")
+                                       for mi in member.instruments])
+
+def lower_skills(p, index):
+    member = p.dh.members[index]
+    edit_member(p, index, instruments=[MemberInstrument(instrument_id=mi.instrument_id, skill="초보")
+                                       for mi in member.instruments])
+
+def assign_everywhere(p, member_index):
+    # Enough slots to push the member over the average count
+    member_id = p.dh.members[member_index].id
+    with p.sessions.batch("배정"):
+        for song_index in range(0, 12):
+            p.sessions.assign_member(*p.slot(song_index, 0), member_id)
+
+# Each pushes one undo step
+STEPS = [
+    lambda p: p.sessions.assign_member(*p.slot(0, 1), p.dh.members[3].id),
+    lambda p: p.sessions.assign_member(*p.slot(0, 1), p.dh.members[4].id),
+    lambda p: p.sessions.assign_member(*p.slot(1, 0), None),
+    lambda p: p.sessions.assign_member(*p.slot(2, 1), p.dh.members[5].id, ignore_warnings=True),
+    lambda p: p.sessions.update_member_assignments(p.dh.songs[3].id, p.dh.members[6].id,
+                                                   [s.id for s in p.dh.songs[3].sessions[:2]]),
+    lambda p: assign_everywhere(p, 7),
+    lambda p: lower_skills(p, 4),
+    lambda p: raise_skills(p, 6),
+    lambda p: edit_member(p, 7, name="이름 바뀜"),
+    lambda p: p.profiles.add_member(Member(name="신입", instruments=[
+        MemberInstrument(instrument_id=p.dh.songs[5].sessions[1].instrument_id, skill="초보")])),
+    lambda p: p.sessions.assign_member(*p.slot(5, 1), p.dh.members[-1].id),
+    lambda p: p.profiles.delete_member(p.dh.members[4]),
+    lambda p: p.songs.set_song_field(p.dh.songs[0], "bpm", 250),
+    lambda p: p.songs.set_song_field(p.dh.songs[2], "nickname", "별명"),
+    lambda p: p.songs.update_session(p.dh.songs[3], p.dh.songs[3].sessions[1], difficulty_param="32"),
+    lambda p: p.songs.add_session(p.dh.songs[6], SongSession(instrument_id=p.dh.songs[6].sessions[-1].instrument_id,
+                                                             difficulty_param="8")),
+    lambda p: p.songs.remove_session(p.dh.songs[7], p.dh.songs[7].sessions[-1]),
+    lambda p: p.songs.move_song(p.dh.songs[8].id, 1),
+    lambda p: p.songs.add_song(Song(title="새 곡")),
+    lambda p: p.songs.delete_song(p.dh.songs[9]),
+    lambda p: p.profiles.pass_year(),
+    lambda p: p.sessions.assign_member(*p.slot(10, 0), p.dh.members[0].id),
+]
+
+def test_starts_equal_to_full_scan(project):
+    assert project.sessions.warning_engine.records == full_scan(project)
+    assert project.sessions.warning_engine.records # The sample project has warnings of every kind
+
+def test_steps_match_full_scan(project):
+    for step in STEPS:
+        step(project)
+        check_step(project)
+
+def test_undo_and_redo_match_full_scan(project):
+    for step in STEPS:
+        step(project)
+    project.sessions.update_warnings()
+    while project.stack.canUndo():
+        project.stack.undo()
+        check_step(project)
+    while project.stack.canRedo():
+        project.stack.redo()
+        check_step(project)
+
+def test_several_steps_between_updates(project):
+    for k, step in enumerate(STEPS):
+        step(project)
+        if k % 4 == 3:
+            check_step(project)
+    for _ in range(5):
+        project.stack.undo()
+    check_step(project)
+
+def test_reset_concert_and_undo(project):
+    STEPS[0](project)
+    check_step(project)
+    project.songs.reset_concert()
+    check_step(project)
+    project.stack.undo()
+    check_step(project)
+
+def test_no_change_gives_empty_diff(project):
+    assert not project.sessions.update_warnings()
+    project.songs.move_song(project.dh.songs[0].id, 1) # Doesn't change any warning
+    assert not project.sessions.update_warnings()
@@ -0,0 +1,235 @@
+import sys
+from contextlib import contextmanager
+from types import FunctionType, MethodType
+from typing import List, Optional
+from PyQt6.QtCore import pyqtSignal, pyqtBoundSignal
+from PyQt6.QtGui import QUndoStack, QUndoCommand
+
+DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024
+QT_COMMAND_SIZE = 150 # The C++ QUndoCommand: private data, text, child list (outside Python's allocator)
+COMMAND_OVERHEAD = QT_COMMAND_SIZE + 150 # And its Python wrapper; the attribute dict is added by command_cost
+
+def estimate_size(*values, shared=()) -> int:
+    """
+    Approximate bytes held by values: model objects (slotted or not), containers and strings are walked,
+    objects reached more than once are counted once. Objects in `shared` are also held by the project,
+    so references to them cost nothing more.
+    """
+    seen = {id(value) for value in shared}
+    total = 0
+    pending = list(values)
+    while pending:
+        value = pending.pop()
+        if value is None or id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, dict):
+            pending.extend(value.keys())
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            pending.extend(value)
+        elif hasattr(value, "__slots__"):
+            pending.extend(getattr(value, name, None) for name in value.__slots__)
+        elif hasattr(value, "__dict__"):
+            pending.append(value.__dict__)
+    return total
+
+def attribute_size(cmd: QUndoCommand) -> int:
+    """
+    The command's attribute dict, and the bound signals, bound methods and closures stored in it: they are
+    made for each command (update_signal is a new pyqtBoundSignal every time it is read from the service).
+    """
+    attributes = getattr(cmd, "__dict__", None)
+    if attributes is None:
+        return 0
+    total = sys.getsizeof(attributes)
+    for value in attributes.values():
+        if isinstance(value, (pyqtBoundSignal, MethodType, FunctionType)):
+            total += sys.getsizeof(value)
+            for cell in getattr(value, "__closure__", None) or ():
+                total += sys.getsizeof(cell)
+    return total
+
+def command_cost(cmd: QUndoCommand) -> int:
+    """
+    Estimated bytes of a command: its cost() (COMMAND_OVERHEAD and the payload; COMMAND_OVERHEAD without
+    one), its attributes, and its children (macros).
+    """
+    cost = cmd.cost() if hasattr(cmd, "cost") else COMMAND_OVERHEAD
+    cost += attribute_size(cmd)
+    return cost + sum(command_cost(cmd.child(i)) for i in range(cmd.childCount()))
+
+def released_cost(cmd: QUndoCommand) -> int:
+    """What a released command still holds until the stack is cleared: the command itself, no payload."""
+    return COMMAND_OVERHEAD + attribute_size(cmd) + sum(released_cost(cmd.child(i)) for i in range(cmd.childCount()))
+
+def release_command(cmd: QUndoCommand):
+    """Drops the payload of a command that can no longer be undone. It is marked obsolete, mergeable commands check that."""
+    for i in range(cmd.childCount()):
+        release_command(cmd.child(i))
+    if hasattr(cmd, "__dict__"):
+        cmd.__dict__.clear()
+    cmd.setObsolete(True)
+
+class BatchCommand(QUndoCommand):
+    """
+    The commands pushed inside UndoHistory.batch(), undone and redone as one step. The services that
+    opened the batch have their signals blocked meanwhile and send one notification after (notify_batch).
+    """
+    def __init__(self, label: str):
+        super().__init__()
+        self.setText(label)
+        self.commands: List[QUndoCommand] = []
+        self.services = [] # The services that opened the batch (see BatchService)
+        self.first_redo = True # The commands were already done as they were pushed
+
+    def redo(self):
+        if self.first_redo:
+            self.first_redo = False
+            return
+        self.run(self.commands, lambda cmd: cmd.redo())
+
+    def undo(self):
+        self.run(reversed(self.commands), lambda cmd: cmd.undo())
+
+    def run(self, commands, step):
+        was_blocked = [service.blockSignals(True) for service in self.services]
+        try:
+            for cmd in commands:
+                step(cmd)
+        finally:
+            for service, blocked in zip(self.services, was_blocked):
+                service.blockSignals(blocked)
+        self.notify()
+
+    def notify(self):
+        for service in self.services:
+            service.notify_batch(self.commands)
+
+    def cost(self):
+        return COMMAND_OVERHEAD + sum(command_cost(cmd) for cmd in self.commands)
+
+class BatchService:
+    """Mixin for the services: `with service.batch("label"): ...` (see UndoHistory.batch)."""
+    def batch(self, label: str):
+        return self.undo_stack.batch(label, self)
+
+    def notify_batch(self, commands: list):
+        """The one change notification of a batch, sent when it is pushed, undone or redone."""
+        self.data_changed.emit()
+
+class UndoHistory(QUndoStack):
+    """
+    Undo stack that keeps the estimated size of its commands within a memory budget.
+
+    Each command reports its size through cost() (see command_cost). When the total goes over the budget,
+    the oldest commands are released: their payload is dropped and undo stops above them (`floor`).
+    The newest undo step is always kept. QUndoStack cannot remove commands from the bottom of a non-empty
+    stack, so released commands stay as empty shells until the stack is cleared (new project, load);
+    they still count towards the budget (released_cost), so memory_used() stays within it unless the
+    newest step alone, or the shells of a very long session, are over it.
+
+    The sizes are estimates, calibrated against tracemalloc plus the Qt side (QT_COMMAND_SIZE), so the
+    budget is approximate: objects shared with the project are only left out where a command says so.
+
+    Use undo_available instead of canUndoChanged, it accounts for the floor.
+
+    Commands pushed inside batch() are done right away and pushed together as one BatchCommand at the end.
+    """
+    undo_available = pyqtSignal(bool)
+    memory_changed = pyqtSignal()
+
+    def __init__(self, parent=None, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        super().__init__(parent)
+        self.memory_budget = memory_budget
+        self.floor = 0 # Commands below this index are released
+        self.costs: List[int] = [] # Estimated bytes per command index, released_cost() once released
+        self.pushed = False
+        self.open_batch: Optional[BatchCommand] = None
+        self.indexChanged.connect(self.on_index_changed)
+
+    def push(self, cmd: QUndoCommand):
+        if self.open_batch is not None:
+            cmd.redo()
+            self.open_batch.commands.append(cmd)
+            return
+        self.pushed = True
+        super().push(cmd)
+
+    @contextmanager
+    def batch(self, label: str, service):
+        """
+        Groups the commands pushed inside the block into one undo step named label. The service's signals
+        are blocked until the block ends, then it notifies once (service.notify_batch). Nested batches join
+        the outermost one, the services that opened them notify once each. If the outermost block raises,
+        its commands are undone (and notified once) and nothing is pushed.
+        """
+        outermost = self.open_batch is None
+        if outermost:
+            self.open_batch = BatchCommand(label)
+        batch = self.open_batch
+        if service not in batch.services:
+            batch.services.append(service)
+        was_blocked = service.blockSignals(True)
+        try:
+            yield batch
+        except BaseException:
+            service.blockSignals(was_blocked)
+            if outermost:
+                self.open_batch = None
+                batch.undo()
+            raise
+        service.blockSignals(was_blocked)
+        if outermost:
+            self.open_batch = None
+            if batch.commands:
+                self.push(batch)
+                batch.notify()
+
+    def endMacro(self):
+        self.pushed = True
+        super().endMacro()
+
+    def canUndo(self) -> bool:
+        return self.index() > self.floor
+
+    def undo(self):
+        if self.canUndo():
+            super().undo()
+
+    def set_memory_budget(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self.enforce_budget()
+        self.undo_available.emit(self.canUndo())
+        self.memory_changed.emit()
+
+    def memory_used(self) -> int:
+        """Estimated bytes held by the commands, released ones included."""
+        return sum(self.costs)
+
+    def on_index_changed(self, index: int):
+        count = self.count()
+        if count == 0:
+            self.floor = 0
+            self.costs = []
+        else:
+            del self.costs[count:] # Redo branch discarded by a push
+            self.costs.extend(0 for _ in range(count - len(self.costs)))
+            if self.pushed:
+                # The pushed command (or the one it merged into) is on top, done, so at its final size
+                self.costs[index - 1] = command_cost(self.command(index - 1))
+            self.enforce_budget()
+        self.pushed = False
+        self.undo_available.emit(self.canUndo())
+        self.memory_changed.emit()
+
+    def enforce_budget(self):
+        used = self.memory_used()
+        while used > self.memory_budget and self.floor < self.index() - 1:
+            cmd = self.command(self.floor)
+            release_command(cmd)
+            used -= self.costs[self.floor]
+            self.costs[self.floor] = released_cost(cmd)
+            used += self.costs[self.floor]
+            self.floor += 1
@@ -0,0 +1,250 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Set, Tuple, Optional
+from feasibility import OK
+from data_handler import TECH_KINDS
+from skill_evaluator import CANNOT_PLAY, RANGE_TOO_LOW, SKILL_TOO_LOW, SKILL_TOO_HIGH
+
+Slot = Tuple[str, str] # (song_id, session_id)
+
+# Warning kinds, on top of the skill_evaluator verdict codes
+UNASSIGNED = "UNASSIGNED"
+COUNT_OVER = "COUNT_OVER"
+COUNT_UNDER = "COUNT_UNDER"
+
+SEVERITY = {
+    CANNOT_PLAY: "error",
+    RANGE_TOO_LOW: "error",
+    SKILL_TOO_LOW: "error",
+    UNASSIGNED: "warning",
+    COUNT_OVER: "warning",
+    COUNT_UNDER: "warning",
+    SKILL_TOO_HIGH: "info",
+}
+
+@dataclass(frozen=True)
+class WarningRecord:
+    kind: str
+    text: str
+    song_id: Optional[str] = None
+    session_id: Optional[str] = None
+    member_id: Optional[str] = None
+
+    @property
+    def severity(self) -> str:
+        return SEVERITY.get(self.kind, "error")
+
+@dataclass
+class WarningDiff:
+    added: List[WarningRecord] = field(default_factory=list)
+    removed: List[WarningRecord] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+class WarningEngine:
+    """
+    Keeps the session warning list up to date from DataHandler change notifications.
+
+    Warnings are cached per slot (unassigned + skill warnings) and per member (count warnings).
+    A changed assignment dirties its slot, a changed member dirties the slots it is assigned to,
+    a changed song dirties all of its slots. Instrument changes and bulk loads rebuild everything.
+    """
+    def __init__(self, service):
+        self.service = service
+        self.data_handler = service.data_handler
+
+        self.unassigned: Dict[str, List[WarningRecord]] = {} # song_id -> warnings in session order
+        self.skill: Dict[Slot, List[WarningRecord]] = {}
+        self.counts: Dict[str, WarningRecord] = {} # member_id -> warning
+        self.records: List[WarningRecord] = []
+
+        self.dirty_slots: Set[Slot] = set()
+        self.dirty_members: Set[str] = set()
+        self.dirty_songs: Set[str] = set()
+        self.counts_dirty = False
+        self.full_rebuild = True
+
+        self.data_handler.add_change_listener(self.on_change)
+
+    def on_change(self, event):
+        if event.kind in TECH_KINDS:
+            return
+        if event.key is None:
+            self.full_rebuild = True
+        elif event.kind == "assignment":
+            self.dirty_slots.add(event.key)
+            self.counts_dirty = True
+        elif event.kind == "member":
+            self.dirty_members.add(event.key)
+            self.counts_dirty = True
+        elif event.kind == "song":
+            self.dirty_songs.add(event.key)
+
+    @property
+    def warnings(self) -> List[str]:
+        return [r.text for r in self.records]
+
+    def is_dirty(self):
+        return bool(self.full_rebuild or self.dirty_slots or self.dirty_members or self.dirty_songs or self.counts_dirty)
+
+    def update(self) -> WarningDiff:
+        """Recomputes the dirty warnings and returns what was added and removed."""
+        if not self.is_dirty():
+            return WarningDiff()
+
+        if self.full_rebuild:
+            diff = self._rebuild()
+        else:
+            diff = WarningDiff()
+            self._update_slots(diff)
+            if self.counts_dirty:
+                self._update_counts(diff)
+
+        self.dirty_slots.clear()
+        self.dirty_members.clear()
+        self.dirty_songs.clear()
+        self.counts_dirty = False
+        self.full_rebuild = False
+
+        self.records = self._collect()
+        return diff
+
+    def _rebuild(self) -> WarningDiff:
+        old = self.records
+
+        self.unassigned = {}
+        for song in self.data_handler.songs:
+            self._set_unassigned(song.id, self._compute_unassigned(song.id), None)
+
+        self.skill = {}
+        for a in self.data_handler.assignments:
+            slot = (a.song_id, a.session_id)
+            self._set_skill(slot, self._compute_skill(slot), None)
+
+        self.counts = self._compute_counts()
+
+        new = self._collect()
+        return WarningDiff(
+            added=list((Counter(new) - Counter(old)).elements()),
+            removed=list((Counter(old) - Counter(new)).elements())
+        )
+
+    def _update_slots(self, diff: WarningDiff):
+        store = self.data_handler.assignments
+        slots = set(self.dirty_slots)
+
+        for member_id in self.dirty_members:
+            for a in store.for_member(member_id):
+                slots.add((a.song_id, a.session_id))
+
+        for song_id in self.dirty_songs:
+            for a in store.for_song(song_id):
+                slots.add((a.song_id, a.session_id))
+
+        # A song has only a handful of sessions, so its unassigned warnings are recomputed together
+        songs = set(self.dirty_songs)
+        songs.update(song_id for song_id, _ in self.dirty_slots)
+        for song_id in songs:
+            self._set_unassigned(song_id, self._compute_unassigned(song_id), diff)
+
+        for slot in slots:
+            self._set_skill(slot, self._compute_skill(slot), diff)
+
+    def _update_counts(self, diff: WarningDiff):
+        new_counts = self._compute_counts()
+        for member_id in self.counts.keys() | new_counts.keys():
+            old_msg = self.counts.get(member_id)
+            new_msg = new_counts.get(member_id)
+            if old_msg != new_msg:
+                if old_msg: diff.removed.append(old_msg)
+                if new_msg: diff.added.append(new_msg)
+        self.counts = new_counts
+
+    def _set_unassigned(self, song_id, entries: List[WarningRecord], diff: Optional[WarningDiff]):
+        old = self.unassigned.get(song_id, [])
+        if diff is not None and old != entries:
+            self._diff_lists(old, entries, diff)
+        if entries:
+            self.unassigned[song_id] = entries
+        else:
+            self.unassigned.pop(song_id, None)
+
+    def _set_skill(self, slot: Slot, warnings: List[WarningRecord], diff: Optional[WarningDiff]):
+        old = self.skill.get(slot, [])
+        if diff is not None and old != warnings:
+            self._diff_lists(old, warnings, diff)
+        if warnings:
+            self.skill[slot] = warnings
+        else:
+            self.skill.pop(slot, None)
+
+    def _diff_lists(self, old, new, diff: WarningDiff):
+        old_counter, new_counter = Counter(old), Counter(new)
+        diff.removed.extend((old_counter - new_counter).elements())
+        diff.added.extend((new_counter - old_counter).elements())
+
+    def _compute_unassigned(self, song_id) -> List[WarningRecord]:
+        entries = []
+        song = self.data_handler.get_song(song_id)
+        if not song:
+            return entries
+        for session in song.sessions:
+            a = self.data_handler.assignments.get(song.id, session.id)
+            if not (a and a.member_id):
+                inst = self.data_handler.get_instrument(session.instrument_id)
+                inst_name = inst.name if inst else "Unknown"
+                prefix = f"[{song.nickname or song.title}]"
+                entries.append(WarningRecord(UNASSIGNED, f"{prefix} {inst_name} 세션이 배정되지 않았습니다.", song.id, session.id))
+        return entries
+
+    def _compute_skill(self, slot: Slot) -> List[WarningRecord]:
+        a = self.data_handler.assignments.get(*slot)
+        if not a or not a.member_id or a.ignore_warnings:
+            return []
+
+        song = self.data_handler.get_song(a.song_id)
+        if not song: return []
+
+        session = self.data_handler.get_session(a.session_id)
+        if not session or self.data_handler.get_song_for_session(a.session_id) is not song: return []
+
+        member = self.data_handler.get_member(a.member_id)
+        if not member: return []
+
+        # Messages are only formatted for cells the feasibility matrix flags
+        if self.service.get_verdict(member.id, song.id, session.id) == OK:
+            return []
+
+        prefix = f"[{song.nickname or song.title}]"
+        return [
+            WarningRecord(kind, f"{prefix} {w}", song.id, session.id, member.id)
+            for kind, w in self.service.assignment_warnings(member, song, session)
+        ]
+
+    def _compute_counts(self) -> Dict[str, WarningRecord]:
+        counts = {}
+        stats = self.service.get_assignment_stats()
+        for m in self.data_handler.members:
+            status = stats.get(m.id, "NORMAL")
+            if status == "OVER":
+                counts[m.id] = WarningRecord(COUNT_OVER, f"[{m.name}] 배정된 세션이 너무 많습니다.", member_id=m.id)
+            elif status == "UNDER":
+                counts[m.id] = WarningRecord(COUNT_UNDER, f"[{m.name}] 배정된 세션이 너무 적습니다.", member_id=m.id)
+        return counts
+
+    def _collect(self) -> List[WarningRecord]:
+        # Same order as the full scan: unassigned by song order, skill by assignment order, counts by member order
+        result = []
+        for song in self.data_handler.songs:
+            result.extend(self.unassigned.get(song.id, ()))
+
+        if self.skill:
+            for a in self.data_handler.assignments:
+                result.extend(self.skill.get((a.song_id, a.session_id), ()))
+
+        for m in self.data_handler.members:
+            msg = self.counts.get(m.id)
+            if msg:
+                result.append(msg)
+        return result